@@ -88,7 +88,7 @@ class SettingsAPI(abc.Mapping, RequestPoller):
         return len(self._cache)
 
 
-    def __init__(self, srvapi, interval=1):
+    def __init__(self, srvapi, interval=1, scheduler=None):
         self._cache = {}
         self._descriptions = {}
         self._converters = {}
@@ -103,7 +103,9 @@ class SettingsAPI(abc.Mapping, RequestPoller):
         self._on_update = blinker.Signal()
         self._on_set = defaultdict(lambda: blinker.Signal())
 
-        super().__init__(self._srvapi.rpc.session_get, interval=interval)
+        # Settings rarely change, so we only need to handle changed responses
+        super().__init__(self._srvapi.rpc.session_get, interval=interval, scheduler=scheduler,
+                         fingerprint=True)
         self.on_response(self._handle_session_get)
         self.on_error(self._handle_error)
 
@@ -180,6 +182,8 @@ class SettingsAPI(abc.Mapping, RequestPoller):
         """
         log.debug('Registering %r to receive settings updates', callback)
         self._on_update.connect(callback, weak=autoremove)
+        # Make sure the next response reaches `callback` even if it didn't change
+        self.reset_fingerprint()
 
     def on_set(self, callback, key=None, autoremove=True):
         """
@@ -9,6 +9,7 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+import asyncio
 from collections import namedtuple
 
 import blinker
@@ -54,15 +55,17 @@ class StatusAPI():
         self._poller_tcount.interval = interval
 
 
-    def __init__(self, srvapi, interval=1):
-        self._session_stats_updated = False
-        self._tcounts_updated = False
+    def __init__(self, srvapi, interval=1, scheduler=None):
+        self._update_handle = None
         self._reset_session_stats()
         self._reset_tcounts()
         self._on_update = blinker.Signal()
 
+        # Only values that we provide are fingerprinted; session stats also
+        # contain counters that change every second even on an idle daemon
         self._poller_stats = RequestPoller(srvapi.rpc.session_stats,
-                                           interval=interval)
+                                           interval=interval, scheduler=scheduler,
+                                           fingerprint=self._session_stats_fingerprint)
         self._poller_stats.on_response(self._handle_session_stats)
         self._poller_stats.on_error(lambda e: log.debug('Ignoring exception: %r', e),
                                     autoremove=False)
@@ -71,9 +74,27 @@ class StatusAPI():
         # request a minimalistic torrent list.
         self._poller_tcount = RequestPoller(srvapi.torrent.torrents,
                                             keys=('rate-down', 'rate-up', 'status'),
-                                            interval=interval)
+                                            interval=interval, scheduler=scheduler,
+                                            fingerprint=self._torrent_list_fingerprint)
         self._poller_tcount.on_response(self._handle_torrent_list)
 
+    @staticmethod
+    def _session_stats_fingerprint(stats):
+        return (stats['torrentCount'], stats['pausedTorrentCount'], stats['activeTorrentCount'],
+                stats['downloadSpeed'], stats['uploadSpeed'])
+
+    @classmethod
+    def _torrent_list_fingerprint(cls, response):
+        return cls._count_torrents(response.torrents)
+
+    @staticmethod
+    def _count_torrents(tlist):
+        # Return number of isolated, downloading and uploading torrents
+        ISOLATED = Status.ISOLATED
+        return (sum(1 for t in tlist if ISOLATED in t['status']),
+                sum(1 for t in tlist if t['rate-down'] > 0),
+                sum(1 for t in tlist if t['rate-up'] > 0))
+
     def _reset_session_stats(self):
         self._session_stats = None
 
@@ -85,24 +106,24 @@ class StatusAPI():
             self._reset_session_stats()
         else:
             self._session_stats = stats
-        self._session_stats_updated = True
-        self._maybe_run_callbacks()
+        self._schedule_callbacks()
 
     def _handle_torrent_list(self, response):
         if response is None:
             self._reset_tcounts()
         else:
             self._torrent_list = response.torrents
-        self._tcounts_updated = True
-        self._maybe_run_callbacks()
+        self._schedule_callbacks()
 
-    def _maybe_run_callbacks(self):
-        # We have two pollers, but we want to call callbacks once when both
-        # have an update to report.
-        if self._tcounts_updated and self._session_stats_updated:
-            self._on_update.send(self)
-            self._tcounts_updated = False
-            self._session_stats_updated = False
+    def _schedule_callbacks(self):
+        # We have two pollers, but if both of them report changes at the same
+        # time, we want to call callbacks once
+        if self._update_handle is None:
+            self._update_handle = asyncio.get_event_loop().call_soon(self._run_callbacks)
+
+    def _run_callbacks(self):
+        self._update_handle = None
+        self._on_update.send(self)
 
     def on_update(self, callback, autoremove=True):
         """
@@ -114,6 +135,9 @@ class StatusAPI():
         """
         log.debug('Registering %r to receive status updates', callback)
         self._on_update.connect(callback, weak=autoremove)
+        # Make sure the next responses reach `callback` even if they didn't change
+        self._poller_stats.reset_fingerprint()
+        self._poller_tcount.reset_fingerprint()
 
     @property
     def count(self):
@@ -128,12 +152,8 @@ class StatusAPI():
                 active=stats['activeTorrentCount']
             )
         if tlist is not None:
-            ISOLATED = Status.ISOLATED
-            tc_args.update(
-                isolated=len(tuple(filter(lambda t: ISOLATED in t['status'], tlist))),
-                downloading=len(tuple(filter(lambda t: t['rate-down'] > 0, tlist))),
-                uploading=len(tuple(filter(lambda t: t['rate-up'] > 0, tlist)))
-            )
+            isolated, downloading, uploading = self._count_torrents(tlist)
+            tc_args.update(isolated=isolated, downloading=downloading, uploading=uploading)
         return TorrentCount(**tc_args)
 
     def _get_transfer_rate(self, direction):
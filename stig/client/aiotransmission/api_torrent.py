@@ -10,13 +10,13 @@
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
 import base64
+import collections
 import os
 import time
 from collections import abc
 from string import hexdigits as HEXDIGITS
 
-from natsort import humansorted
-
+from ...utils.ngram import NgramIndex
 from .. import ClientError
 from ..base import TorrentAPIBase
 from ..constants import MAX_TORRENT_FILE_SIZE
@@ -33,19 +33,75 @@ class _TorrentCache():
     def __init__(self, raw_torrents=()):
         self._tdict = {}  # Map torrent IDs to Torrent objects
 
+        # Every update() and purge() creates a new generation.  For each torrent
+        # ID, we remember the generation it was last changed in (most recent
+        # last), the generation it was added in and the generation each key
+        # was last changed in.
+        self._generation = 0
+        self._changed = collections.OrderedDict()
+        self._history = {}
+
+        # Map Torrent keys to NgramIndex instances
+        self._indexes = {}
+
+    @property
+    def indexed_keys(self):
+        """Torrent keys with string values that are indexed for substring searches"""
+        return tuple(self._indexes)
+
+    @indexed_keys.setter
+    def indexed_keys(self, keys):
+        self._indexes = {key: self._indexes.get(key, NgramIndex()) for key in keys}
+        for torrent in self._tdict.values():
+            self._update_indexes(torrent, keys)
+
+    def _update_indexes(self, torrent, keys):
+        indexes = self._indexes
+        for key in keys:
+            index = indexes.get(key)
+            if index is not None and key in torrent:
+                index.update(torrent['id'], torrent[key])
+
+    def candidates(self, key, substring):
+        """
+        Return IDs of torrents with `key` values that may contain `substring`
+
+        Return `None` if `key` is not indexed, not all torrents are indexed or
+        `substring` is too short.
+        """
+        index = self._indexes.get(key)
+        if index is not None and len(index) == len(self._tdict):
+            return index.candidates(substring)
+
+    def _record_change(self, tid):
+        self._changed[tid] = self._generation
+        self._changed.move_to_end(tid)
+
     def update(self, raw_torrents):
         # import time ; start = time.time()
+        self._generation += 1
         tdict = self._tdict
         for rt in raw_torrents:
             tid = rt['id']
             if tid in tdict:
                 # Update existing torrent
                 # log.debug('Updating torrent #%d, %d keys: %s', tid, len(rt), tuple(rt))
-                tdict[tid].update(rt)
+                changed_keys = tdict[tid].update(rt)
+                if changed_keys:
+                    key_generations = self._history[tid][1]
+                    for key in changed_keys:
+                        key_generations[key] = self._generation
+                    self._record_change(tid)
+                    if self._indexes:
+                        self._update_indexes(tdict[tid], changed_keys)
             else:
                 # Add new torrent
                 # log.debug('Adding torrent #%d, %d keys: %s', tid, len(rt), tuple(rt))
                 tdict[tid] = Torrent(rt)
+                self._history[tid] = (self._generation, {})
+                self._record_change(tid)
+                if self._indexes:
+                    self._update_indexes(tdict[tid], self._indexes)
         # log.debug('Updated %d cached with %d new torrents in %.3fms',
         #           len(tdict), len(raw_torrents), (time.time()-start)*1000)
 
@@ -56,16 +112,60 @@ class _TorrentCache():
         removed_tids = known_tids.difference(existing_tids)
         if removed_tids:
             log.debug('Clearing cached torrents: %r', removed_tids)
+            self._generation += 1
         for tid in removed_tids:
             del tdict[tid]
+            del self._history[tid]
+            self._record_change(tid)
+            for index in self._indexes.values():
+                index.remove(tid)
+
+    def changes(self, since=None):
+        """
+        Return torrents that changed after generation `since`
+
+        Return the current generation, a dictionary that maps changed Torrent
+        objects to the set of keys that changed (`None` for added torrents) and
+        a set of the IDs of removed torrents.  If `since` is `None`, all
+        torrents are reported as added.
+
+        This takes time proportional to the number of changed torrents.
+        """
+        if since is None:
+            return self._generation, dict.fromkeys(self._tdict.values()), set()
+
+        tdict = self._tdict
+        history = self._history
+        changed = {}
+        removed = set()
+        for tid,generation in reversed(self._changed.items()):
+            if generation <= since:
+                break
+            torrent = tdict.get(tid)
+            if torrent is None:
+                removed.add(tid)
+            else:
+                added, key_generations = history[tid]
+                if added > since:
+                    changed[torrent] = None
+                else:
+                    changed[torrent] = {key for key,generation in key_generations.items()
+                                        if generation > since}
+        return self._generation, changed, removed
 
     def get(self, *ids):
         """Return tuple of Torrent objects"""
         if ids:
+            ids = frozenset(ids)
             return tuple(t for tid,t in self._tdict.items() if tid in ids)
         else:
             return tuple(self._tdict.values())
 
+    def get_existing(self, ids):
+        """Return tuple of Torrent objects with IDs in `ids` that are cached"""
+        tdict = self._tdict
+        return tuple(tdict[tid] for tid in ids if tid in tdict)
+
     def __len__(self):
         return len(self._tdict)
 
@@ -78,14 +178,43 @@ class _TorrentCache():
 class TorrentAPI(TorrentAPIBase):
     """High-level abstraction of the Transmission RPC protocol"""
 
-    def __init__(self, rpc):
+    # Keys that are indexed if `search_index` is enabled
+    _SEARCH_INDEX_KEYS = ('name', 'path', 'comment')
+
+    def __init__(self, rpc, search_index=False):
         self.rpc = rpc
         self._tcache = _TorrentCache()
+        self.search_index = search_index
+
+    @property
+    def search_index(self):
+        """
+        Whether to index torrent names, paths and comments
+
+        The index is used to find torrents that can match filters like "name~foo"
+        without applying the filter to every torrent.
+        """
+        return bool(self._tcache.indexed_keys)
+
+    @search_index.setter
+    def search_index(self, enabled):
+        self._tcache.indexed_keys = self._SEARCH_INDEX_KEYS if enabled else ()
 
     def clearcache(self):
         """Remove all torrents from cache"""
         self._tcache.purge(existing_tids=())
 
+    def changes(self, since=None):
+        """
+        Return cached torrents that changed after generation `since`
+
+        Return the current generation, a dictionary that maps changed Torrent
+        objects to the set of keys that changed (`None` for added torrents) and
+        a set of the IDs of removed torrents.  If `since` is `None`, all cached
+        torrents are reported as added.
+        """
+        return self._tcache.changes(since)
+
     @staticmethod
     async def _request(method, *args, **kwargs):
         try:
@@ -319,6 +448,86 @@ class TorrentAPI(TorrentAPIBase):
         else:
             return self._get_torrents_from_cache(ids)
 
+    def _find_torrent_ids(self, tfilter):
+        """
+        Return IDs of all torrents that can match `tfilter` or `None`
+
+        Each OR-combined part of `tfilter` must contain a filter that pins it
+        to specific torrents (see `_find_torrent_ids_for_filter`).  Otherwise,
+        `None` is returned and all torrents must be requested.
+
+        The returned set may contain non-matching torrents; `tfilter` must still
+        be applied.
+        """
+        ids = set()
+        for AND_chain in tfilter.chains:
+            # Torrent IDs (int) and hashes (str) can't be intersected, but any
+            # set of IDs or hashes contains all matching torrents
+            id_sets = {int: [], str: []}
+            for f in AND_chain:
+                f_ids = self._find_torrent_ids_for_filter(f)
+                if f_ids is not None:
+                    id_sets[str if f.name == 'hash' else int].append(f_ids)
+            chain_ids = id_sets[int] or id_sets[str]
+            if not chain_ids:
+                return None
+            ids.update(set.intersection(*chain_ids))
+        return ids or None
+
+    def _find_torrent_ids_for_filter(self, f):
+        """
+        Return set of torrent IDs or hashes `f` can match or `None`
+
+        Only non-inverted filters that use the "=" operator on the torrent ID
+        or hash are considered.  IDs are used directly and hashes are sent to
+        the daemon (which accepts them as IDs).  Names are not looked up in the
+        cache because torrents may have been added or renamed since it was
+        updated.
+        """
+        if f.inverted or f.value is None or f.operator != '=':
+            return None
+        elif f.name == 'id':
+            return {int(f.value)}
+        elif f.name == 'hash' and len(f.value) == 40:
+            return {str(f.value).lower()}
+        return None
+
+    def find_candidates(self, tfilter):
+        """
+        Return IDs of cached torrents that can match `tfilter` or `None`
+
+        Each OR-combined part of `tfilter` must contain a filter that searches
+        for a substring in a key that is indexed (see `search_index`).
+        Otherwise, `None` is returned and `tfilter` must be applied to all
+        torrents.
+
+        The cache must be up to date because torrents that are not cached are
+        not found.
+        """
+        ids = set()
+        for AND_chain in tfilter.chains:
+            candidate_sets = [c for c in map(self._find_candidates_in_index_for_filter, AND_chain)
+                              if c is not None]
+            if not candidate_sets:
+                return None
+            ids.update(set.intersection(*candidate_sets))
+        return ids
+
+    _REGEX_SPECIAL_CHARS = frozenset('.^$*+?{}[]\\|()')
+
+    def _find_candidates_in_index_for_filter(self, f):
+        if f.inverted or f.value is None or f.name not in self._tcache.indexed_keys:
+            return None
+        elif f.operator in ('=', '~'):
+            # The filter matches the converted value, e.g. a normalized path
+            substring = str(f.converted_value)
+        elif f.operator == '=~' and self._REGEX_SPECIAL_CHARS.isdisjoint(f.value):
+            # Regular expression without special characters
+            substring = f.value
+        else:
+            return None
+        return self._tcache.candidates(f.name, substring)
+
     async def _get_torrents_by_filter(self, keys, tfilter=None, from_cache=False):
         """
         Return a Response object with 'torrents' set to a tuple of Torrents
@@ -338,6 +547,27 @@ class TorrentAPI(TorrentAPIBase):
 
             tlist = ()
 
+            ids = None if from_cache else self._find_torrent_ids(tfilter)
+            if ids is not None:
+                # Request only torrents that can match with all wanted keys
+                log.debug('Requesting torrents that can match: %s', ids)
+                if keys == 'ALL':
+                    fields = TorrentFields(keys)
+                else:
+                    fields = TorrentFields(*keys, *tfilter.needed_keys)
+                response = await self._request_torrents(fields, tuple(ids))
+                if not response.success:
+                    return Response(success=False, torrents=(), errors=response.errors)
+                else:
+                    tids = tuple(t['id'] for t in response.raw_torrents)
+                    tlist = tuple(tfilter.apply(self._tcache.get(*tids)))
+                    return self._filtered_torrents_response(tfilter, tlist)
+
+            if not from_cache:
+                response = await self._get_torrents_by_filter_in_two_phases(keys, tfilter)
+                if response is not None:
+                    return response
+
             # Request all torrents with the keys needed to filter them
             log.debug('Requesting full list with filter keys: %s', tfilter.needed_keys)
             response = await self._get_torrents_by_ids(keys=tfilter.needed_keys,
@@ -345,8 +575,16 @@ class TorrentAPI(TorrentAPIBase):
             if not response.success:
                 return Response(success=False, torrents=(), errors=response.errors)
             else:
-                # Find IDs of torrents that match tfilter
-                wanted_ids = tuple(t['id'] for t in tfilter.apply(response.torrents))
+                # Find IDs of torrents that match tfilter.  The cache is up to
+                # date now, so the search index can pre-select torrents that
+                # can match.  Otherwise, only torrents that changed since the
+                # last time tfilter was applied are matched.
+                candidate_ids = self.find_candidates(tfilter)
+                if candidate_ids is not None:
+                    wanted_ids = tuple(t['id'] for t in
+                                       tfilter.apply(self._tcache.get_existing(candidate_ids)))
+                else:
+                    wanted_ids = tuple(tfilter.apply_incremental(self._tcache))
                 log.debug('Wanted IDs: %s', wanted_ids)
                 if len(wanted_ids) > 0:
                     # Get only wanted torrents with all wanted keys
@@ -357,14 +595,77 @@ class TorrentAPI(TorrentAPIBase):
                     else:
                         tlist = tuple(response.torrents)
 
-            success = len(tlist) > 0
-            msgs = errors = ()
-            if not success:
-                errors = ('No matching torrents: %s' % (tfilter,),)
-            else:
-                msgs = ('Found %d %s torrent%s' %
-                        (len(tlist), tfilter, '' if len(tlist) == 1 else 's'),)
-            return Response(success=success, torrents=tlist, msgs=msgs, errors=errors)
+            return self._filtered_torrents_response(tfilter, tlist)
+
+    @staticmethod
+    def _is_expensive_filter(f):
+        # Filters that need list fields (trackers, peers, etc) are expensive
+        return not TorrentFields.LIST_FIELDS.isdisjoint(TorrentFields(*f.needed_keys))
+
+    async def _get_torrents_by_filter_in_two_phases(self, keys, tfilter):
+        """
+        Return a Response object like `_get_torrents_by_filter` or `None`
+
+        First, request all torrents with the keys needed by cheap filters.  Then
+        request the keys needed by expensive filters only for torrents that
+        can't be decided by the cheap filters (see `_is_expensive_filter`).
+
+        Return `None` if `tfilter` doesn't combine cheap and expensive filters.
+        """
+        filters = set(f for AND_chain in tfilter.chains for f in AND_chain)
+        expensive = set(f for f in filters if self._is_expensive_filter(f))
+        if not expensive or expensive == filters:
+            return None
+
+        cheap_keys = set()
+        for f in filters - expensive:
+            cheap_keys.update(f.needed_keys)
+        log.debug('Requesting full list with cheap filter keys: %s', cheap_keys)
+        response = await self._get_torrents_by_ids(keys=tuple(cheap_keys))
+        if not response.success:
+            return Response(success=False, torrents=(), errors=response.errors)
+
+        wanted_ids = []
+        undecided_ids = []
+        for t in response.torrents:
+            match = tfilter.match_partial(t, lambda f: f not in expensive)
+            if match is None:
+                undecided_ids.append(t['id'])
+            elif match:
+                wanted_ids.append(t['id'])
+
+        if undecided_ids:
+            expensive_keys = set()
+            for f in expensive:
+                expensive_keys.update(f.needed_keys)
+            log.debug('Requesting %d undecided torrents with expensive filter keys: %s',
+                      len(undecided_ids), expensive_keys)
+            response = await self._request_torrents(TorrentFields(*expensive_keys),
+                                                    tuple(undecided_ids))
+            if not response.success:
+                return Response(success=False, torrents=(), errors=response.errors)
+            wanted_ids.extend(t['id'] for t in tfilter.apply(self._tcache.get(*undecided_ids)))
+
+        tlist = ()
+        log.debug('Wanted IDs: %s', wanted_ids)
+        if wanted_ids:
+            # Get only wanted torrents with all wanted keys
+            response = await self._get_torrents_by_ids(keys, tuple(wanted_ids))
+            if not response.success:
+                return Response(success=False, torrents=(), errors=response.errors)
+            tlist = tuple(response.torrents)
+        return self._filtered_torrents_response(tfilter, tlist)
+
+    @staticmethod
+    def _filtered_torrents_response(tfilter, tlist):
+        success = len(tlist) > 0
+        msgs = errors = ()
+        if not success:
+            errors = ('No matching torrents: %s' % (tfilter,),)
+        else:
+            msgs = ('Found %d %s torrent%s' %
+                    (len(tlist), tfilter, '' if len(tlist) == 1 else 's'),)
+        return Response(success=success, torrents=tlist, msgs=msgs, errors=errors)
 
     async def torrents(self, torrents=None, keys='ALL', from_cache=False):
         """
@@ -766,7 +1067,7 @@ class TorrentAPI(TorrentAPIBase):
             torrent_ids = []
             msgs = []
             errors = []
-            for t in humansorted(response.torrents, key=lambda t: t['name']):
+            for t in sorted(response.torrents, key=lambda t: t['name'].natsort_key):
                 # Filter torrent's files
                 flist = filter_files(t['files'])
                 if files is None:
@@ -196,8 +196,31 @@ class TorrentFileID(tuple):
         return 'TorrentFileID(torrent_id=%d, file_id=%d)' % self
 
 class TorrentFileTree(base.TorrentFileTreeBase):
+    # Map TorrentFile keys to callables that take a raw file (see create()) and
+    # a raw torrent
+    _RAW_GETTERS = {
+        'id'              : lambda f, t: f['id'],
+        'tid'             : lambda f, t: t['id'],
+        'name'            : lambda f, t: os.path.basename(f['name']),
+        'path-absolute'   : lambda f, t: os.path.join(t['downloadDir'], f['name']),
+        'path-relative'   : lambda f, t: f['name'],
+        'location'        : lambda f, t: t['downloadDir'],
+        'size-total'      : lambda f, t: f['length'],
+        'size-downloaded' : lambda f, t: f['bytesCompleted'],
+        'is-wanted'       : lambda f, t: f['wanted'],
+        'priority'        : lambda f, t: 'off' if not f['wanted'] else f['priority'],
+        '%downloaded'     : lambda f, t: ttypes._calc_percent(f['bytesCompleted'], f['length']),
+    }
+
     @classmethod
-    def create(cls, raw_torrent):
+    def create(cls, raw_torrent, ffilter=None):
+        """
+        Create TorrentFileTree from raw torrent `raw_torrent`
+
+        If `ffilter` is given, only files that match it are created.  The
+        number of files that were filtered out of each directory is available
+        as `filtered_count`.
+        """
         fileStats = raw_torrent['fileStats']
         if len(fileStats) < 1:
             # filelist is empty if torrent was added by hash and metadata isn't
@@ -210,13 +233,40 @@ class TorrentFileTree(base.TorrentFileTreeBase):
             tid = raw_torrent['id']
             filelist = ({'id': TorrentFileID(tid, i), **f, **fS}
                         for i,(f,fS) in enumerate(zip(raw_torrent['files'], fileStats)))
-        return cls(raw_torrent['id'], raw_torrent['downloadDir'], filelist, path=())
 
-    def __init__(self, torrent_id, torrent_location, filelist, path):
+        filtered = []
+        if ffilter is not None:
+            # Match raw files without creating TorrentFiles
+            raw_file = _RawItem(cls._RAW_GETTERS, {}, ttypes.TorrentFile.TYPES)
+            raw_file.raw_torrent = raw_torrent
+            matching = []
+            for entry in filelist:
+                raw_file.raw_item = entry
+                if ffilter.match(raw_file):
+                    matching.append(entry)
+                else:
+                    filtered.append(entry['name'])
+            filelist = matching
+
+        return cls(raw_torrent['id'], raw_torrent['downloadDir'], filelist, path=(),
+                   filtered=filtered)
+
+    def __init__(self, torrent_id, torrent_location, filelist, path, filtered=()):
         log.debug('Creating new TorrentFileTree for torrent %r: %r', torrent_id, path)
         path_str = os.sep.join(path)
         super().__init__(torrent_location, path_str)
 
+        # Names of files that were filtered out, relative to this directory
+        filtered_count = 0
+        filtered_subdirs = {}
+        for name in filtered:
+            parts = name.split(os.sep, 1)
+            if len(parts) == 1:
+                filtered_count += 1
+            else:
+                filtered_subdirs.setdefault(parts[0], []).append(parts[1])
+        self._filtered_count = filtered_count
+
         items = {}
         subdirs = {}
         for entry in filelist:
@@ -242,7 +292,8 @@ class TorrentFileTree(base.TorrentFileTreeBase):
 
         for subdir,filelist in subdirs.items():
             items[subdir] = TorrentFileTree(torrent_id, torrent_location,
-                                            filelist, path=path + (subdir,))
+                                            filelist, path=path + (subdir,),
+                                            filtered=filtered_subdirs.get(subdir, ()))
         self._items = items
 
     def update(self, raw_torrent):
@@ -267,18 +318,99 @@ class TorrentFileTree(base.TorrentFileTreeBase):
         update_files(self._items, raw_torrent['fileStats'])
 
 
+class _RawItem():
+    """
+    Mapping of a raw RPC item (e.g. a peer) to the values of its wrapper class
+
+    This allows filtering raw items without creating a wrapper object for each
+    one.  Values are computed on every access.  The same instance is pointed at
+    each raw item by setting `raw_item` and `raw_torrent`.
+    """
+
+    __slots__ = ('raw_item', 'raw_torrent', '_getters', '_modifiers', '_types')
+
+    def __init__(self, getters, modifiers, types):
+        self._getters = getters      # Callables that take raw item and raw torrent
+        self._modifiers = modifiers  # Callables that take this instance
+        self._types = types
+        self.raw_item = self.raw_torrent = None
+
+    def __getitem__(self, key):
+        modifier = self._modifiers.get(key)
+        if modifier is not None:
+            value = modifier(self)
+        else:
+            value = self._getters[key](self.raw_item, self.raw_torrent)
+        type = self._types.get(key)
+        return value if type is None else type(value)
+
+
+def _filter_raw_items(raw_items, raw_torrent, item_filter, raw_item, create):
+    """
+    Yield wrapper objects of `raw_items` that match `item_filter`
+
+    raw_item: _RawItem instance that is used to match each item
+    create:   Callable that takes a raw item and returns its wrapper object
+
+    Wrapper objects are only created for matching items or if `item_filter`
+    needs a value that `raw_item` doesn't provide.
+    """
+    match = item_filter.match
+    raw_item.raw_torrent = raw_torrent
+    for raw in raw_items:
+        raw_item.raw_item = raw
+        try:
+            is_match = match(raw_item)
+        except KeyError:
+            item = create(raw)
+            if match(item):
+                yield item
+        else:
+            if is_match:
+                yield create(raw)
+
+
 class PeerList(tuple):
-    def __new__(cls, t):
-        TorrentPeer = ttypes.TorrentPeer
-        return super().__new__(
-            cls,
-            (TorrentPeer(tid=t['id'], tname=t['name'], tsize=t['totalSize'],
-                         ip=p['address'], port=p['port'], client=p['clientName'],
-                         downloaded=p['progress'] * t['totalSize'],
-                         pdownloaded=p['progress'] * 100,
-                         rate_up=p['rateToPeer'], rate_down=p['rateToClient'])
-             for p in t['peers'])
-        )
+    # Map TorrentPeer keys to callables that take a raw peer and a raw torrent
+    _RAW_GETTERS = {
+        'tid'         : lambda p, t: t['id'],
+        'tname'       : lambda p, t: t['name'],
+        'tsize'       : lambda p, t: t['totalSize'],
+        'ip'          : lambda p, t: p['address'],
+        'port'        : lambda p, t: p['port'],
+        'client'      : lambda p, t: p['clientName'],
+        'downloaded'  : lambda p, t: p['progress'] * t['totalSize'],
+        '%downloaded' : lambda p, t: p['progress'] * 100,
+        'rate-up'     : lambda p, t: p['rateToPeer'],
+        'rate-down'   : lambda p, t: p['rateToClient'],
+    }
+
+    def __new__(cls, t, pfilter=None):
+        """
+        Create TorrentPeer objects from raw torrent `t`
+
+        If `pfilter` is given, only peers that match it are created.
+        """
+        def create(p):
+            return ttypes.TorrentPeer(tid=t['id'], tname=t['name'], tsize=t['totalSize'],
+                                      ip=p['address'], port=p['port'], client=p['clientName'],
+                                      downloaded=p['progress'] * t['totalSize'],
+                                      pdownloaded=p['progress'] * 100,
+                                      rate_up=p['rateToPeer'], rate_down=p['rateToClient'])
+
+        if pfilter is None:
+            peers = (create(p) for p in t['peers'])
+        else:
+            # Rate and ETA estimates need samples of all peers, even the ones
+            # that are filtered out
+            tid = t['id']
+            record_progress = ttypes.TorrentPeer.record_progress
+            for p in t['peers']:
+                record_progress(tid, p['address'], p['port'], p['progress'] * 100)
+            raw_peer = _RawItem(cls._RAW_GETTERS, ttypes.TorrentPeer._MODIFIERS,
+                                ttypes.TorrentPeer.TYPES)
+            peers = _filter_raw_items(t['peers'], t, pfilter, raw_peer, create)
+        return super().__new__(cls, peers)
 
 
 class TrackerList(tuple):
@@ -345,10 +477,36 @@ class TrackerList(tuple):
         else:
             return utils.Timestamp.NEVER
 
-    def __new__(cls, raw_torrent):
-        return super().__new__(cls,
-            (ttypes.TorrentTracker(
-                (LazyDict({  # noqa: E128
+    # Map TorrentTracker keys to callables that take a raw tracker and a raw
+    # torrent (for filtering raw trackers)
+    _RAW_GETTERS = {
+        'tid'                : lambda trk, t: t['id'],
+        'tname'              : lambda trk, t: t['name'],
+        'tier'               : lambda trk, t: trk['tier'],
+        'url-announce'       : lambda trk, t: trk['announce'],
+        'url-scrape'         : lambda trk, t: trk['scrape'],
+        'status-announce'    : lambda trk, t: TrackerList._STATES_ANNOUNCE[trk['announceState']],
+        'status-scrape'      : lambda trk, t: TrackerList._STATES_SCRAPE[trk['scrapeState']],
+        'error-announce'     : lambda trk, t: TrackerList._error_announce(trk),
+        'error-scrape'       : lambda trk, t: TrackerList._error_scrape(trk),
+        'count-downloads'    : lambda trk, t: trk['downloadCount'],
+        'count-leeches'      : lambda trk, t: trk['leecherCount'],
+        'count-seeds'        : lambda trk, t: trk['seederCount'],
+        'time-last-announce' : lambda trk, t: TrackerList._last_time(trk, 'Announce'),
+        'time-last-scrape'   : lambda trk, t: TrackerList._last_time(trk, 'Scrape'),
+        'time-next-announce' : lambda trk, t: TrackerList._next_time(trk, 'Announce'),
+        'time-next-scrape'   : lambda trk, t: TrackerList._next_time(trk, 'Scrape'),
+    }
+
+    def __new__(cls, raw_torrent, trkfilter=None):
+        """
+        Create TorrentTracker objects from `raw_torrent`
+
+        If `trkfilter` is given, only trackers that match it are created.
+        """
+        def create(raw_tracker):
+            return ttypes.TorrentTracker(
+                LazyDict({
                     'id'                 : (raw_torrent['id'], raw_tracker['id']),
                     'tid'                : raw_torrent['id'],
                     'tname'              : raw_torrent['name'],
@@ -371,8 +529,16 @@ class TrackerList(tuple):
                     'time-last-scrape'   : lambda: cls._last_time(raw_tracker, 'Scrape'),
                     'time-next-announce' : lambda: cls._next_time(raw_tracker, 'Announce'),
                     'time-next-scrape'   : lambda: cls._next_time(raw_tracker, 'Scrape'),
-                }))) for raw_tracker in raw_torrent['trackerStats'])
-        )
+                }))
+
+        raw_trackers = raw_torrent['trackerStats']
+        if trkfilter is None:
+            trackers = (create(raw_tracker) for raw_tracker in raw_trackers)
+        else:
+            raw_tracker = _RawItem(cls._RAW_GETTERS, ttypes.TorrentTracker._MODIFIERS,
+                                   ttypes.TorrentTracker.TYPES)
+            trackers = _filter_raw_items(raw_trackers, raw_torrent, trkfilter, raw_tracker, create)
+        return super().__new__(cls, trackers)
 
 
 # Map abstracted keys to tuples of needed RPC field names
@@ -431,6 +597,11 @@ DEPENDENCIES = {
     'files'                        : ('files', 'fileStats', 'downloadDir'),
 }
 
+# Map RPC field names to tuples of abstracted keys that depend on them
+DEPENDENTS = {field: tuple(key for key,fields in DEPENDENCIES.items() if field in fields)
+              for fields in DEPENDENCIES.values()
+              for field in fields}
+
 
 class Torrent(base.TorrentBase):
     """
@@ -481,30 +652,35 @@ class Torrent(base.TorrentBase):
         self._cache = {}
 
     def update(self, raw_torrent):
+        """
+        Update RPC values from `raw_torrent`
+
+        Return set of keys with changed values
+        """
         cache = self._cache
         raw_old = self._raw
 
+        # Find keys that depend on any RPC field that has a new value
+        changed_keys = set()
+        for field,new_value in raw_torrent.items():
+            if new_value is not None and new_value != raw_old.get(field):
+                changed_keys.update(DEPENDENTS.get(field, ()))
+
         # Remove cached values if their original/raw value(s) differ
-        for k in tuple(cache):
-            # Each key depends on one or more RPC field
-            fields = DEPENDENCIES[k]
-            for field in fields:
-                new_value = raw_torrent.get(field)
-                old_value = raw_old.get(field)
-                if new_value is not None and new_value != old_value:
-                    # log.debug('Invalidating cached %s/%s: %r -> %r', k, field, old_value, new_value)
-                    # New and previous value differ - if we are dealing with
-                    # more complex data structures (e.g. a file tree), use the
-                    # update() method to update the object in cache instead of
-                    # removing it from the cache.
-                    value = cache[k]
-                    if hasattr(value, 'update') and all(field in raw_torrent for field in fields):
-                        value.update(raw_torrent)
-                    del cache[k]
-                    break
+        for k in changed_keys:
+            if k in cache:
+                # log.debug('Invalidating cached %s', k)
+                # If we are dealing with more complex data structures (e.g. a
+                # file tree), use the update() method to update the object in
+                # cache instead of removing it from the cache.
+                value = cache[k]
+                if hasattr(value, 'update') and all(field in raw_torrent for field in DEPENDENCIES[k]):
+                    value.update(raw_torrent)
+                del cache[k]
 
         # Now we can forget the old values
         raw_old.update(raw_torrent)
+        return changed_keys
 
     def __getitem__(self, key):
         cache = self._cache
@@ -560,6 +736,31 @@ class Torrent(base.TorrentBase):
     def __hash__(self):
         return hash(self._raw['id'])
 
+    # Map keys with lists of items to callables that take the raw torrent and
+    # a filter and return the matching items
+    _FILTERABLE = {
+        'peers'    : PeerList,
+        'trackers' : TrackerList,
+    }
+
+    def filtered(self, key, item_filter):
+        """
+        Return tuple of items (e.g. peers) of `key` that match `item_filter`
+
+        Peers and trackers are matched against the raw RPC values and only
+        matching peers and trackers are created.  The result is not cached.
+
+        For "files", a TorrentFileTree that contains only matching files is
+        returned.
+        """
+        if key == 'files':
+            return TorrentFileTree.create(self._raw, item_filter)
+        create_filtered = self._FILTERABLE.get(key)
+        if create_filtered is None or key in self._cache:
+            return super().filtered(key, item_filter)
+        else:
+            return create_filtered(self._raw, item_filter)
+
     def clearcache(self):
         self._cache = {}
 
@@ -596,6 +797,11 @@ class TorrentFields(tuple):
                    'fileStats', 'peers', 'peersFrom', 'pieces', 'priorities',
                    'trackers', 'trackerStats', 'wanted', 'webseeds')
 
+    # Fields that can be big for each torrent
+    LIST_FIELDS = frozenset(('files', 'fileStats', 'peers', 'peersFrom', 'pieces',
+                             'priorities', 'trackers', 'trackerStats', 'wanted',
+                             'webseeds'))
+
     _ALL_FIELDS = tuple(set(field
                             for fields in DEPENDENCIES.values()
                             for field in fields))
@@ -17,9 +17,9 @@ from .aiotransmission.api_settings import SettingsAPI
 from .aiotransmission.api_status import StatusAPI
 from .aiotransmission.api_torrent import TorrentAPI
 from .aiotransmission.rpc import TransmissionRPC
-from .poll import RequestPoller
+from .poll import PollScheduler, RequestPoller
 from .trequestpool import TorrentRequestPool
-from .utils import SleepUneasy, cached_property
+from .utils import cached_property
 
 from ..logging import make_logger  # isort:skip
 log = make_logger(__name__)
@@ -46,7 +46,8 @@ class API():
         self._rpc = TransmissionRPC(host=host, port=port, tls=tls, user=user,
                                     password=password, path=path)
         self._pollers = []
-        self._manage_pollers_interval = SleepUneasy()
+        self._scheduler = PollScheduler(interval=interval)
+        self._polling = False
         self.interval = interval
 
     @property
@@ -64,6 +65,7 @@ class API():
         self._interval = float(interval)
         for poller in self._existing_pollers:
             poller.interval = self._interval
+        self._scheduler.interval = self._interval
 
 
     def created(self, prop):
@@ -76,13 +78,13 @@ class API():
         log.debug('Creating TorrentAPI singleton')
         return TorrentAPI(self.rpc)
 
-    @cached_property(after_creation=lambda self: setattr(self, 'status_created', True))
+    @cached_property(after_creation=lambda self: self._poller_created('status'))
     def status(self):
         """StatusAPI singleton"""
         log.debug('Creating StatusAPI singleton')
-        return StatusAPI(self, interval=self._interval)
+        return StatusAPI(self, interval=self._interval, scheduler=self._scheduler)
 
-    @cached_property
+    @cached_property(after_creation=lambda self: self._poller_created('freespace'))
     def freespace(self):
         """FreeSpaceAPI singleton"""
         log.debug('Creating FreeSpaceAPI singleton')
@@ -90,24 +92,27 @@ class API():
                         lambda: self.settings['path.incomplete'])
         return FreeSpaceAPI(path_getters,
                             rpc=self.rpc,
-                            settings=self.settings)
+                            settings=self.settings,
+                            interval=self._interval,
+                            scheduler=self._scheduler)
 
-    @cached_property(after_creation=lambda self: setattr(self, 'settings_created', True))
+    @cached_property(after_creation=lambda self: self._poller_created('settings'))
     def settings(self):
         """SettingsAPI singleton"""
         log.debug('Creating SettingsAPI singleton')
-        return SettingsAPI(self, interval=self._interval)
+        return SettingsAPI(self, interval=self._interval, scheduler=self._scheduler)
 
-    @cached_property(after_creation=lambda self: setattr(self, 'treqpool_created', True))
+    @cached_property(after_creation=lambda self: self._poller_created('treqpool'))
     def treqpool(self):
         """TorrentRequestPool singleton"""
         log.debug('Creating TorrentRequestPool singleton')
-        return TorrentRequestPool(self, interval=self._interval)
+        return TorrentRequestPool(self, interval=self._interval, finish_ongoing=True,
+                                  scheduler=self._scheduler)
 
 
     def create_poller(self, *args, interval=None, **kwargs):
         """
-        Create, start and return custom RequestPoller instance
+        Create and return custom RequestPoller instance
 
         All arguments are used to create the poller, except for `interval`,
         which is ignored and replaced with this object's `interval` attribute so
@@ -115,60 +120,63 @@ class API():
 
         The RequestPoller instance is treated like all other pollers, i.e. it
         is polled when `poll` is called, its interval is changed when
-        `interval` is set, etc.
+        `interval` is set, etc.  Its requests are sent together with the
+        requests of all other pollers.
+
+        The poller is started when its first callback is registered and stopped
+        and forgotten as soon as its last callback is removed.
         """
-        poller = RequestPoller(*args, interval=self.interval, **kwargs)
+        poller = RequestPoller(*args, interval=self.interval, scheduler=self._scheduler, **kwargs)
+        poller.on_callbacks_changed(self._manage_custom_poller, autoremove=False)
         self._pollers.append(poller)
-        self.manage_pollers_now()
         return poller
 
-    async def _manage_pollers(self):
-        def is_needed(poller):
-            # Whether anyone is still interested in the poller
+    @staticmethod
+    def _is_needed(poller):
+        # Whether anyone is still interested in the poller
+        try:
+            return poller.has_callbacks
+        except AttributeError:
             try:
-                return poller.has_callbacks
+                return poller.has_subscribers
             except AttributeError:
-                try:
-                    return poller.has_subscribers
-                except AttributeError:
-                    return True
-
-        async def manage():
-            for poller in self._existing_pollers:
-                if is_needed(poller):
-                    if not poller.running:
-                        log.debug('  Starting because not running and has callbacks: %r', poller)
-                        await poller.start()
-                else:
-                    if poller.running:
-                        log.debug('  Stopping because running and no callbacks: %r', poller)
-                        await poller.stop()
-                    if poller in self._pollers:
-                        self._pollers.remove(poller)
-
-        # To estimate peer download rates, we have to keep track of all the
-        # peers' progresses, and we need to prune that data from time to
-        # time. It's a bit dirty to put this here, but managing another task
-        # just for this isn't much better.
-        from .ttypes import TorrentPeer
-        while True:
-            TorrentPeer.gc_peer_progress_data()
-
-            log.debug('Managing pollers:')
-            await manage()
-
-            # If a poller was added while we were managing the existing
-            # pollers, it won't get started until the next interval.  This
-            # also solves a weird bug that accumulates unused pollers when
-            # rapidly opening and closing file lists.
-            while any(not poller.running for poller in self._pollers):
-                log.debug('Managing pollers again:')
-                await manage()
-
-            await self._manage_pollers_interval.sleep(10)
-
-    def manage_pollers_now(self):
-        self._manage_pollers_interval.interrupt()
+                return True
+
+    def _manage_poller(self, poller):
+        if self._is_needed(poller):
+            if self._polling and not poller.running:
+                asyncio.ensure_future(self._start_poller(poller))
+        elif poller.running:
+            asyncio.ensure_future(self._stop_poller(poller))
+
+    # Callbacks may be removed and added again before a scheduled start or stop
+    # happens, so we check again if it's still wanted
+
+    async def _start_poller(self, poller):
+        if self._polling and not poller.running and self._is_needed(poller):
+            log.debug('Starting because not running and has callbacks: %r', poller)
+            await poller.start()
+
+    async def _stop_poller(self, poller):
+        if poller.running and not self._is_needed(poller):
+            log.debug('Stopping because running and no callbacks: %r', poller)
+            await poller.stop()
+
+    def _manage_custom_poller(self, poller):
+        # Custom pollers are forgotten when nobody needs them anymore
+        if self._is_needed(poller):
+            if poller not in self._pollers:
+                self._pollers.append(poller)
+        elif poller in self._pollers:
+            self._pollers.remove(poller)
+        self._manage_poller(poller)
+
+    def _poller_created(self, pname):
+        setattr(self, pname + '_created', True)
+        poller = getattr(self, pname)
+        if hasattr(poller, 'on_callbacks_changed'):
+            poller.on_callbacks_changed(self._manage_poller, autoremove=False)
+        self._manage_poller(poller)
 
     # Standard pollers accessible through properties
     _STD_POLLERS = ('status', 'freespace', 'settings', 'treqpool')
@@ -199,16 +207,18 @@ class API():
                 poller.poll()
 
     async def start_polling(self):
-        """Start all created pollers"""
-        for poller in self._existing_pollers:
+        """Start all created pollers and any pollers that are created later"""
+        self._polling = True
+        for poller in tuple(self._existing_pollers):
             if not poller.running:
-                await poller.start()
-        self._manage_pollers_task = asyncio.ensure_future(self._manage_pollers())
-        self._manage_pollers_task.add_done_callback(lambda task: task.result())
+                if self._is_needed(poller):
+                    await poller.start()
+                elif poller in self._pollers:
+                    self._pollers.remove(poller)
 
     async def stop_polling(self):
         """Stop all created pollers"""
         for poller in self._existing_pollers:
             if poller.running:
                 await poller.stop()
-        self._manage_pollers_task.cancel()
+        self._polling = False
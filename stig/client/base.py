@@ -17,6 +17,7 @@ from urllib.parse import quote_plus as urlquote
 import blinker
 
 from . import ClientError, utils
+from .poll import RequestPoller
 
 from ..logging import make_logger  # isort:skip
 log = make_logger(__name__)
@@ -93,6 +94,10 @@ class TorrentBase(abc.Mapping):
     def __iter__(self):
         raise NotImplementedError()
 
+    def filtered(self, key, item_filter):
+        """Return tuple of items (e.g. peers) of `key` that match `item_filter`"""
+        return tuple(item_filter.apply(self[key]))
+
     def __repr__(self):
         r = '<{} #{}'.format(type(self).__name__, self['id'])
         if 'name' in self:
@@ -157,6 +162,7 @@ class TorrentFileTreeBase(abc.Mapping):
         self._location = location  # Absolute download location
         self._path = path          # Path relative to location
         self._items = NotImplemented
+        self._filtered_count = 0
 
     @property
     def files(self):
@@ -185,6 +191,11 @@ class TorrentFileTreeBase(abc.Mapping):
         """Relative path in the torrent"""
         return self._path
 
+    @property
+    def filtered_count(self):
+        """Number of files in this directory (not in subdirectories) that were filtered out"""
+        return self._filtered_count
+
     @property
     def id(self):
         return tuple(f['id'] for f in self.files)
@@ -210,15 +221,44 @@ class FreeSpaceAPIBase():
     rpc: Object that can be used by the implementation of get_free_space()
     settings: Object with an on_update() method that allows us to register a callback for
               path changes
+    interval: Delay between free space requests
+    scheduler: PollScheduler instance or None (see RequestPoller)
+
+    Free space is requested at every interval because other processes can
+    change it at any time.  Callbacks are only called if it has changed.
     """
-    def __init__(self, path_getters, rpc, settings):
+    def __init__(self, path_getters, rpc, settings, interval=1, scheduler=None):
         self._path_getters = tuple(path_getters)
         self._rpc = rpc
         self._on_update = blinker.Signal()
         self._info = defaultdict(lambda: SimpleNamespace(path=None, free=None, error=None))
         settings.on_update(self._gather_info_wrapper)
+        self._poller = RequestPoller(self._gather_info_wrapper_coro,
+                                     interval=interval, scheduler=scheduler)
+
+    # Pass poller methods through to our poller
+    async def start(self, *args, **kwargs):
+        await self._poller.start(*args, **kwargs)
+
+    async def stop(self, *args, **kwargs):
+        await self._poller.stop(*args, **kwargs)
+
+    def poll(self, *args, **kwargs):
+        self._poller.poll(*args, **kwargs)
+
+    @property
+    def running(self):
+        return self._poller.running
+
+    @property
+    def interval(self):
+        return self._poller.interval
+
+    @interval.setter
+    def interval(self, interval):
+        self._poller.interval = interval
 
-    def _gather_info_wrapper(self, settings):
+    def _gather_info_wrapper(self, _):
         asyncio.ensure_future(self._gather_info_wrapper_coro())
 
     async def _gather_info_wrapper_coro(self):
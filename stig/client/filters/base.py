@@ -9,12 +9,13 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+import copy
 import itertools
 import operator
 import re
 from collections import abc
 
-from ...utils import cliparser
+from ...utils import LRUCache, cliparser
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
@@ -24,12 +25,50 @@ BOOLEAN = 'boolean'
 COMPARATIVE = 'comparative'
 
 
+def _match_everything(obj):
+    return True
+
+def _match_nothing(obj):
+    return False
+
+def _all_of(predicates):
+    """Return callable that returns whether all `predicates` return True"""
+    if len(predicates) == 1:
+        return predicates[0]
+    elif len(predicates) == 2:
+        p1, p2 = predicates
+        return lambda obj: p1(obj) and p2(obj)
+    else:
+        def all_of(obj):
+            for p in predicates:
+                if not p(obj):
+                    return False
+            return True
+        return all_of
+
+def _any_of(predicates):
+    """Return callable that returns whether any of `predicates` returns True"""
+    if len(predicates) == 1:
+        return predicates[0]
+    elif len(predicates) == 2:
+        p1, p2 = predicates
+        return lambda obj: p1(obj) or p2(obj)
+    else:
+        def any_of(obj):
+            for p in predicates:
+                if p(obj):
+                    return True
+            return False
+        return any_of
+
+
 class BoolFilterSpec():
     """Boolean filter specification"""
 
     type = BOOLEAN
 
-    def __init__(self, func, *, needed_keys=(), aliases=(), description='No description'):
+    def __init__(self, func, *, needed_keys=(), aliases=(), description='No description', cost=0,
+                 volatile=False):
         if not func:
             self.filter_function = None
             needed_keys = ()
@@ -38,6 +77,8 @@ class BoolFilterSpec():
         self.needed_keys = needed_keys
         self.aliases = aliases
         self.description = description
+        self.cost = cost
+        self.volatile = volatile
 
 
 class CmpFilterSpec():
@@ -47,7 +88,7 @@ class CmpFilterSpec():
 
     def __init__(self, *, value_type, value_getter=None, value_matcher=None,
                  value_convert=None, as_bool=None, needed_keys=(), aliases=(),
-                 description='No description'):
+                 description='No description', cost=0, volatile=False):
         """
         value_type    : Subclass of `type` (i.e. something that returns an instance when
                         called and can be passed to `isinstance` as the second argument
@@ -62,11 +103,17 @@ class CmpFilterSpec():
         as_bool       : Callable that takes an item and returns True/False
         needed_keys   : Needed keys for this filter
         aliases       : Alternative names of this filter
+        cost          : Additional cost of getting the item's value(s) (see
+                        `Filter.OPERATOR_COSTS`), e.g. for multiple values
+        volatile      : Whether matches can change without the item changing,
+                        e.g. when comparing against the current time
         """
         self.value_type = value_type
         self.needed_keys = needed_keys
         self.aliases = aliases
         self.description = description
+        self.cost = cost
+        self.volatile = volatile
         self.value_convert = value_convert if value_convert is not None else value_type
 
         if value_getter is not None:
@@ -76,6 +123,7 @@ class CmpFilterSpec():
         else:
             raise TypeError('Missing argument with needed_keys=%r: value_getter', self.needed_keys)
 
+        self._default_value_matcher = value_matcher is None
         if value_matcher is None:
             def value_matcher(item, op, user_value, vg=self.value_getter):
                 item_value = vg(item)
@@ -102,6 +150,15 @@ class CmpFilterSpec():
         elif user_value is None:
             # Operator with no value matches everything
             return (None, (), False)
+        elif self._default_value_matcher:
+            # Same as value_matcher but without the extra function call
+            def f(obj, vg=self.value_getter, op=operator, val=user_value, Iterator=abc.Iterator):
+                item_value = vg(obj)
+                if isinstance(item_value, Iterator):
+                    return any(op(ival, val) for ival in item_value)
+                else:
+                    return op(item_value, val)
+            return (f, self.needed_keys, invert)
         else:
             def f(obj, vm=self.value_matcher, op=operator, val=user_value):
                 return vm(obj, op, val)
@@ -148,6 +205,12 @@ class Filter():
                                                              for op in OPERATORS))
     DEFAULT_FILTER = None
     DEFAULT_OPERATOR = '~'
+
+    # Rough estimates of how expensive it is to evaluate a filter
+    BOOLEAN_COST = 1
+    OPERATOR_COSTS = {'=': 2, '>': 2, '<': 2, '>=': 2, '<=': 2, '~': 3, '=~': 4}
+    CUSTOM_MATCHER_COST = 1
+
     BOOLEAN_FILTERS = {}
     COMPARATIVE_FILTERS = {}
 
@@ -350,44 +413,51 @@ class Filter():
 
         log.debug('  Final filter: name=%r, invert=%r, op=%r, user_value=%r',
                   name, invert, op, user_value)
+        self._cost = self._estimate_cost(name, op, user_value, filter_func)
         self._filter_func = filter_func
         self._needed_keys = needed_keys
         self._name, self._invert, self._op, self._user_value = name, invert, op, user_value
         self._hash = hash((name, invert, op, user_value))
+        self._predicate = self._make_predicate(filter_func, invert)
+
+    @classmethod
+    def _estimate_cost(cls, name, op, user_value, filter_func):
+        if filter_func is None:
+            return 0
+        fspec = cls._get_filter_spec(name)
+        if fspec.type is BOOLEAN or op is None or user_value is None:
+            return cls.BOOLEAN_COST + fspec.cost
+        cost = cls.OPERATOR_COSTS.get(op, cls.BOOLEAN_COST) + fspec.cost
+        if not fspec._default_value_matcher:
+            cost += cls.CUSTOM_MATCHER_COST
+        return cost
+
+    @staticmethod
+    def _make_predicate(filter_func, invert):
+        # Return callable that returns a true value for matching objects
+        if filter_func is None:
+            return _match_nothing if invert else _match_everything
+        elif invert:
+            return lambda obj: not filter_func(obj)
+        else:
+            return filter_func
 
     def apply(self, objs, invert=False, key=None):
         """Yield matching objects or `key` of each matching object"""
-        invert = self._invert ^ bool(invert)  # xor
-        is_wanted = self._filter_func
-        if is_wanted is None:
-            if invert:
-                # This filter matches nothing
-                yield from ()
-            else:
-                # This filter matches everything
-                if key is None:
-                    yield from objs
-                else:
-                    for obj in objs:
-                        yield obj[key]
+        is_wanted = self._predicate
+        if invert:
+            matches = itertools.filterfalse(is_wanted, objs)
         else:
-            if key is None:
-                for obj in objs:
-                    if bool(is_wanted(obj)) ^ invert:
-                        yield obj
-            else:
-                for obj in objs:
-                    if bool(is_wanted(obj)) ^ invert:
-                        yield obj[key]
+            matches = filter(is_wanted, objs)
+        if key is None:
+            yield from matches
+        else:
+            for obj in matches:
+                yield obj[key]
 
     def match(self, obj):
         """Return True if `obj` matches, False otherwise"""
-        is_wanted = self._filter_func
-        if is_wanted is None:
-            # This filter matches everything/nothing
-            return not self._invert
-        else:
-            return bool(is_wanted(obj)) ^ self._invert
+        return bool(self._predicate(obj))
 
     def __str__(self):
         if self._name is None:
@@ -410,6 +480,35 @@ class Filter():
                     val = cliparser.quote(val, delims=(' ', '&', '|'), quotes=("'", '"'))
                 return name + op + val
 
+    @property
+    def name(self):
+        """Filter name with resolved alias or `None`"""
+        return self._name
+
+    @property
+    def operator(self):
+        """Comparison operator (see `OPERATORS`) or `None`"""
+        return self._op
+
+    @property
+    def value(self):
+        """Value as given by the user (unconverted string) or `None`"""
+        return self._user_value
+
+    @property
+    def converted_value(self):
+        """
+        Value converted by the filter's value type (e.g. normalized path) or `None`
+
+        Regular expressions are not compiled.
+        """
+        if self._op is None or self._user_value is None:
+            return None
+        fspec = self._get_filter_spec(self._name)
+        if fspec.type is not COMPARATIVE:
+            return None
+        return fspec.value_convert(self._user_value)
+
     @property
     def needed_keys(self):
         return self._needed_keys
@@ -418,10 +517,27 @@ class Filter():
     def match_everything(self):
         return not self._filter_func
 
+    @property
+    def cost(self):
+        """Estimated relative cost of evaluating this filter"""
+        return self._cost
+
+    @property
+    def volatile(self):
+        """Whether matches can change without the item changing"""
+        return self._get_filter_spec(self._name).volatile
+
     @property
     def inverted(self):
         return self._invert
 
+    def __invert__(self):
+        inverse = copy.copy(self)
+        inverse._invert = not self._invert
+        inverse._hash = hash((self._name, inverse._invert, self._op, self._user_value))
+        inverse._predicate = self._make_predicate(self._filter_func, inverse._invert)
+        return inverse
+
     def __eq__(self, other):
         if isinstance(other, type(self)):
             for attr in ('_name', '_user_value', '_invert', '_op'):
@@ -448,11 +564,122 @@ class _forward_attrs(type):
         setattr(cls, name, attr)
         return attr
 
+    # Filters are immutable, so we can reuse the parsed filters for the same
+    # arguments.  FilterChains are not shared because their planner learns
+    # from the objects it filters.  Volatile filters are parsed every time
+    # because relative times (e.g. "added>12:00") are resolved when parsing.
+    def __call__(cls, *args, **kwargs):
+        created = None
+
+        def create():
+            nonlocal created
+            created = super(_forward_attrs, cls).__call__(*args, **kwargs)
+            return created._filterchains
+
+        filterchains = cls.parse_cache.get((cls, args, tuple(sorted(kwargs.items()))), create,
+                                           cacheable=_is_not_volatile)
+        if created is not None:
+            return created
+        return cls._from_chains(filterchains, simplify=False)
+
+
+def _is_not_volatile(filterchains):
+    return not any(f.volatile for AND_chain in filterchains for f in AND_chain)
+
+
+class _FilterChainPlanner():
+    """
+    Evaluate filter chain in the cheapest order
+
+    AND_chains short-circuit on the first filter that doesn't match and
+    OR_chains short-circuit on the first AND_chain that matches.  Filters are
+    initially ordered by their estimated cost.  The first `sample_size` objects
+    are matched against every filter to measure how many objects each filter
+    lets pass.  After that, cheap filters that reject many objects are
+    evaluated first and AND_chains that are likely to match are tried first.
+    """
+
+    def __init__(self, filterchains, sample_size=100):
+        self._filterchains = filterchains
+        self._stats = {f:[0, 0] for AND_chain in filterchains for f in AND_chain}
+        self._samples_left = sample_size
+        self.predicate = self._compile(self._ordered_chains())
+        if len(self._stats) > 1 and sample_size > 0:
+            self.predicate = self._sample
+
+    @property
+    def order(self):
+        """Filter chains in the order they are currently evaluated"""
+        return self._ordered_chains()
+
+    def _pass_rate(self, f):
+        # Fraction of objects `f` matches (assume 50% if we don't know yet)
+        evaluated, matched = self._stats[f]
+        return (matched + 1) / (evaluated + 2)
+
+    def _ordered_AND_chain(self, AND_chain):
+        # Evaluating filters by ascending cost/(1 - pass_rate) minimizes the
+        # expected cost if filters are independent
+        return tuple(sorted(AND_chain, key=lambda f: f.cost / (1 - self._pass_rate(f))))
+
+    def _AND_chain_rank(self, AND_chain):
+        # Expected cost of evaluating `AND_chain` divided by the probability
+        # that it matches
+        cost = 0
+        probability = 1
+        for f in AND_chain:
+            cost += f.cost * probability
+            probability *= self._pass_rate(f)
+        return cost / probability
+
+    def _ordered_chains(self):
+        AND_chains = (self._ordered_AND_chain(AND_chain) for AND_chain in self._filterchains)
+        return tuple(sorted(AND_chains, key=self._AND_chain_rank))
+
+    def _sample(self, obj):
+        if self._samples_left <= 0:
+            # Callers may still hold a reference to this method
+            return self.predicate(obj)
+
+        stats = self._stats
+        result = False
+        for AND_chain in self._filterchains:
+            AND_result = True
+            for f in AND_chain:
+                stat = stats[f]
+                stat[0] += 1
+                if f._predicate(obj):
+                    stat[1] += 1
+                else:
+                    AND_result = False
+            result = result or AND_result
+
+        self._samples_left -= 1
+        if self._samples_left <= 0:
+            chains = self._ordered_chains()
+            log.debug('Reordered filter chain: %r', chains)
+            self.predicate = self._compile(chains)
+        return result
+
+    @staticmethod
+    def _compile(filterchains):
+        # Fuse all filters into a single callable that returns a true value
+        # for matching objects.  All filters in an AND_chain must match for the
+        # AND_chain to match.  At least one AND_chain must match.
+        if not filterchains:
+            return _match_everything
+        return _any_of(tuple(_all_of(tuple(f._predicate for f in AND_chain))
+                             for AND_chain in filterchains))
+
 
 class FilterChain(metaclass=_forward_attrs):
     """One or more filters combined with AND and OR operators"""
 
     filterclass = NotImplemented
+    parse_cache = LRUCache(maxsize=256)
+
+    # Number of objects to evaluate all filters on before reordering them
+    sample_size = 100
 
     def __init__(self, filters=''):
         if not isinstance(self.filterclass, type) or not issubclass(self.filterclass, Filter):
@@ -462,9 +689,15 @@ class FilterChain(metaclass=_forward_attrs):
             pass
         elif isinstance(filters, abc.Sequence) and all(isinstance(f, str) for f in filters):
             filters = '|'.join(filters)
-        elif isinstance(filters, (type(self), self.filterclass)):
-            filters = str(filters)
-        elif not isinstance(filters, str):
+        elif isinstance(filters, type(self)):
+            self._filterchains = filters._filterchains
+            self._planner = _FilterChainPlanner(self._filterchains, self.sample_size)
+            return
+        elif isinstance(filters, self.filterclass):
+            self._filterchains = ((filters,),)
+            self._planner = _FilterChainPlanner(self._filterchains, self.sample_size)
+            return
+        else:
             raise ValueError('Filters must be string or sequence of strings, not %s: %r'
                              % (type(filters).__name__, filters))
 
@@ -512,27 +745,105 @@ class FilterChain(metaclass=_forward_attrs):
             log.debug('Chained %r and %r to %r', filters, ops, fchain)
             self._filterchains = tuple(tuple(x) for x in fchain)
 
+        self._planner = _FilterChainPlanner(self._filterchains, self.sample_size)
+
+    @classmethod
+    def _from_chains(cls, filterchains, simplify=True):
+        # Create instance from tuple of tuples of filters without parsing
+        self = cls.__new__(cls)
+        self._filterchains = cls._simplify(filterchains) if simplify else filterchains
+        self._planner = _FilterChainPlanner(self._filterchains, cls.sample_size)
+        return self
+
+    @staticmethod
+    def _simplify(filterchains):
+        # Remove duplicate filters, AND_chains that can't match anything
+        # (a&!a) and AND_chains that are absorbed by more general AND_chains
+        # (a|a&b is the same as a)
+        if not filterchains:
+            return ()
+        catch_all = None
+        AND_chains = []
+        AND_sets = []
+        for AND_chain in filterchains:
+            filters = []
+            for f in AND_chain:
+                if f.match_everything and not f.inverted:
+                    # Matching everything doesn't narrow down the AND_chain
+                    catch_all = f
+                elif f not in filters:
+                    filters.append(f)
+            if not filters:
+                # This AND_chain matches everything and so do all AND_chains
+                return ((catch_all,),) if catch_all is not None else ()
+            elif any(f.match_everything or ~f in filters for f in filters):
+                # This AND_chain matches nothing
+                log.debug('Removing contradiction: %r', filters)
+            elif frozenset(filters) not in AND_sets:
+                AND_chains.append(filters)
+                AND_sets.append(frozenset(filters))
+        if not AND_chains:
+            # Nothing matches; keep a contradiction to make that explicit
+            return (tuple(filterchains[0]),)
+        return tuple(tuple(AND_chain) for AND_chain,AND_set in zip(AND_chains, AND_sets)
+                     if not any(other < AND_set for other in AND_sets))
+
     def apply(self, objects):
         """Yield matching objects from iterable `objects`"""
-        chains = self._filterchains
-        if chains:
-            for obj in objects:
-                if any(all(f.match(obj) for f in AND_chain)
-                       for AND_chain in chains):
-                    yield obj
+        yield from filter(self._planner.predicate, objects)
+
+    def apply_ids(self, objects, invert=False, key='id'):
+        """
+        Return frozenset of the `key` values of matching objects
+
+        The result can be combined with other ID sets (e.g. marked items) with
+        set operations.
+        """
+        predicate = self._planner.predicate
+        if invert:
+            return frozenset(obj[key] for obj in objects if not predicate(obj))
         else:
-            yield from objects
+            return frozenset(obj[key] for obj in objects if predicate(obj))
 
     def match(self, obj):
         """Whether `obj` matches this filter chain"""
-        # All filters in an AND_chain must match for the AND_chain to
-        # match.  At least one AND_chain must match.
-        chains = self._filterchains
-        if not chains:
+        return bool(self._planner.predicate(obj))
+
+    def match_partial(self, obj, usable):
+        """
+        Whether `obj` matches this filter chain, considering only some filters
+
+        usable: Callable that gets a Filter and returns whether it can be
+                applied to `obj`
+
+        Return `None` if the usable filters are not enough to decide.
+        """
+        if not self._filterchains:
             return True
-        else:
-            return any(all(f.match(obj) for f in AND_chain)
-                       for AND_chain in chains)
+        decided = True
+        for AND_chain in self._filterchains:
+            result = True
+            for f in AND_chain:
+                if not usable(f):
+                    result = None
+                elif not f.match(obj):
+                    result = False
+                    break
+            if result is True:
+                return True
+            elif result is None:
+                decided = False
+        return False if decided else None
+
+    @property
+    def chains(self):
+        """Tuple of OR-combined tuples of AND-combined filters"""
+        return self._filterchains
+
+    @property
+    def volatile(self):
+        """Whether matches can change without the objects changing"""
+        return any(f.volatile for AND_chain in self._filterchains for f in AND_chain)
 
     @property
     def needed_keys(self):
@@ -570,12 +881,38 @@ class FilterChain(metaclass=_forward_attrs):
         cls = type(self)
         if not isinstance(other, cls):
             return NotImplemented
+        elif not self._filterchains:
+            return other
+        elif not other._filterchains:
+            return self
         else:
-            return cls(str(self) + '&' + str(other))
+            # (a|b)&(c|d) is the same as a&c|a&d|b&c|b&d
+            return cls._from_chains(tuple(a + b for a in self._filterchains
+                                          for b in other._filterchains))
 
     def __or__(self, other):
         cls = type(self)
         if not isinstance(other, cls):
             return NotImplemented
+        elif not self._filterchains:
+            return self
+        elif not other._filterchains:
+            return other
         else:
-            return cls(str(self) + '|' + str(other))
+            return cls._from_chains(self._filterchains + other._filterchains)
+
+    def __invert__(self):
+        cls = type(self)
+        if not self._filterchains:
+            # Everything is matched, so the inverse of a catch-all filter matches nothing
+            for name,fspec in self.filterclass.BOOLEAN_FILTERS.items():
+                if fspec.type is BOOLEAN and fspec.filter_function is None:
+                    return cls._from_chains(((~self.filterclass(name),),))
+            raise ValueError('%s has no catch-all filter' % (self.filterclass.__name__,))
+        else:
+            # !(a&b|c) is the same as (!a|!b)&!c
+            inverse = None
+            for AND_chain in self._filterchains:
+                inverted_chain = cls._from_chains(tuple((~f,) for f in AND_chain))
+                inverse = inverted_chain if inverse is None else inverse & inverted_chain
+            return inverse
@@ -11,6 +11,9 @@
 
 """Filtering Torrents by their values"""
 
+import types
+import weakref
+
 from ..base import TorrentBase
 from ..utils import Bandwidth, BoolOrBandwidth, Status, convert
 from .base import BoolFilterSpec, CmpFilterSpec, Filter, FilterChain, FilterSpecDict
@@ -201,6 +204,7 @@ class _SingleFilter(Filter):
                                           value_type=str,
                                           needed_keys=('trackers',),
                                           aliases=('trk',),
+                                          cost=3,
                                           description=_desc('... domain of the announce URL of trackers')),
 
         'eta'             : CmpFilterSpec(value_getter=lambda t: t['timespan-eta'],
@@ -208,6 +212,7 @@ class _SingleFilter(Filter):
                                           value_type=TorrentBase.TYPES['timespan-eta'],
                                           value_convert=timestamp_or_timedelta,
                                           needed_keys=('timespan-eta',),
+                                          volatile=True,
                                           description=_desc('... estimated time to finish downloading')),
 
         'created'         : CmpFilterSpec(value_getter=lambda t: t['time-created'],
@@ -216,6 +221,7 @@ class _SingleFilter(Filter):
                                           value_convert=lambda v: timestamp_or_timedelta(v, default_sign=-1),
                                           needed_keys=('time-created',),
                                           aliases=('tcrt',),
+                                          volatile=True,
                                           description=_desc('... torrent creation time')),
 
         'added'           : CmpFilterSpec(value_getter=lambda t: t['time-added'],
@@ -224,6 +230,7 @@ class _SingleFilter(Filter):
                                           value_convert=lambda v: timestamp_or_timedelta(v, default_sign=-1),
                                           needed_keys=('time-added',),
                                           aliases=('tadd',),
+                                          volatile=True,
                                           description=_desc('... time torrent was added')),
 
         'started'         : CmpFilterSpec(value_getter=lambda t: t['time-started'],
@@ -232,6 +239,7 @@ class _SingleFilter(Filter):
                                           value_convert=lambda v: timestamp_or_timedelta(v, default_sign=-1),
                                           needed_keys=('time-started',),
                                           aliases=('tsta',),
+                                          volatile=True,
                                           description=_desc('... last time torrent was started')),
 
         'activity'        : CmpFilterSpec(value_getter=lambda t: t['time-activity'],
@@ -240,6 +248,7 @@ class _SingleFilter(Filter):
                                           value_convert=lambda v: timestamp_or_timedelta(v, default_sign=-1),
                                           needed_keys=('time-activity',),
                                           aliases=('tact',),
+                                          volatile=True,
                                           description=_desc('... time torrent was active')),
 
         'completed'       : CmpFilterSpec(value_getter=lambda t: t['time-completed'],
@@ -248,6 +257,7 @@ class _SingleFilter(Filter):
                                           value_convert=lambda v: timestamp_or_timedelta(v, default_sign=-1),
                                           needed_keys=('time-completed',),
                                           aliases=('tcmp',),
+                                          volatile=True,
                                           description=_desc('... time all wanted files where/will be downloaded')),
     })
 
@@ -255,3 +265,46 @@ class _SingleFilter(Filter):
 class TorrentFilter(FilterChain):
     """One or more filters combined with & and | operators"""
     filterclass = _SingleFilter
+
+    def apply_incremental(self, source):
+        """
+        Return read-only mapping of matching torrent IDs to Torrent objects
+
+        source: Object with a `changes(since)` method that returns a tuple of
+                three items: An opaque generation that is passed as `since` on
+                the next call, a mapping of changed Torrent objects to the keys
+                that changed since `since` (`None` if all keys changed) and
+                the IDs of removed torrents.  If `since` is `None`, all
+                torrents must be reported as changed.
+
+        Only torrents with changes to any of `needed_keys` since the previous
+        call with the same `source` are matched again.  The first call matches
+        all torrents.
+        """
+        # Map sources to the generation and matching torrents from the previous
+        # call
+        states = self.__dict__.get('_incremental')
+        if states is None:
+            states = self._incremental = weakref.WeakKeyDictionary()
+
+        state = states.get(source)
+        if state is None or self.volatile:
+            since, matches = None, {}
+        else:
+            since, matches = state
+
+        generation, changed, removed = source.changes(since)
+        for tid in removed:
+            matches.pop(tid, None)
+
+        needed_keys = frozenset(self.needed_keys)
+        match = self.match
+        for torrent,keys in changed.items():
+            if keys is None or not needed_keys.isdisjoint(keys):
+                if match(torrent):
+                    matches[torrent['id']] = torrent
+                else:
+                    matches.pop(torrent['id'], None)
+
+        states[source] = (generation, matches)
+        return types.MappingProxyType(dict(matches))
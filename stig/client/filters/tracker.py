@@ -78,24 +78,28 @@ class _SingleFilter(Filter):
                                          value_type=TorrentTracker.TYPES['time-last-announce'],
                                          value_convert=lambda v: timestamp_or_timedelta(v, default_sign=-1),
                                          aliases=('lan',),
+                                         volatile=True,
                                          description='Match VALUE against time of last announce'),
         'next-announce'  : _CmpFilterSpec(value_getter=lambda trk: trk['time-next-announce'],
                                          value_matcher=lambda trk, op, v: cmp_timestamp_or_timdelta(trk['time-next-announce'], op, v),
                                          value_type=TorrentTracker.TYPES['time-next-announce'],
                                          value_convert=lambda v: timestamp_or_timedelta(v, default_sign=1),
                                          aliases=('nan',),
+                                         volatile=True,
                                          description='Match VALUE against time of next announce'),
         'last-scrape'    : _CmpFilterSpec(value_getter=lambda trk: trk['time-last-scrape'],
                                          value_matcher=lambda trk, op, v: cmp_timestamp_or_timdelta(trk['time-last-scrape'], op, v),
                                          value_type=TorrentTracker.TYPES['time-last-scrape'],
                                          value_convert=lambda v: timestamp_or_timedelta(v, default_sign=-1),
                                          aliases=('lsc',),
+                                         volatile=True,
                                          description='Match VALUE against time of last scrape'),
         'next-scrape'    : _CmpFilterSpec(value_getter=lambda trk: trk['time-next-scrape'],
                                          value_matcher=lambda trk, op, v: cmp_timestamp_or_timdelta(trk['time-next-scrape'], op, v),
                                          value_type=TorrentTracker.TYPES['time-next-scrape'],
                                          value_convert=lambda v: timestamp_or_timedelta(v, default_sign=1),
                                          aliases=('nsc',),
+                                         volatile=True,
                                          description='Match VALUE against time of next scrape'),
     })
 
@@ -11,6 +11,9 @@
 
 import asyncio
 import functools
+import inspect
+import json
+import weakref
 
 import blinker
 
@@ -21,6 +24,26 @@ from ..logging import make_logger  # isort:skip
 log = make_logger(__name__)
 
 
+def json_fingerprint(obj):
+    """
+    Return hash of the JSON representation of `obj`
+
+    Values that can't be converted to JSON are converted with `repr`.
+    """
+    return hash(json.dumps(obj, sort_keys=True, default=repr))
+
+
+def _callbacks_changed_soon(poller_ref):
+    # Called when a weakly referenced callback is garbage collected.  blinker
+    # may not have removed it from its receivers yet, so we notify on the next
+    # iteration of the event loop.
+    poller = poller_ref()
+    if poller is not None:
+        loop = asyncio.get_event_loop()
+        if not loop.is_closed():
+            loop.call_soon(poller._callbacks_changed)
+
+
 def _func_call_str(func, *posargs, **kwargs):
     if func is None:
         return '<None>'
@@ -47,18 +70,40 @@ class RequestPoller():
 
     request: Coroutine that is called at intervals
     interval: Delay between calls
+    finish_ongoing: Whether an ongoing request is allowed to finish when the
+                    request is changed or `poll` is called; if False, the
+                    ongoing request is cancelled
+    scheduler: PollScheduler instance or None; if given, `interval` is ignored
+               and the request is sent at the scheduler's ticks
+    fingerprint: Callable that gets a response and returns a hashable value,
+                 True to use `json_fingerprint`, or None; if not None, response
+                 callbacks are not called if the fingerprint of the response
+                 is the same as the previous one
 
     Any other positional or keyword arguments are passed to `request`.
     """
-    def __init__(self, request, *args, interval=1, **kwargs):
+
+    # Returned by _reconcile_response() if a response can't be used
+    _DISCARD = object()
+
+    def __init__(self, request, *args, interval=1, finish_ongoing=False, scheduler=None,
+                 fingerprint=None, **kwargs):
         self._on_response = blinker.Signal()
         self._on_error = blinker.Signal()
+        self._on_callbacks_changed = blinker.Signal()
         self._prev_error = None
         self._interval = interval
         self._poll_task = None
         self._poll_loop_task = None
         self._sleep = SleepUneasy()
         self._skip_ongoing_request = False
+        self._finish_ongoing = bool(finish_ongoing)
+        self._poll_again = False
+        self._scheduler = scheduler
+        self._scheduled = False
+        self._fingerprint = json_fingerprint if fingerprint is True else fingerprint
+        self._prev_fingerprint = None
+        self._suppressed_callbacks = 0
         self._debug_info = {'request': 'No request specified yet',
                             'update_cbs': [], 'error_cbs': []}
         self.set_request(request, *args, **kwargs)
@@ -67,6 +112,11 @@ class RequestPoller():
         """Start polling"""
         if self.running:
             log.debug('Already polling: %s', self._debug_info['request'])
+        elif self._scheduler is not None:
+            log.debug('Starting scheduled polling: %s', self._debug_info['request'])
+            self._prev_error = None
+            self._scheduled = True
+            self._scheduler.add(self)
         else:
             log.debug('Starting polling: %s', self._debug_info['request'])
             self._poll_loop_task = asyncio.ensure_future(self._poll_loop())
@@ -99,6 +149,11 @@ class RequestPoller():
                 self._poll_task = None
                 self._skip_ongoing_request = False
 
+            if self._poll_again:
+                log.debug('Polling again immediately: %s', self._debug_info['request'])
+                self._poll_again = False
+                continue  # Skip the sleep() at the end of the loop
+
             await self._sleep.sleep(self._interval)
 
     async def _do_poll(self):
@@ -109,22 +164,65 @@ class RequestPoller():
 
         ClientErrors raised by the request are passed to the 'error' handlers.
         """
-        if self._request is None:
+        self._deliver(await self._fetch())
+
+    async def _fetch(self):
+        """
+        Send request and return `(response, None)` or `(None, ClientError)`
+
+        If the request was changed while it was ongoing, the response is passed
+        through `_reconcile_response` first.
+
+        Return `None` if there is no request or the response was discarded.
+        """
+        request = self._request
+        if request is None:
             log.debug('No request: %s', self._debug_info)
+            return None
+
+        log.debug('Polling: %s', self._debug_info['request'])
+        try:
+            response = await request()
+            if request is not self._request:
+                log.debug('Request was changed while polling: %s', self._debug_info['request'])
+                response = await self._reconcile_response(request, response)
+        except errors.ClientError as e:
+            # Report error but keep trying to connect
+            return (None, e)
         else:
-            log.debug('Polling: %s', self._debug_info['request'])
-            try:
-                response = await self._request()
-            except errors.ClientError as e:
-                # Report error but keep trying to connect
-                self._run_callbacks(error=e)
+            if response is self._DISCARD:
+                log.debug('Discarding response from outdated request')
+                self._poll_again = True
+                return None
             else:
-                self._run_callbacks(response=response)
+                return (response, None)
+
+    def _deliver(self, result):
+        """Run callbacks with return value of `_fetch`"""
+        if result is not None:
+            response, error = result
+            self._run_callbacks(response=response, error=error)
+
+    async def _reconcile_response(self, request, response):
+        """
+        Make `response` from outdated `request` usable for the current request
+
+        Return the (possibly modified) response or `_DISCARD` if `response` is
+        useless.  A discarded response is followed by an immediate poll with
+        the current request.
+
+        Derived classes may override this to salvage responses.  The default
+        implementation discards every outdated response.
+        """
+        return self._DISCARD
 
     def _run_callbacks(self, response=None, error=None):
         if self._skip_ongoing_request:
             log.debug('Request was skipped - not running callbacks: %s', self)
             self._skip_ongoing_request = False
+        elif self._is_unchanged(response, error):
+            log.debug('Response did not change - not running callbacks: %s', self)
+            self._suppressed_callbacks += 1
         else:
             log.debug('Running callbacks: %s', self)
             self._on_response.send(response)
@@ -137,6 +235,29 @@ class RequestPoller():
                     log.debug('Uncaught exception in %r', self)
                     raise error
 
+    def _is_unchanged(self, response, error):
+        # Return whether `response` has the same fingerprint as the previous
+        # response and remember its fingerprint
+        if self._fingerprint is None:
+            return False
+        elif response is None or error is not None:
+            self._prev_fingerprint = None
+            return False
+        fp = self._fingerprint(response)
+        if fp == self._prev_fingerprint:
+            return True
+        self._prev_fingerprint = fp
+        return False
+
+    def reset_fingerprint(self):
+        """Pass the next response to callbacks even if it didn't change"""
+        self._prev_fingerprint = None
+
+    @property
+    def suppressed_callbacks(self):
+        """Number of responses that were not passed to callbacks because they didn't change"""
+        return self._suppressed_callbacks
+
     def skip_ongoing_request(self):
         """Stop a currently ongoing request; do nothing if there is no ongoing request"""
         if self._poll_task is not None:
@@ -148,6 +269,13 @@ class RequestPoller():
         """Stop polling"""
         if not self.running:
             log.debug('Already stopped polling: %s', self._debug_info['request'])
+        elif self._scheduled:
+            log.debug('Stopping scheduled polling %s', self._debug_info['request'])
+            self._scheduled = False
+            self._scheduler.remove(self)
+            if self._poll_task is not None:
+                self._poll_task.cancel()
+            self._run_callbacks()
         else:
             log.debug('Stopping polling %s', self._debug_info['request'])
             self._poll_loop_task.cancel()
@@ -170,27 +298,43 @@ class RequestPoller():
         This also resets the interval - the next request is made `interval`
         seconds after this method is called.
 
+        If `finish_ongoing` is enabled, a currently ongoing request is finished
+        and the next request is made immediately after that.
+
         Do nothing if this poller is not started.
+
+        The response is passed to callbacks even if it didn't change.
         """
-        # TODO issue #163: Remove call to skip_ongoing_request() if it doesn't help.
-        self.skip_ongoing_request()
+        self.reset_fingerprint()
+        if self._finish_ongoing:
+            if self._poll_task is not None:
+                self._poll_again = True
+        else:
+            # TODO issue #163: Remove call to skip_ongoing_request() if it doesn't help.
+            self.skip_ongoing_request()
 
-        if self.running:
+        if self._scheduled:
+            self._scheduler.poll(self)
+        elif self.running:
             self._sleep.interrupt()
 
     @property
     def running(self):
         """Whether poller is polling"""
-        return self._poll_loop_task is not None
+        return self._poll_loop_task is not None or self._scheduled
 
     def set_request(self, request, *args, **kwargs):
         """
         Set request to coroutine `request`
 
         Any positional or keyword arguments are passed to `request` at each call.
+
+        If `finish_ongoing` is enabled, a currently ongoing request is not
+        cancelled and its response is passed to `_reconcile_response`.
         """
-        # TODO issue #163: Remove call to skip_ongoing_request() if it doesn't help.
-        self.skip_ongoing_request()
+        if not self._finish_ongoing:
+            # TODO issue #163: Remove call to skip_ongoing_request() if it doesn't help.
+            self.skip_ongoing_request()
 
         self._debug_info['request'] = _func_call_str(request, *args, **kwargs)
         log.debug('Setting new request: %s', self)
@@ -198,6 +342,7 @@ class RequestPoller():
             self._request = functools.partial(request, *args, **kwargs)
         else:
             self._request = request
+        self._prev_fingerprint = None
 
     @property
     def request(self):
@@ -218,11 +363,16 @@ class RequestPoller():
 
         If the request raises an exception, 'response' callbacks are called
         with `None` and 'error' callbacks are called with the exception.
+
+        The next response is passed to callbacks even if it didn't change so
+        `callback` gets the current data.
         """
+        self.reset_fingerprint()
         self._debug_info['update_cbs'].append(_func_call_str(callback))
         log.debug('Registering %r to receive %s responses',
                   self._debug_info['update_cbs'][-1], self._debug_info['request'])
         self._on_response.connect(callback, weak=autoremove)
+        self._watch_callback(callback, autoremove)
 
     def on_error(self, callback, autoremove=True):
         """Register `callback` to receive request exceptions (see `on_response`)"""
@@ -230,6 +380,34 @@ class RequestPoller():
         log.debug('Registering %r to receive %s errors',
                   self._debug_info['error_cbs'][-1], self._debug_info['request'])
         self._on_error.connect(callback, weak=autoremove)
+        self._watch_callback(callback, autoremove)
+
+    def off_response(self, callback):
+        """Unregister `callback` that was registered with `on_response`"""
+        log.debug('Unregistering %r from %s responses',
+                  _func_call_str(callback), self._debug_info['request'])
+        self._on_response.disconnect(callback)
+        self._callbacks_changed()
+
+    def on_callbacks_changed(self, callback, autoremove=True):
+        """
+        Register `callback` to be called when response or error callbacks are
+        registered or removed
+
+        `callback` gets the instance of this class.  Use `has_callbacks` to
+        find out if anyone is still interested in responses.
+        """
+        self._on_callbacks_changed.connect(callback, weak=autoremove)
+
+    def _watch_callback(self, callback, autoremove):
+        if autoremove:
+            referent = callback.__self__ if inspect.ismethod(callback) else callback
+            finalizer = weakref.finalize(referent, _callbacks_changed_soon, weakref.ref(self))
+            finalizer.atexit = False
+        self._callbacks_changed()
+
+    def _callbacks_changed(self):
+        self._on_callbacks_changed.send(self)
 
     @property
     def has_callbacks(self):
@@ -237,6 +415,16 @@ class RequestPoller():
         return (bool(self._on_response.receivers) or
                 bool(self._on_error.receivers))
 
+    @property
+    def finish_ongoing(self):
+        """Whether ongoing requests are finished instead of cancelled"""
+        return self._finish_ongoing
+
+    @property
+    def scheduler(self):
+        """PollScheduler instance or `None`"""
+        return self._scheduler
+
     @property
     def interval(self):
         """Seconds between polls"""
@@ -255,3 +443,165 @@ class RequestPoller():
                 self._debug_info.get('update_cbs'), self._debug_info.get('error_cbs'))
         else:
             return '<%s>' % type(self).__name__
+
+
+class PollScheduler():
+    """
+    Poll multiple RequestPollers on a common tick
+
+    At each tick, the requests of all pollers are sent concurrently.  When all
+    responses have arrived, the callbacks of all pollers are run together.
+    Subscribers are notified in bursts instead of at scattered times, e.g. a
+    TUI only needs to redraw once per tick.
+
+    Pollers that were created with a scheduler add and remove themselves when
+    they are started and stopped.
+
+    Responses that take longer than one tick are passed to callbacks when they
+    arrive.
+
+    interval: Seconds between ticks
+    """
+    def __init__(self, interval=1):
+        self._interval = float(interval)
+        # Pollers are identified by id() because some of them are mappings
+        # that are unhashable or compare equal by value
+        self._pollers = {}     # Map poller IDs to pollers in the order they were added
+        self._wanted = set()   # IDs of pollers that must be polled immediately
+        self._wakeup = asyncio.Event()
+        self._tick_loop_task = None
+
+    def add(self, poller):
+        """Poll `poller` at each tick, starting immediately"""
+        if id(poller) not in self._pollers:
+            self._pollers[id(poller)] = poller
+            self.poll(poller)
+        if self._tick_loop_task is None:
+            log.debug('Starting poll scheduler')
+            self._tick_loop_task = asyncio.ensure_future(self._tick_loop())
+            self._tick_loop_task.add_done_callback(self._reraise)
+
+    def remove(self, poller):
+        """Stop polling `poller`"""
+        self._pollers.pop(id(poller), None)
+        self._wanted.discard(id(poller))
+        if not self._pollers and self._tick_loop_task is not None:
+            log.debug('Stopping poll scheduler')
+            self._tick_loop_task.cancel()
+            self._tick_loop_task = None
+
+    def poll(self, *pollers):
+        """
+        Poll `pollers` (or all pollers) immediately instead of waiting for next tick
+
+        If all pollers are polled, this also resets the interval.
+        """
+        self._wanted.update(id(p) for p in (pollers or self._pollers.values()))
+        self._wakeup.set()
+
+    @staticmethod
+    def _reraise(task):
+        # Ignore if _tick_loop() was cancelled, raise all other exceptions
+        try:
+            task.result()
+        except asyncio.CancelledError:
+            pass
+
+    async def _tick_loop(self):
+        loop = asyncio.get_event_loop()
+        next_tick = loop.time()
+        while True:
+            now = loop.time()
+            wanted = self._wanted.union(pid for pid,p in self._pollers.items() if p._poll_again)
+            self._wanted.clear()
+            if now >= next_tick or wanted.issuperset(self._pollers):
+                pollers = tuple(self._pollers.values())
+                next_tick = now + self._interval
+            else:
+                pollers = tuple(p for pid,p in self._pollers.items() if pid in wanted)
+
+            if pollers:
+                await self._tick(pollers)
+
+            # Pollers that want to poll again while their request is still
+            # ongoing wake us up when it is finished (see _deliver())
+            if not self._wanted and not any(p._poll_again and p._poll_task is None
+                                            for p in self._pollers.values()):
+                await self._sleep(next_tick - loop.time())
+
+    async def _sleep(self, seconds):
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=max(0, seconds))
+        except asyncio.TimeoutError:
+            pass
+
+    async def _tick(self, pollers):
+        # Pollers with a request from a previous tick that is still ongoing are
+        # delivered when that request finishes
+        pollers = tuple(p for p in pollers if p._poll_task is None)
+        if not pollers:
+            return
+
+        log.debug('Polling %d pollers', len(pollers))
+        for poller in pollers:
+            poller._poll_again = False
+            poller._poll_task = asyncio.ensure_future(poller._fetch())
+
+        # Don't let one slow request delay the callbacks of all other pollers
+        # for longer than one tick
+        _, pending = await asyncio.wait([poller._poll_task for poller in pollers],
+                                        timeout=self._interval)
+
+        log.debug('Running callbacks of %d pollers', len(pollers) - len(pending))
+        for poller in pollers:
+            task = poller._poll_task
+            if task in pending:
+                log.debug('Waiting for slow request: %s', poller)
+                task.add_done_callback(functools.partial(self._deliver, poller))
+            else:
+                self._deliver(poller, task)
+
+    def _deliver(self, poller, task):
+        if poller._poll_task is task:
+            poller._poll_task = None
+        try:
+            if id(poller) not in self._pollers:
+                # Poller was stopped during this tick
+                pass
+            elif task.cancelled():
+                if poller._skip_ongoing_request:
+                    log.debug('Skipping polling result once: %s', poller)
+                    poller._poll_again = True
+                    self._wakeup.set()
+            else:
+                poller._deliver(task.result())
+                if poller._poll_again:
+                    # poll() was called while the request was ongoing
+                    self._wakeup.set()
+        except Exception as e:
+            # Don't let one broken poller stop all the others
+            self.remove(poller)
+            poller._scheduled = False
+            asyncio.get_event_loop().call_exception_handler({
+                'message': 'Exception while polling %r' % (poller,),
+                'exception': e,
+            })
+        finally:
+            poller._skip_ongoing_request = False
+
+    @property
+    def interval(self):
+        """Seconds between ticks"""
+        return self._interval
+
+    @interval.setter
+    def interval(self, interval):
+        self._interval = float(interval)
+        self.poll()
+
+    def __contains__(self, poller):
+        return id(poller) in self._pollers
+
+    def __repr__(self):
+        return '<%s %d pollers>' % (type(self).__name__, len(self._pollers))
@@ -9,32 +9,98 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
-from functools import partial
+import heapq
+import logging
+import time
+
+from ...utils import LRUCache
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
 
 
+def _make_runs(keyfuncs):
+    """
+    Group (keyfunc, reverse) pairs into runs with the same sort direction
+
+    `keyfuncs` is ordered from least to most significant.  Return list of
+    (keyfuncs, reverse) tuples, ordered from least to most significant run,
+    where `keyfuncs` is ordered from most to least significant.
+    """
+    runs = []
+    for keyfunc, reverse in keyfuncs:
+        if runs and runs[-1][1] == reverse:
+            runs[-1][0].insert(0, keyfunc)
+        else:
+            runs.append(([keyfunc], reverse))
+    return [(tuple(kfs), reverse) for kfs,reverse in runs]
+
+
+def _sort(items, runs, inplace, item_getter):
+    """
+    Sort `items` by composite keys
+
+    Every key is computed once per item.  Items are sorted once per run of
+    keys with the same sort direction (see `_make_runs`), which is usually
+    once.
+    """
+    if not inplace:
+        items = list(items)
+    objs = [item_getter(item) for item in items]
+    indexes = list(range(len(objs)))
+    for keyfuncs, reverse in runs:
+        if len(keyfuncs) == 1:
+            keyfunc = keyfuncs[0]
+            keys = [keyfunc(obj) for obj in objs]
+        else:
+            keys = [tuple(keyfunc(obj) for keyfunc in keyfuncs) for obj in objs]
+        indexes.sort(key=keys.__getitem__, reverse=reverse)
+
+    sorted_items = [items[i] for i in indexes]
+    if inplace:
+        items[:] = sorted_items
+        return items
+    else:
+        return sorted_items
+
+
+class _Inverted():
+    """Sort key wrapper that inverts the order of `value`"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __gt__(self, other):
+        return self.value < other.value
+
+    def __eq__(self, other):
+        return isinstance(other, _Inverted) and self.value == other.value
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.value)
+
+
 class SortSpec():
     def __init__(self, *keyfuncs, description, aliases=()):
         self._keyfuncs = keyfuncs
         self.description = description
         self.aliases = aliases
 
+    @property
+    def keyfuncs(self):
+        """Key functions from least to most significant"""
+        return self._keyfuncs
+
     def __call__(self, items, reverse=False, inplace=False, item_getter=lambda item: item):
         if not items:
             return items
-
-        for keyfunc in self._keyfuncs:
-            def key_getter(item):
-                return keyfunc(item_getter(item))
-
-            if inplace:
-                items[:] = sorted(items, key=key_getter, reverse=reverse)
-            else:
-                items = sorted(items, key=key_getter, reverse=reverse)
-
-        return items
+        runs = _make_runs((keyfunc, reverse) for keyfunc in self._keyfuncs)
+        return _sort(items, runs, inplace, item_getter)
 
 
 class _SorterBaseMeta(type):
@@ -52,15 +118,22 @@ class _SorterBaseMeta(type):
                             for sorter_name,sortspec in sortspecs.items()
                             for alias in sortspec.aliases}
 
+    # Sorters are immutable, so we can hand out the same instance for the same
+    # arguments instead of parsing them again
+    def __call__(cls, *args, **kwargs):
+        return cls.parse_cache.get((cls, cls.DEFAULT_SORT, args, tuple(sorted(kwargs.items()))),
+                                   lambda: super(_SorterBaseMeta, cls).__call__(*args, **kwargs))
+
 
 class SorterBase(metaclass=_SorterBaseMeta):
     INVERT_CHARS = ('!', '.')
     SORTSPECS = NotImplemented
     DEFAULT_SORT = None
+    parse_cache = LRUCache(maxsize=64)
 
     def __init__(self, sortstrings=()):
         sortspecs = []
-        sortfuncs = []
+        reverses = []
         strings = []   # String representations of sortspecs
 
         # Go through items in reverse because we want to deduplicate sort orders
@@ -80,9 +153,8 @@ class SorterBase(metaclass=_SorterBaseMeta):
             else:
                 sortspec = self.SORTSPECS[sortspecname]
                 if sortspec not in sortspecs:
-                    sortfunc = partial(sortspec, reverse=reverse)
                     sortspecs.insert(0, sortspec)
-                    sortfuncs.insert(0, sortfunc)
+                    reverses.insert(0, reverse)
                     strings.insert(0, (self.INVERT_CHARS[0] if reverse else '') + sortspecname)
         self._strings = tuple(strings)
 
@@ -90,13 +162,17 @@ class SorterBase(metaclass=_SorterBaseMeta):
         if self.DEFAULT_SORT is not None:
             default_sortspec = self.SORTSPECS[self.DEFAULT_SORT]
             if default_sortspec not in sortspecs:
-                sortfuncs.insert(0, default_sortspec)
                 sortspecs.insert(0, default_sortspec)
+                reverses.insert(0, False)
 
         self._sortspecs = sortspecs
-        self._sortfuncs = sortfuncs
+        keyfuncs = tuple((keyfunc, reverse)
+                         for sortspec,reverse in zip(sortspecs, reverses)
+                         for keyfunc in sortspec.keyfuncs)
+        self._runs = _make_runs(keyfuncs)
+        self._sort_key = self._make_sort_key(tuple(reversed(keyfuncs)))
 
-    def apply(self, items, inplace=False, item_getter=lambda item: item):
+    def apply(self, items, inplace=False, item_getter=lambda item: item, limit=None):
         """
         Sort sequence `items`
 
@@ -106,19 +182,65 @@ class SorterBase(metaclass=_SorterBaseMeta):
                      sorting of widgets as long as they can provide a sortable
                      object.)
         inplace: Modify `items` if True, otherwise return a new, sorted list
+        limit: Only return the first `limit` sorted items or the last `-limit`
+               sorted items if `limit` is negative; `items` are not fully
+               sorted and `inplace` is ignored
         """
-        import time
-        start_time = time.monotonic()
+        debug = log.isEnabledFor(logging.DEBUG)
+        if debug:
+            start_time = time.monotonic()
 
-        for sorter in self._sortfuncs:
-            items = sorter(items, inplace=inplace, item_getter=item_getter)
+        if limit is not None:
+            items = self._apply_limit(items, limit, item_getter)
+            inplace = False
+        elif self._runs and items:
+            items = _sort(items, self._runs, inplace, item_getter)
 
-        log.debug('-> Sorted %d items by %s in %.3fms',
-                  len(items), self, (time.monotonic() - start_time) * 1e3)
+        if debug:
+            log.debug('-> Sorted %d items by %s in %.3fms',
+                      len(items), self, (time.monotonic() - start_time) * 1e3)
 
         if not inplace:
             return items
 
+    def _apply_limit(self, items, limit, item_getter):
+        sort_key = self._sort_key
+
+        def key(item):
+            return sort_key(item_getter(item))
+
+        if limit >= 0:
+            return heapq.nsmallest(limit, items, key=key)
+        else:
+            # Same as sorted(items)[limit:], including the order of equal items
+            last = heapq.nlargest(-limit, enumerate(items),
+                                  key=lambda pair: (key(pair[1]), pair[0]))
+            return [item for _,item in reversed(last)]
+
+    @staticmethod
+    def _make_sort_key(keyfuncs):
+        # Return `sort_key` function for (keyfunc, reverse) pairs ordered from
+        # most to least significant
+        keyfuncs = tuple(keyfunc if not reverse else (lambda obj, kf=keyfunc: _Inverted(kf(obj)))
+                         for keyfunc,reverse in keyfuncs)
+        if len(keyfuncs) == 1:
+            kf = keyfuncs[0]
+            return lambda obj: (kf(obj),)
+        elif len(keyfuncs) == 2:
+            kf1, kf2 = keyfuncs
+            return lambda obj: (kf1(obj), kf2(obj))
+        else:
+            return lambda obj: tuple([kf(obj) for kf in keyfuncs])
+
+    def sort_key(self, obj):
+        """
+        Return comparable key for a single object
+
+        Sorting objects by this key gives the same order as `apply`.  This is
+        useful to keep sequences sorted with the `bisect` module.
+        """
+        return self._sort_key(obj)
+
     def __add__(self, other):
         cls = type(self)
         if not isinstance(other, cls):
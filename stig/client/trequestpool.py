@@ -10,11 +10,13 @@
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
 import operator
+import weakref
 from functools import reduce
 
 import blinker
 
 from .poll import RequestPoller
+from .utils import Response
 
 from ..logging import make_logger  # isort:skip
 log = make_logger(__name__)
@@ -29,12 +31,22 @@ class TorrentRequestPool(RequestPoller):
 
     After the combined torrents have arrived, split it back up by using each
     subscriber's filter and provide it to its callbacks as tuples.
+
+    If `finish_ongoing` is True, an ongoing request is not cancelled when
+    subscribers change.  Its response is provided to the subscribers it was made
+    for, missing keys are fetched with a supplementary request and new or changed
+    subscribers get their torrents from an immediate follow-up request.
     """
-    def __init__(self, srvapi, interval=1):
+    def __init__(self, srvapi, interval=1, finish_ongoing=False, scheduler=None):
         self._api = srvapi.torrent
         self._tfilters = {}
         self._keys = {}
-        super().__init__(request=None, interval=interval)
+        # Map requests to the filters and keys they were created for
+        self._requested = weakref.WeakKeyDictionary()
+        # Subscribers that get the next response or None for all subscribers
+        self._recipients = None
+        super().__init__(request=None, interval=interval, finish_ongoing=finish_ongoing,
+                         scheduler=scheduler)
         self.on_response(self._handle_torrent_list)
 
     def register(self, sid, callback, keys=(), tfilter=None):
@@ -92,11 +104,51 @@ class TorrentRequestPool(RequestPoller):
             log.debug('Combined filters: %s', kwargs['torrents'])
             log.debug('Combined keys: %s', kwargs['keys'])
             self.set_request(self._api.torrents, **kwargs)
+            self._requested[self._request] = (dict(self._tfilters), frozenset(kwargs['keys']))
+
+    async def _reconcile_response(self, request, response):
+        # Only subscribers that haven't changed since `request` was made can use
+        # `response`
+        requested_tfilters, requested_keys = self._requested.get(request, ({}, frozenset()))
+        recipients = set(event for event,tfilter in self._tfilters.items()
+                         if event in requested_tfilters and requested_tfilters[event] == tfilter)
+        if not recipients:
+            log.debug('No subscribers left for outdated request')
+            return self._DISCARD
+
+        # Get keys that were added by recipients since `request` was made
+        missing_keys = set()
+        for event in recipients:
+            missing_keys.update(self._keys[event])
+            tfilter = self._tfilters[event]
+            if tfilter is not None:
+                missing_keys.update(tfilter.needed_keys)
+        missing_keys.difference_update(requested_keys)
+
+        if missing_keys and response.torrents:
+            log.debug('Requesting missing keys: %s', missing_keys)
+            ids = tuple(t['id'] for t in response.torrents)
+            supplement = await self._api.torrents(ids, keys=tuple(missing_keys))
+            if not supplement.success:
+                return self._DISCARD
+            response = Response(success=response.success,
+                                torrents=tuple(supplement.torrents),
+                                msgs=response.msgs, errors=response.errors)
+
+        if recipients != set(self._tfilters):
+            log.debug('Some subscribers need a new request')
+            self._poll_again = True
+        self._recipients = recipients
+        return response
 
     def _handle_torrent_list(self, response):
         # If the request failed, response is None and tlist is empty.
         tlist = response.torrents if response is not None else ()
 
+        # Usually all subscribers get the response, but a reconciled response
+        # may be for some of them only.
+        recipients, self._recipients = self._recipients, None
+
         dead_subscribers = []
 
         def send(event, tlist):
@@ -108,7 +160,7 @@ class TorrentRequestPool(RequestPoller):
 
         log.debug('Processing %d torrents for %d subscribers',
                   len(tlist), len(self._tfilters))
-        if len(self._tfilters) == 1:
+        if len(self._tfilters) == 1 and recipients is None:
             # If there's only one subscriber, there's no need to filter the
             # torrents again.
             event = next(iter(self._tfilters))
@@ -116,7 +168,9 @@ class TorrentRequestPool(RequestPoller):
         else:
             # More than 1 subscriber means we have to filter the torrents
             # again for each one.
-            for event,filter in self._tfilters.items():
+            for event,filter in tuple(self._tfilters.items()):
+                if recipients is not None and event not in recipients:
+                    continue
                 if filter is None:
                     # Subscriber wants all torrents
                     this_tlist = tlist
@@ -13,7 +13,7 @@
 
 import os
 import time
-from collections import abc, defaultdict, deque
+from collections import OrderedDict, abc, defaultdict, deque
 
 from . import utils
 from .base import TorrentBase  # noqa: F401
@@ -176,27 +176,74 @@ class TorrentPeer(abc.Mapping):
     _MAX_PEER_PROGRESS_SAMPLE_AGE = 1800  # 30 minutes
     _PEER_PROGRESS_DATA = defaultdict(lambda: deque(maxlen=10))
 
+    # To prune _PEER_PROGRESS_DATA without looking at every peer, we map time
+    # buckets to the IDs of peers that got a new sample in that bucket.  When a
+    # bucket expires, only its peers must be checked.
+    _PEER_PROGRESS_BUCKET_SIZE = 60  # 1 minute
+    _PEER_PROGRESS_BUCKETS = OrderedDict()
+
+    @classmethod
+    def _prune_peer_progress_data(cls, now):
+        data = cls._PEER_PROGRESS_DATA
+        buckets = cls._PEER_PROGRESS_BUCKETS
+        oldest_time = now - cls._MAX_PEER_PROGRESS_SAMPLE_AGE
+        oldest_bucket = oldest_time // cls._PEER_PROGRESS_BUCKET_SIZE
+        while buckets:
+            bucket = next(iter(buckets))
+            if bucket >= oldest_bucket:
+                break
+            for peer_id in buckets.pop(bucket):
+                samples = data.get(peer_id)
+                # Peers with newer samples are also in a newer bucket
+                if samples is not None and samples[-1][0] < oldest_time:
+                    log.debug('Forgetting progress of %s: %r', peer_id, samples)
+                    del data[peer_id]
+
+    @classmethod
+    def _add_peer_progress_sample(cls, peer_id, samples, now, peer_progress):
+        # Remove samples that are too old
+        oldest_time = now - cls._MAX_PEER_PROGRESS_SAMPLE_AGE
+        while samples and samples[0][0] < oldest_time:
+            samples.popleft()
+        samples.append((now, peer_progress))
+
+        bucket = now // cls._PEER_PROGRESS_BUCKET_SIZE
+        buckets = cls._PEER_PROGRESS_BUCKETS
+        if bucket not in buckets:
+            buckets[bucket] = set()
+        buckets[bucket].add(peer_id)
+
     @classmethod
-    def gc_peer_progress_data(cls):
-        log.debug('Pruning peer progress data:')
-        for peer_id,samples in tuple(cls._PEER_PROGRESS_DATA.items()):
-            # Remove samples that are too old
-            while samples and (samples[0][0] + cls._MAX_PEER_PROGRESS_SAMPLE_AGE) < time.monotonic():
-                log.debug('Sample from %s is too old: %r', peer_id, samples[0])
-                samples.popleft()
-
-            # Remove samples where progress is 0.0.  A lot of the cache entries just have
-            # a single sample from peers connecting for some reason but not downloading.
-            if samples and samples[0][1] in (0.0, 1.0):
-                samples.popleft()
-
-            # Remove deque if there are no samples left
-            if not samples:
-                del cls._PEER_PROGRESS_DATA[peer_id]
-
-        log.debug('Pruned peer progress data:')
-        for peer_id,samples in tuple(cls._PEER_PROGRESS_DATA.items()):
-            log.debug('%s: %s', peer_id, samples)
+    def _record_peer_progress(cls, peer_id, peer_progress):
+        # Return progress samples of peer after adding `peer_progress`
+        now = time.monotonic()
+        cls._prune_peer_progress_data(now)
+        samples = cls._PEER_PROGRESS_DATA.get(peer_id, ())
+
+        # Don't add the same progress twice.  Don't add a first sample with
+        # a progress of 0.0 either: A lot of peers connect for some reason
+        # but never download, and the first sample isn't used to calculate
+        # the rate anyway.
+        if samples:
+            if peer_progress != samples[-1][1]:
+                cls._add_peer_progress_sample(peer_id, samples, now, peer_progress)
+        elif peer_progress != 0.0:
+            samples = cls._PEER_PROGRESS_DATA[peer_id]
+            cls._add_peer_progress_sample(peer_id, samples, now, peer_progress)
+        return samples
+
+    @classmethod
+    def record_progress(cls, tid, ip, port, pdownloaded):
+        """
+        Add progress sample of a peer without creating an instance
+
+        This keeps rate and ETA estimates accurate for peers that are not
+        created, e.g. because they are filtered out.  Arguments are the same
+        as for instantiation.
+        """
+        peer_progress = pdownloaded / 100
+        if peer_progress < 1:
+            cls._record_peer_progress((tid, ip, port), peer_progress)
 
     @classmethod
     def _guess_peer_rate_and_eta(cls, peer_id, peer_progress, torrent_size):
@@ -206,11 +253,7 @@ class TorrentPeer(abc.Mapping):
             eta = utils.Timedelta.NOT_APPLICABLE
         else:
             eta = utils.Timedelta.UNKNOWN
-            samples = cls._PEER_PROGRESS_DATA[peer_id]
-
-            # Don't add the same progress twice
-            if not samples or peer_progress != samples[-1][1]:
-                samples.append((time.monotonic(), peer_progress))
+            samples = cls._record_peer_progress(peer_id, peer_progress)
 
             # We need at least 3 samples
             if len(samples) >= 3:
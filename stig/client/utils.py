@@ -12,13 +12,13 @@
 import asyncio
 import calendar
 import datetime
-import operator
 import os
 import re
 import time
 from types import SimpleNamespace
 
 from async_timeout import timeout as async_timeout
+from natsort import natsort_keygen, ns
 
 from . import constants as const
 from ..utils import cached_property, convert  # noqa: F401
@@ -89,28 +89,73 @@ class BoolOrBandwidth(multitype(Bool.partial(true=('limited', 'enabled', 'yes',
             return super().__new__(cls, value, **kwargs)
 
 
+_humansort_key = natsort_keygen(alg=ns.LOCALE)
+
+
+def _smartcmp(op):
+    # `op` is an unbound str method so that a SmartCmpStr as `other` doesn't
+    # get to handle the comparison again
+    def smartcmp(self, other):
+        try:
+            other_casefolded = other.casefolded
+            case_insensitive = other.is_casefolded
+        except AttributeError:
+            if not isinstance(other, str):
+                return NotImplemented
+            other_casefolded = other.casefold()
+            case_insensitive = str.__eq__(other, other_casefolded)
+        if case_insensitive:
+            return op(self.casefolded, other_casefolded)
+        else:
+            return op(self, other)
+    return smartcmp
+
+
 class SmartCmpStr(str):
     """
     String that compares case-insensitively if the other string consists solely
     of lower case characters.
+
+    The casefolded string and the natural sort key are computed once when they
+    are needed.
     """
-    def __cmp(self, op, other):
-        if not isinstance(other, str):
-            return NotImplemented
-        o = str(other)
-        if o == o.casefold():
-            s = self.casefold()
-        else:
-            s = str(self)
-        return op(s, o)
-
-    def __lt__(self, other): return self.__cmp(operator.lt, other)
-    def __le__(self, other): return self.__cmp(operator.le, other)
-    def __eq__(self, other): return self.__cmp(operator.eq, other)
-    def __ne__(self, other): return self.__cmp(operator.ne, other)
-    def __gt__(self, other): return self.__cmp(operator.gt, other)
-    def __ge__(self, other): return self.__cmp(operator.ge, other)
-    def __contains__(self, other): return self.__cmp(operator.contains, other)
+    @property
+    def casefolded(self):
+        """Casefolded string"""
+        try:
+            return self._casefolded
+        except AttributeError:
+            casefolded = self._casefolded = str.casefold(self)
+            return casefolded
+
+    @property
+    def is_casefolded(self):
+        """Whether this string is equal to its casefolded version"""
+        try:
+            return self._is_casefolded
+        except AttributeError:
+            is_casefolded = self._is_casefolded = str.__eq__(self, self.casefolded)
+            return is_casefolded
+
+    def casefold(self):
+        return self.casefolded
+
+    @property
+    def natsort_key(self):
+        """Key that sorts like `natsort.humansorted`"""
+        try:
+            return self._natsort_key
+        except AttributeError:
+            key = self._natsort_key = _humansort_key(self)
+            return key
+
+    __lt__ = _smartcmp(str.__lt__)
+    __le__ = _smartcmp(str.__le__)
+    __eq__ = _smartcmp(str.__eq__)
+    __ne__ = _smartcmp(str.__ne__)
+    __gt__ = _smartcmp(str.__gt__)
+    __ge__ = _smartcmp(str.__ge__)
+    __contains__ = _smartcmp(str.__contains__)
 
     # Defining __eq__ mandates defining __hash__ to make instances hashable
     def __hash__(self):
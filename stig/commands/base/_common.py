@@ -22,6 +22,12 @@ def make_X_FILTER_spec(filtername, or_focused=False, more_text='', **kwargs):
     return spec
 
 
+def make_LIMIT_spec(itemname):
+    return {'names': ('--limit', '-l'), 'type': int,
+            'description': ('Only list the first LIMIT %s or the last -LIMIT %s '
+                            'if LIMIT is negative' % (itemname, itemname))}
+
+
 def make_SCRIPTING_doc(cmdname):
     return (("If invoked as a command line argument and the output does not "
              "go to a TTY (i.e. the terminal size can't be determined), "
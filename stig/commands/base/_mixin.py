@@ -15,6 +15,15 @@ import os
 
 from ... import objects
 from ...settings import defaults
+from ...utils import LRUCache
+
+# Column lists from keybindings and commands are often the same, so we don't
+# have to validate them every time
+columns_cache = LRUCache(maxsize=64)
+
+def _validate_columns(setting, columns):
+    return columns_cache.get((setting, columns),
+                             lambda: objects.localcfg.validate(setting, columns))
 
 
 class get_single_torrent():
@@ -61,7 +70,7 @@ class get_torrent_columns():
 
         Raise ValueError or return a new list of `columns`.
         """
-        return objects.localcfg.validate('columns.torrents', columns)
+        return _validate_columns('columns.torrents', columns)
 
 
 
@@ -72,7 +81,7 @@ class get_file_columns():
 
         Raise ValueError or return a new list of `columns`.
         """
-        return objects.localcfg.validate('columns.files', columns)
+        return _validate_columns('columns.files', columns)
 
 
 
@@ -111,7 +120,7 @@ class get_peer_columns():
 
         Raise ValueError or return a new list of `columns`.
         """
-        return objects.localcfg.validate('columns.peers', columns)
+        return _validate_columns('columns.peers', columns)
 
 
 
@@ -150,7 +159,7 @@ class get_tracker_columns():
 
         Raise ValueError or return a new list of `columns`.
         """
-        return objects.localcfg.validate('columns.trackers', columns)
+        return _validate_columns('columns.trackers', columns)
 
 
 
@@ -175,7 +184,7 @@ class get_setting_columns():
 
         Raise ValueError or return a new list of `columns`.
         """
-        return objects.localcfg.validate('columns.settings', columns)
+        return _validate_columns('columns.settings', columns)
 
 
 class get_rc_filepath():
@@ -15,7 +15,8 @@ from . import _mixin as mixin
 from .. import CmdError, CommandMeta
 from ... import objects
 from ...completion import candidates
-from ._common import make_COLUMNS_doc, make_SCRIPTING_doc, make_X_FILTER_spec
+from ._common import (make_COLUMNS_doc, make_LIMIT_spec, make_SCRIPTING_doc,
+                      make_X_FILTER_spec)
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
@@ -40,6 +41,7 @@ class ListFilesCmdbase(mixin.get_file_columns, metaclass=CommandMeta):
          'default_description': "current value of 'columns.files' setting",
          'description': ('Comma-separated list of column names '
                          "(see COLUMNS section)")},
+        make_LIMIT_spec('files'),
     )
 
     from ...views.file import COLUMNS
@@ -48,7 +50,7 @@ class ListFilesCmdbase(mixin.get_file_columns, metaclass=CommandMeta):
         'SCRIPTING': make_SCRIPTING_doc(name),
     }
 
-    async def run(self, TORRENT_FILTER, FILE_FILTER, columns):
+    async def run(self, TORRENT_FILTER, FILE_FILTER, columns, limit):
         columns = objects.localcfg['columns.files'] if columns is None else columns
         try:
             columns = self.get_file_columns(columns)
@@ -64,14 +66,15 @@ class ListFilesCmdbase(mixin.get_file_columns, metaclass=CommandMeta):
         log.debug('Listing %s files of %s torrents', ffilter, tfilter)
 
         if asyncio.iscoroutinefunction(self.make_file_list):
-            await self.make_file_list(tfilter, ffilter, columns)
+            await self.make_file_list(tfilter, ffilter, columns, limit)
         else:
-            self.make_file_list(tfilter, ffilter, columns)
+            self.make_file_list(tfilter, ffilter, columns, limit)
 
     @classmethod
     def completion_candidates_posargs(cls, args):
         """Complete positional arguments"""
-        posargs = args.posargs({('--columns', '-c'): 1})
+        posargs = args.posargs({('--columns', '-c'): 1,
+                                ('--limit', '-l'): 1})
         if posargs.curarg_index == 1:
             return candidates.torrent_filter(args.curarg)
         elif posargs.curarg_index == 2:
@@ -16,8 +16,8 @@ from . import _mixin as mixin
 from .. import CmdError, CommandMeta
 from ... import objects
 from ...completion import candidates
-from ._common import (make_COLUMNS_doc, make_SCRIPTING_doc, make_SORT_ORDERS_doc,
-                      make_X_FILTER_spec)
+from ._common import (make_COLUMNS_doc, make_LIMIT_spec, make_SCRIPTING_doc,
+                      make_SORT_ORDERS_doc, make_X_FILTER_spec)
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
@@ -49,6 +49,8 @@ class ListPeersCmdbase(mixin.get_peer_sorter, mixin.get_peer_columns,
          'default_description': "current value of 'columns.peers' setting",
          'description': ('Comma-separated list of column names '
                          "(see COLUMNS section)")},
+
+        make_LIMIT_spec('peers'),
     )
 
     from ...views.peer import COLUMNS
@@ -62,7 +64,7 @@ class ListPeersCmdbase(mixin.get_peer_sorter, mixin.get_peer_columns,
         'SCRIPTING': make_SCRIPTING_doc(name),
     }
 
-    async def run(self, TORRENT_FILTER, PEER_FILTER, sort, columns):
+    async def run(self, TORRENT_FILTER, PEER_FILTER, sort, columns, limit):
         columns = objects.localcfg['columns.peers'] if columns is None else columns
         sort = objects.localcfg['sort.peers'] if sort is None else sort
         try:
@@ -84,15 +86,16 @@ class ListPeersCmdbase(mixin.get_peer_sorter, mixin.get_peer_columns,
         log.debug('Listing %s peers of %s torrents', pfilter, tfilter)
 
         if asyncio.iscoroutinefunction(self.make_peer_list):
-            await self.make_peer_list(tfilter, pfilter, sort, columns)
+            await self.make_peer_list(tfilter, pfilter, sort, columns, limit)
         else:
-            self.make_peer_list(tfilter, pfilter, sort, columns)
+            self.make_peer_list(tfilter, pfilter, sort, columns, limit)
 
     @classmethod
     def completion_candidates_posargs(cls, args):
         """Complete positional arguments"""
         posargs = args.posargs({('--columns', '-c'): 1,
-                                ('--sort', '-s'): 1})
+                                ('--sort', '-s'): 1,
+                                ('--limit', '-l'): 1})
         if posargs.curarg_index == 1:
             return candidates.torrent_filter(args.curarg)
         elif posargs.curarg_index == 2:
@@ -17,8 +17,8 @@ from .. import CmdError, CommandMeta
 from ... import objects
 from ...completion import candidates
 from ...utils.cliparser import Arg
-from ._common import (make_COLUMNS_doc, make_SCRIPTING_doc, make_SORT_ORDERS_doc,
-                      make_X_FILTER_spec)
+from ._common import (make_COLUMNS_doc, make_LIMIT_spec, make_SCRIPTING_doc,
+                      make_SORT_ORDERS_doc, make_X_FILTER_spec)
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
@@ -132,7 +132,8 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
                 'ls !active',
                 'ls seeds<10',
                 'ls active&tracker~example.org',
-                'ls active|idle&tracker~example')
+                'ls active|idle&tracker~example',
+                'ls --sort .rate-down --limit 10')
     argspecs = (
         make_X_FILTER_spec('TORRENT', or_focused=False, nargs='*'),
 
@@ -145,6 +146,8 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
          'default_description': "current value of 'columns.torrents' setting",
          'description': ('Comma-separated list of column names '
                          "(see COLUMNS section)")},
+
+        make_LIMIT_spec('torrents'),
     )
 
     from ...views.torrent import COLUMNS
@@ -155,7 +158,7 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
         'SCRIPTING': make_SCRIPTING_doc(name),
     }
 
-    async def run(self, TORRENT_FILTER, sort, columns):
+    async def run(self, TORRENT_FILTER, sort, columns, limit):
         sort = objects.localcfg['sort.torrents'] if sort is None else sort
         columns = objects.localcfg['columns.torrents'] if columns is None else columns
         try:
@@ -169,9 +172,9 @@ class ListTorrentsCmdbase(mixin.get_torrent_sorter, mixin.get_torrent_columns,
         else:
             log.debug('Listing %s torrents sorted by %s', tfilter, sort)
             if asyncio.iscoroutinefunction(self.make_torrent_list):
-                await self.make_torrent_list(tfilter, sort, columns)
+                await self.make_torrent_list(tfilter, sort, columns, limit)
             else:
-                self.make_torrent_list(tfilter, sort, columns)
+                self.make_torrent_list(tfilter, sort, columns, limit)
 
     @classmethod
     def completion_candidates_posargs(cls, args):
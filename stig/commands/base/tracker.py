@@ -16,8 +16,8 @@ from . import _mixin as mixin
 from .. import CmdError, CommandMeta
 from ... import objects
 from ...completion import candidates
-from ._common import (make_COLUMNS_doc, make_SCRIPTING_doc, make_SORT_ORDERS_doc,
-                      make_X_FILTER_spec)
+from ._common import (make_COLUMNS_doc, make_LIMIT_spec, make_SCRIPTING_doc,
+                      make_SORT_ORDERS_doc, make_X_FILTER_spec)
 
 from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
@@ -48,6 +48,8 @@ class ListTrackersCmdbase(mixin.get_tracker_sorter, mixin.get_tracker_columns,
          'default_description': "current value of 'columns.trackers' setting",
          'description': ('Comma-separated list of column names '
                          "(see COLUMNS section)")},
+
+        make_LIMIT_spec('trackers'),
     )
 
     from ...views.tracker import COLUMNS
@@ -61,7 +63,7 @@ class ListTrackersCmdbase(mixin.get_tracker_sorter, mixin.get_tracker_columns,
         'SCRIPTING': make_SCRIPTING_doc(name),
     }
 
-    async def run(self, TORRENT_FILTER, TRACKER_FILTER, sort, columns):
+    async def run(self, TORRENT_FILTER, TRACKER_FILTER, sort, columns, limit):
         columns = objects.localcfg['columns.trackers'] if columns is None else columns
         sort = objects.localcfg['sort.trackers'] if sort is None else sort
         try:
@@ -83,15 +85,16 @@ class ListTrackersCmdbase(mixin.get_tracker_sorter, mixin.get_tracker_columns,
         log.debug('Listing %s trackers of %s torrents', trkfilter, torfilter)
 
         if asyncio.iscoroutinefunction(self.make_tracker_list):
-            await self.make_tracker_list(torfilter, trkfilter, sort, columns)
+            await self.make_tracker_list(torfilter, trkfilter, sort, columns, limit)
         else:
-            self.make_tracker_list(torfilter, trkfilter, sort, columns)
+            self.make_tracker_list(torfilter, trkfilter, sort, columns, limit)
 
     @classmethod
     def completion_candidates_posargs(cls, args):
         """Complete positional arguments"""
         posargs = args.posargs({('--columns', '-c'): 1,
-                                ('--sort', '-s'): 1})
+                                ('--sort', '-s'): 1,
+                                ('--limit', '-l'): 1})
         if posargs.curarg_index == 1:
             return candidates.torrent_filter(args.curarg)
         elif posargs.curarg_index == 2:
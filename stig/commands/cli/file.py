@@ -26,7 +26,7 @@ class ListFilesCmd(base.ListFilesCmdbase,
                    mixin.only_supported_columns):
     provides = {'cli'}
 
-    async def make_file_list(self, tfilter, ffilter, columns):
+    async def make_file_list(self, tfilter, ffilter, columns, limit=None):
         response = await self.make_request(
             objects.srvapi.torrent.torrents(tfilter, keys=('name', 'files')),
             quiet=True)
@@ -37,8 +37,15 @@ class ListFilesCmd(base.ListFilesCmdbase,
 
         filelist = []
         for torrent in humansorted(torrents, key=lambda t: t['name']):
-            files, filtered_count = self._flatten_tree(torrent['files'], ffilter)
-            filelist.extend(files)
+            if ffilter is None:
+                filetree = torrent['files']
+            else:
+                # Only create matching files
+                filetree = torrent.filtered('files', ffilter)
+            filelist.extend(self._flatten_tree(filetree))
+
+        if limit is not None:
+            filelist = filelist[:limit] if limit >= 0 else filelist[limit:]
 
         if filelist:
             from ...views.file import COLUMNS as FILE_COLUMNS
@@ -51,12 +58,11 @@ class ListFilesCmd(base.ListFilesCmdbase,
             else:
                 raise CmdError('No matching files: %s' % (ffilter))
 
-    def _flatten_tree(self, files, ffilter=None, _indent_level=0):
+    def _flatten_tree(self, files, _indent_level=0):
         """
         Return list of rows for `print_table`
 
         `files` must be a nested mapping tree (i.e. TorrentFileTree).
-        `ffilter` must be a FileFilter instance or None.
         """
         if TERMSIZE.columns is None:
             def indent(node):
@@ -67,25 +73,21 @@ class ListFilesCmd(base.ListFilesCmdbase,
 
         from ...views.file import TorrentFileDirectory
         flist = []
-        filtered_count = 0
         for key,value in humansorted(files.items(), key=lambda pair: pair[0]):
             if value.nodetype == 'leaf':
-                if ffilter is None or ffilter.match(value):
-                    filenode = dict(value)  # Copy original TorrentFile
-                    indent(filenode)
-                    flist.append(filenode)
-                else:
-                    filtered_count += 1
+                filenode = dict(value)  # Copy original TorrentFile
+                indent(filenode)
+                flist.append(filenode)
 
             elif value.nodetype == 'parent':
-                sub_flist, sub_filtered_count = self._flatten_tree(value, ffilter, _indent_level + 1)
+                sub_flist = self._flatten_tree(value, _indent_level + 1)
                 if TERMSIZE.columns is not None:
-                    dirnode = TorrentFileDirectory(key, value, sub_filtered_count)
+                    dirnode = TorrentFileDirectory(key, value, value.filtered_count)
                     indent(dirnode)
                     flist.append(dirnode)
                 flist.extend(sub_flist)
 
-        return flist, filtered_count
+        return flist
 
 
 class PriorityCmd(base.PriorityCmdbase,
@@ -25,7 +25,7 @@ class ListPeersCmd(base.ListPeersCmdbase,
                    mixin.make_request, mixin.select_torrents):
     provides = {'cli'}
 
-    async def make_peer_list(self, tfilter, pfilter, sort, columns):
+    async def make_peer_list(self, tfilter, pfilter, sort, columns, limit=None):
         response = await self.make_request(
             objects.srvapi.torrent.torrents(tfilter, keys=('name', 'peers')),
             quiet=True)
@@ -35,23 +35,22 @@ class ListPeersCmd(base.ListPeersCmdbase,
             raise CmdError()
 
         if pfilter is None:
-            def filter_peers(peers):
-                return peers
+            def filter_peers(torrent):
+                return torrent['peers']
         else:
-            def filter_peers(peers):
-                return pfilter.apply(peers)
+            def filter_peers(torrent):
+                return torrent.filtered('peers', pfilter)
 
         peerlist = []
         for torrent in humansorted(torrents, key=lambda t: t['name']):
-            peerlist.extend(filter_peers(torrent['peers']))
+            peerlist.extend(filter_peers(torrent))
+        peerlist = sort.apply(peerlist, limit=limit)
 
         # Pre-lookup peers' IPs
         if 'host' in columns and objects.localcfg['reverse-dns']:
             from ...client import rdns
             rdns.query(*(p['ip'] for p in peerlist))
 
-        sort.apply(peerlist, inplace=True)
-
         if peerlist:
             from ...views.peer import COLUMNS as PEER_COLUMNS
             print_table(peerlist, columns, PEER_COLUMNS)
@@ -83,7 +83,7 @@ class ListTorrentsCmd(base.ListTorrentsCmdbase,
                       mixin.only_supported_columns):
     provides = {'cli'}
 
-    async def make_torrent_list(self, tfilter, sort, columns):
+    async def make_torrent_list(self, tfilter, sort, columns, limit=None):
         from ...views.torrent import COLUMNS as TORRENT_COLUMNS
 
         # Remove columns that aren't supported by CLI interface (e.g. 'marked')
@@ -101,7 +101,7 @@ class ListTorrentsCmd(base.ListTorrentsCmdbase,
         response = await self.make_request(
             objects.srvapi.torrent.torrents(tfilter, keys=keys),
             quiet=True)
-        torrents = sort.apply(response.torrents)
+        torrents = sort.apply(response.torrents, limit=limit)
 
         # Show table of found torrents
         if torrents:
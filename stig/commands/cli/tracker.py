@@ -25,7 +25,7 @@ class ListTrackersCmd(base.ListTrackersCmdbase,
                       mixin.make_request, mixin.select_torrents):
     provides = {'cli'}
 
-    async def make_tracker_list(self, torfilter, trkfilter, sort, columns):
+    async def make_tracker_list(self, torfilter, trkfilter, sort, columns, limit=None):
         response = await self.make_request(
             objects.srvapi.torrent.torrents(torfilter, keys=('name', 'trackers')),
             quiet=True)
@@ -35,17 +35,17 @@ class ListTrackersCmd(base.ListTrackersCmdbase,
             raise CmdError()
 
         if trkfilter is None:
-            def filter_trackers(trackers):
-                return trackers
+            def filter_trackers(torrent):
+                return torrent['trackers']
         else:
-            def filter_trackers(trackers):
-                return trkfilter.apply(trackers)
+            def filter_trackers(torrent):
+                return torrent.filtered('trackers', trkfilter)
 
         trklist = []
         for torrent in humansorted(torrents, key=lambda t: t['name']):
-            trklist.extend(filter_trackers(torrent['trackers']))
+            trklist.extend(filter_trackers(torrent))
 
-        sort.apply(trklist, inplace=True)
+        trklist = sort.apply(trklist, limit=limit)
 
         if trklist:
             from ...views.tracker import COLUMNS as TRACKER_COLUMNS
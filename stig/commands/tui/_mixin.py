@@ -331,7 +331,14 @@ class create_list_widget():
                 listw.columns = ('marked',) + columns
 
         # Tell list widget how to change the tab title
+        current_title = None
+
         def set_tab_title(text, count):
+            # List widgets report their title on every render; replacing the
+            # title widget redraws the tab bar even if nothing changed
+            nonlocal current_title
+            if (text, count) == current_title:
+                return
             # There is a race condition that can result in the list widget
             # setting a new title for a tab that has already been removed, which
             # raises an IndexError here.
@@ -339,6 +346,8 @@ class create_list_widget():
                 tabs.set_title(make_titlew(text, count), position=tabid)
             except IndexError:
                 pass
+            else:
+                current_title = (text, count)
         listw.title_updater = set_tab_title
 
         # Set a temporary title until the tab has finished loading its content
@@ -10,6 +10,7 @@
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
 from . import _mixin as mixin
+from .. import CmdError
 from ..base import file as base
 
 
@@ -19,7 +20,9 @@ class ListFilesCmd(base.ListFilesCmdbase,
                    mixin.create_list_widget):
     provides = {'tui'}
 
-    def make_file_list(self, tfilter, ffilter, columns):
+    def make_file_list(self, tfilter, ffilter, columns, limit=None):
+        if limit is not None:
+            raise CmdError('--limit is not supported in the TUI.')
         from ...tui.views import FileListWidget
         self.create_list_widget(FileListWidget, theme_name='filelist',
                                 tfilter=tfilter, ffilter=ffilter,
@@ -10,6 +10,7 @@
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
 from . import _mixin as mixin
+from .. import CmdError
 from ..base import peer as base
 
 
@@ -19,7 +20,9 @@ class ListPeersCmd(base.ListPeersCmdbase,
                    mixin.create_list_widget):
     provides = {'tui'}
 
-    def make_peer_list(self, tfilter, pfilter, sort, columns):
+    def make_peer_list(self, tfilter, pfilter, sort, columns, limit=None):
+        if limit is not None:
+            raise CmdError('--limit is not supported in the TUI.')
         from ...tui.views import PeerListWidget
         self.create_list_widget(PeerListWidget, theme_name='peerlist',
                                 tfilter=tfilter, pfilter=pfilter,
@@ -13,6 +13,7 @@ import functools
 import os
 
 from . import _mixin as mixin
+from .. import CmdError
 from ... import objects
 from ...completion import candidates
 from ...utils.cliparser import Arg
@@ -80,7 +81,9 @@ class ListTorrentsCmd(base.ListTorrentsCmdbase,
                       mixin.create_list_widget):
     provides = {'tui'}
 
-    def make_torrent_list(self, tfilter, sort, columns):
+    def make_torrent_list(self, tfilter, sort, columns, limit=None):
+        if limit is not None:
+            raise CmdError('--limit is not supported in the TUI.')
         from ...tui.views import TorrentListWidget
         self.create_list_widget(TorrentListWidget, theme_name='torrentlist',
                                 tfilter=tfilter, sort=sort, columns=columns,
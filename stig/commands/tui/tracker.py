@@ -10,6 +10,7 @@
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
 from . import _mixin as mixin
+from .. import CmdError
 from ..base import tracker as base
 
 
@@ -19,7 +20,9 @@ class ListTrackersCmd(base.ListTrackersCmdbase,
                       mixin.create_list_widget):
     provides = {'tui'}
 
-    def make_tracker_list(self, torfilter, trkfilter, sort, columns):
+    def make_tracker_list(self, torfilter, trkfilter, sort, columns, limit=None):
+        if limit is not None:
+            raise CmdError('--limit is not supported in the TUI.')
         from ...tui.views import TrackerListWidget
         self.create_list_widget(TrackerListWidget, theme_name='trackerlist',
                                 torfilter=torfilter, trkfilter=trkfilter,
@@ -610,6 +610,37 @@ class UnmarkCmd(metaclass=CommandMeta):
                 widget.focus_position += 1
 
 
+class ExpandCmd(metaclass=CommandMeta):
+    name = 'expand'
+    provides = {'tui'}
+    category = 'tui'
+    description = 'Show the contents of the focused directory in a file list'
+
+    def run(self):
+        from ...tui.tuiobjects import tabs
+        content = tabs.focus.base_widget
+        if not hasattr(content, 'expand'):
+            raise CmdError('Nothing to expand here.')
+        else:
+            content.expand()
+
+
+class CollapseCmd(metaclass=CommandMeta):
+    name = 'collapse'
+    provides = {'tui'}
+    category = 'tui'
+    description = ('Hide the contents of the focused directory in a file list '
+                   'or focus its parent directory')
+
+    def run(self):
+        from ...tui.tuiobjects import tabs
+        content = tabs.focus.base_widget
+        if not hasattr(content, 'collapse'):
+            raise CmdError('Nothing to collapse here.')
+        else:
+            content.collapse()
+
+
 class QuitCmd(metaclass=CommandMeta):
     name = 'quit'
     provides = {'tui'}
@@ -176,6 +176,14 @@ def init_defaults(localcfg):
                  default=True,
                  description=('Whether to lookup peers\' host names'))
 
+    localcfg.add('search-index',
+                 Bool.partial(),
+                 getter=lambda: objects.srvapi.torrent.search_index,
+                 setter=lambda v: setattr(objects.srvapi.torrent, 'search_index', v),
+                 default=False,
+                 description=('Whether to index torrent names, paths and comments '
+                              'for faster searches (uses more memory)'))
+
     localcfg.add('sort.torrents',
                  partial_sort_order(TorrentSorter),
                  default=TorrentSorter.DEFAULT_SORT,
@@ -201,6 +209,11 @@ def init_defaults(localcfg):
                  Int.partial(min=0),
                  default=10000,
                  description='Maximum number of lines to keep in history files')
+    localcfg.add('tui.fps',
+                 Int.partial(min=1),
+                 default=10,
+                 description=('Maximum number of screen updates per second; '
+                              'keypresses are always displayed immediately'))
     localcfg.add('tui.free-space.low',
                  Bytes.partial(min=0),
                  default='10GB',
@@ -218,6 +231,12 @@ def init_defaults(localcfg):
                  Float.partial(min=0.1),
                  default=5,
                  description='Interval in seconds between TUI updates')
+    localcfg.add('tui.tabs.hibernate',
+                 Float.partial(min=0),
+                 default=10,
+                 description=('Remove the list items of tabs that were not focused '
+                              'for this many minutes and stop updating them until the '
+                              'tab is focused again; 0 disables hibernation'))
     localcfg.add('tui.theme',
                  Path.partial(base=os.path.dirname(DEFAULT_RCFILE)),
                  default=DEFAULT_THEME_FILE,
@@ -552,6 +571,10 @@ DEFAULT_KEYMAP = (
      'description': 'Set selected or focused file\'s download priority to "low"'},
     {'context': 'file', 'key': 'f 0',       'action': 'priority off',
      'description': 'Don\'t download selected or focused file(s)'},
+    {'context': 'file', 'key': 'right',     'action': 'expand',
+     'description': 'Show contents of focused directory'},
+    {'context': 'file', 'key': 'left',      'action': 'collapse',
+     'description': 'Hide contents of focused directory or focus parent directory'},
     {'context': 'file', 'key': 'space',     'action': 'mark --toggle --focus-next',
      'description': 'Mark or unmark focused file or directory'},
     {'context': 'file', 'key': 'alt-space', 'action': 'mark --toggle --all',
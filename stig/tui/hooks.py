@@ -86,6 +86,16 @@ def _set_log_height(settings, name, value):
 localcfg.on_change(_set_log_height, name='tui.log.height')
 
 
+def _set_tabs_hibernate_delay(settings, name, value):
+    tuiobjects.tabs.hibernate_delay = value * 60
+localcfg.on_change(_set_tabs_hibernate_delay, name='tui.tabs.hibernate')
+
+
+def _set_fps(settings, name, value):
+    tuiobjects.urwidloop.fps = value
+localcfg.on_change(_set_fps, name='tui.fps')
+
+
 def _set_theme(settings, name, value):
     try:
         tuiobjects.theme.load(value.full_path, tuiobjects.urwidscreen)
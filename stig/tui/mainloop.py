@@ -0,0 +1,89 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+import asyncio
+import collections
+import time
+
+import urwid
+
+from ..logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
+
+class MainLoop(urwid.MainLoop):
+    """
+    MainLoop that redraws the screen at most `fps` times per second
+
+    Widgets that are invalidated between frames are rendered together in the
+    next frame.  Input is drawn immediately.
+    """
+
+    def __init__(self, *args, fps=10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_canvas = None
+        self._last_draw = None
+        self._draw_handle = None
+        self._frame_times = collections.deque(maxlen=100)
+        self.fps = fps
+
+    @property
+    def fps(self):
+        """Maximum number of frames per second"""
+        return self._fps
+
+    @fps.setter
+    def fps(self, fps):
+        fps = float(fps)
+        if fps <= 0:
+            raise ValueError('Invalid fps: %r' % (fps,))
+        self._fps = fps
+
+    @property
+    def frame_times(self):
+        """Tuple of seconds it took to render and draw the most recent frames"""
+        return tuple(self._frame_times)
+
+    def process_input(self, keys):
+        handled = super().process_input(keys)
+        if self.screen.started:
+            self.draw_screen()
+        return handled
+
+    def entering_idle(self):
+        # urwid calls this after any event that may have invalidated widgets.
+        # Instead of drawing every time, schedule a single draw for the next
+        # frame.
+        if self.screen.started and self._draw_handle is None:
+            if self._last_draw is None:
+                delay = 0
+            else:
+                delay = max(0, self._last_draw + 1 / self._fps - time.monotonic())
+            self._draw_handle = asyncio.get_event_loop().call_later(delay, self._draw_scheduled)
+
+    def _draw_scheduled(self):
+        self._draw_handle = None
+        if self.screen.started:
+            self.draw_screen()
+
+    def draw_screen(self):
+        start = time.perf_counter()
+        self._last_draw = time.monotonic()
+        if not self.screen_size:
+            self.screen_size = self.screen.get_cols_rows()
+
+        # Unless any widget was invalidated, we get the same canvas from
+        # urwid's CanvasCache and the screen doesn't need to paint anything
+        canvas = self._topmost_widget.render(self.screen_size, focus=True)
+        self.screen.draw_screen(self.screen_size, canvas)
+        if canvas is not self._last_canvas:
+            self._last_canvas = canvas
+            self._frame_times.append(time.perf_counter() - start)
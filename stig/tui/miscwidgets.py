@@ -380,13 +380,16 @@ class AvailableDiskSpaceWidget(urwid.WidgetWrap):
 class MarkedItemsWidget(urwid.WidgetWrap):
     def __init__(self):
         self._text = urwid.Text(('bottombar', ' '))
+        self._count = None
         super().__init__(self._text)
 
     def update(self, count):
+        # This is called on every render of a list
+        if count == self._count:
+            return
+        self._count = count
+
         if count > 0:
-            new_text = ('bottombar.marked', ' %d marked ' % count)
+            self._text.set_text(('bottombar.marked', ' %d marked ' % count))
         else:
-            new_text = ('bottombar', EMPTY_TEXT)
-
-        if new_text != self._text.text:
-            self._text.set_text(new_text)
+            self._text.set_text(('bottombar', EMPTY_TEXT))
@@ -35,27 +35,47 @@ class Table():
         self._enabled_columns = []
         self._headers = Group(cls=urwid.Columns, dividechars=1)
         self._members = {}
+        self._spares = []  # Unregistered rows that can be reused
         self.columns = columns
 
     def register(self, member_id):
         """Add a new row
 
         Create a new Group(cls=Columns) object and fill it with enabled column
-        cells which can then be retrieved with `get_row(member_id)`.
+        cells which can then be retrieved with `get_row(member_id)`.  If there
+        are any rows left from `unregister` calls, one of them is reused.
         """
-        member = Group(cls=urwid.Columns, dividechars=1)
-        for colname in self._enabled_columns:
-            cellcls = self._colspecs[colname]
-            cellwidget = cellcls()
-            if member.exists(colname):
-                member.remove(colname)
-            member.add(colname, cellwidget, options=cellcls.width, removable=True)
+        if self._spares:
+            member = self._spares.pop()
+        else:
+            member = Group(cls=urwid.Columns, dividechars=1)
+            for colname in self._enabled_columns:
+                cellcls = self._colspecs[colname]
+                cellwidget = cellcls()
+                if member.exists(colname):
+                    member.remove(colname)
+                member.add(colname, cellwidget, options=cellcls.width, removable=True)
         self._members[member_id] = member
 
+    def unregister(self, member_id):
+        """Remove row and keep it for reuse by `register`
+
+        The cells of the reused row still display the values of `member_id`
+        until they are updated.
+        """
+        member = self._members.pop(member_id, None)
+        if member is not None:
+            self._spares.append(member)
+
     def get_row(self, member_id):
         """Return a row, i.e. a Group(cls=Columns) object created by register()"""
         return self._members[member_id]
 
+    @property
+    def member_ids(self):
+        """Tuple of the IDs of all registered rows"""
+        return tuple(self._members)
+
     @property
     def headers(self):
         """Header row (a Group(cls=Columns) object)"""
@@ -74,6 +94,7 @@ class Table():
 
         # Remove all columns
         self._headers.clear()
+        self._spares.clear()
         for member in self._members.values():
             member.clear()
         self._enabled_columns = []
@@ -95,6 +116,7 @@ class Table():
     def clear(self):
         """Remove all registered rows"""
         self._members = {}
+        self._spares.clear()
 
 
 class ColumnHeaderWidget(urwid.WidgetWrap):
@@ -9,6 +9,7 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+import asyncio
 from collections import abc, defaultdict
 
 import urwid
@@ -79,7 +80,7 @@ class Tabs(urwid.Widget):
     _sizing = frozenset([urwid.FLOW, urwid.BOX])
     _max_focus_history_size = 100
 
-    def __init__(self, *contents, tabbar=None):
+    def __init__(self, *contents, tabbar=None, hibernate_delay=0):
         """
         Create new Tabs widget
 
@@ -88,6 +89,7 @@ class Tabs(urwid.Widget):
         tabbar: TabBar instance that is used to display tab titles or any object
                 with a 'base_widget' attribute (e.g. AttrMap) that returns a
                 TabBar object
+        hibernate_delay: See `hibernate_delay` property
         """
         if tabbar is None:
             self._tabbar = TabBar()
@@ -100,6 +102,8 @@ class Tabs(urwid.Widget):
         self._ids = []
         self._focus_history = []
         self._info = defaultdict(lambda: {})
+        self._hibernate_delay = hibernate_delay
+        self._hibernate_handles = {}  # Map TabIDs to scheduled hibernations
         self._contents = urwid.MonitoredFocusList()
         self._contents.set_focus_changed_callback(self._focus_changed_callback)
         for content in contents:
@@ -250,6 +254,8 @@ class Tabs(urwid.Widget):
         self._contents.insert(newpos, widget)
         if focus:
             self.focus_position = newpos
+        else:
+            self._schedule_hibernation(this_id)
         return this_id
 
     def move(self, position=None, destination='right', wrap=False):
@@ -319,6 +325,7 @@ class Tabs(urwid.Widget):
         fh = self._focus_history
         while tabid in fh:
             fh.remove(tabid)
+        self._cancel_hibernation(tabid)
 
     def clear(self):
         """Remove all tabs"""
@@ -410,10 +417,50 @@ class Tabs(urwid.Widget):
 
     def _focus_changed_callback(self, pos):
         tab_id = self.get_id(pos)
+        if self._focus_history and self._focus_history[-1] != tab_id:
+            self._schedule_hibernation(self._focus_history[-1])
+        self._cancel_hibernation(tab_id)
         self._focus_history.append(tab_id)
         while len(self._focus_history) > self._max_focus_history_size:
             self._focus_history.pop(0)
 
+    @property
+    def hibernate_delay(self):
+        """
+        Seconds before the content of an unfocused tab is hibernated or 0 to disable hibernation
+
+        Content widgets are hibernated by calling their `hibernate` method if
+        they have one.  They must restore themselves when they are rendered
+        again.
+        """
+        return self._hibernate_delay
+
+    @hibernate_delay.setter
+    def hibernate_delay(self, seconds):
+        self._hibernate_delay = seconds
+        focus_id = self.focus_id
+        for tabid in self._ids:
+            if tabid != focus_id:
+                self._schedule_hibernation(tabid)
+
+    def _schedule_hibernation(self, tabid):
+        self._cancel_hibernation(tabid)
+        if self._hibernate_delay > 0:
+            self._hibernate_handles[tabid] = asyncio.get_event_loop().call_later(
+                self._hibernate_delay, self._hibernate, tabid)
+
+    def _cancel_hibernation(self, tabid):
+        handle = self._hibernate_handles.pop(tabid, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _hibernate(self, tabid):
+        del self._hibernate_handles[tabid]
+        if tabid in self._ids and tabid != self.focus_id:
+            widget = self.get_content(tabid)
+            if hasattr(widget, 'hibernate'):
+                widget.hibernate()
+
     @property
     def focus(self):
         """Content widget of currently focused tab or None if no tabs exist"""
@@ -23,6 +23,7 @@ from ..settings.defaults import DEFAULT_KEYMAP
 from .group import Group
 from .keymap import KeyMap
 from .logger import LogWidget
+from .mainloop import MainLoop
 from .miscwidgets import (AvailableDiskSpaceWidget, BandwidthStatusWidget,
                           ConnectionStatusWidget, KeyChainsWidget, MarkedItemsWidget,
                           QuickHelpWidget, TorrentCountersWidget)
@@ -87,7 +88,8 @@ topbar.add(name='_spacer', widget=urwid.AttrMap(_greedy_spacer(), 'topbar'))
 topbar.add(name='help',   widget=QuickHelpWidget(), options='pack')
 
 tabs = keymap.wrap(Tabs, context='tabs')(
-    tabbar=urwid.AttrMap(TabBar(), 'tabs.unfocused')
+    tabbar=urwid.AttrMap(TabBar(), 'tabs.unfocused'),
+    hibernate_delay=objects.localcfg['tui.tabs.hibernate'] * 60,
 )
 
 bottombar = Group(cls=urwid.Columns)
@@ -122,8 +124,9 @@ def unhandled_input(key):
         log.debug('Unhandled key: %s', key)
 
 urwidscreen = urwid.raw_display.Screen()
-urwidloop = urwid.MainLoop(widgets,
-                           screen=urwidscreen,
-                           event_loop=urwid.AsyncioEventLoop(loop=asyncio.get_event_loop()),
-                           unhandled_input=unhandled_input,
-                           handle_mouse=False)
+urwidloop = MainLoop(widgets,
+                     screen=urwidscreen,
+                     event_loop=urwid.AsyncioEventLoop(loop=asyncio.get_event_loop()),
+                     unhandled_input=unhandled_input,
+                     handle_mouse=False,
+                     fps=objects.localcfg['tui.fps'])
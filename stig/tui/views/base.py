@@ -9,7 +9,9 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+import bisect
 import collections
+import time
 
 import urwid
 
@@ -17,6 +19,9 @@ from ..scroll import ScrollBar
 from ..table import ColumnHeaderWidget, Table
 from ..tuiobjects import bottombar
 
+from ...logging import make_logger  # isort:skip
+log = make_logger(__name__)
+
 
 class Style():
     """Map standard attributes to those defined in a urwid palette
@@ -81,6 +86,12 @@ class CellWidgetBase(urwid.WidgetWrap):
     width = ('weight', 100)
     align = 'right'
 
+    # Keys of the displayed data that are used by `update` (`None` means any
+    # key may be used) and whether the displayed value also depends on the
+    # current time (e.g. timestamps that switch to a shorter format)
+    needed_keys = None
+    time_dependent = False
+
     def __init__(self):
         self.value = None
         self.text = urwid.Text('', wrap=self.wrap, align=self.align)
@@ -108,8 +119,24 @@ class CellWidgetBase(urwid.WidgetWrap):
             cls.header.base_widget.right = str(right)
 
 
+# Placeholder for values that weren't seen yet
+_UNKNOWN = object()
+
+# Changed keys of items that didn't change
+_NO_CHANGES = frozenset()
+
+
 class ItemWidgetBase(urwid.WidgetWrap):
-    """Base class for items in Torrent/File/Peer/... lists"""
+    """Base class for items in Torrent/File/Peer/... lists
+
+    data: Info of torrent/tracker/file/peer/... as mapping
+    cells: Group instance that combines widgets horizontally
+    table: Table instance that provides `cells` when they are needed
+
+    If `table` is given instead of `cells`, the urwid widgets that display
+    `data` are only created when urwid needs them and they are given back to
+    `table` by `release`.  The item widget itself is the row ID in `table`.
+    """
 
     # Derived classes must set these class attributes; lists with unfocusable
     # items (e.g. peer lists) don't have to set palette_focused and
@@ -118,9 +145,19 @@ class ItemWidgetBase(urwid.WidgetWrap):
     palette_unfocused = NotImplemented
     palette_focused   = NotImplemented
 
-    def __init__(self, data, cells):
-        self._data = data    # Info of torrent/tracker/file/peer/... as mapping
-        self._cells = cells  # Group instance that combines widgets horizontally
+    def __init__(self, data, cells=None, table=None):
+        self._data = data
+        self._table = table
+        self._cells = None
+        self._item_widget = None
+        self._values = None  # Values of keys needed by cells from the last update
+        self._is_marked = False
+        self._canvases = {}  # Map focus states to the most recently rendered canvas
+        if cells is not None:
+            self._set_cells(cells)
+
+    def _set_cells(self, cells):
+        self._cells = cells
 
         # Create focusable or unfocusable item widget
         if self.columns_focus_map is not NotImplemented:
@@ -131,15 +168,120 @@ class ItemWidgetBase(urwid.WidgetWrap):
         else:
             item_widget = urwid.AttrMap(cells, self.palette_unfocused)
         urwid.WidgetWrap.__init__(self, item_widget)
+        self._canvases.clear()
+        self._invalidate()
 
         # Initialize cell widgets
-        self.update(data)
+        needed_keys = set()
+        for widget in cells.widgets:
+            needed_keys.update(getattr(widget, 'needed_keys', None) or ())
+        self._values = dict.fromkeys(needed_keys, _UNKNOWN)
+        self.update(self._data)
+        if cells.exists('marked'):
+            cells.marked.is_marked = self._is_marked
 
-    def update(self, data):
-        for widget in self._cells.widgets:
-            if hasattr(widget, 'update'):
-                widget.update(data)
+    @property
+    def _wrapped_widget(self):
+        # Create cells when urwid needs them
+        if self._item_widget is None:
+            table = self._table
+            table.register(self)
+            self._set_cells(table.get_row(self))
+        return self._item_widget
+
+    @_wrapped_widget.setter
+    def _wrapped_widget(self, widget):
+        self._item_widget = widget
+
+    @property
+    def is_materialized(self):
+        """Whether the urwid widgets that display this item exist"""
+        return self._item_widget is not None
+
+    def reset(self):
+        """Fill all cells again, e.g. after columns were added or removed"""
+        if self._cells is not None:
+            self._set_cells(self._cells)
+
+    def release(self):
+        """Give cells back to the table they were taken from"""
+        if self._table is not None and self._item_widget is not None:
+            self._table.unregister(self)
+            self._cells = None
+            self._item_widget = None
+            self._values = None
+            self._canvases.clear()
+            self._invalidate()
+
+    def render(self, size, focus=False):
+        # urwid's CanvasCache only keeps canvases as long as they are
+        # referenced elsewhere, i.e. while they are on the screen.  Keeping
+        # the most recent canvas for each focus state means rows that are
+        # scrolled back into view or that get or lose focus are not rendered
+        # again.  The canvas is still rendered again if the width changes or
+        # any cell is invalidated (e.g. because of a new value or a mark).
+        canvas = self._wrapped_widget.render(size, focus)
+        self._canvases[focus] = canvas
+        return canvas
+
+    def rows(self, size, focus=False):
+        # Cells that don't exist yet are assumed to display a single line
+        if self._item_widget is None:
+            return 1
+        return self._item_widget.rows(size, focus)
+
+    def update(self, data, changed_keys=None):
+        """
+        Update cells that display any of `changed_keys` with `data`
+
+        changed_keys: Keys of `data` with new values or `None` to find them by
+                      comparing with the values from the previous update
+
+        Cells without `needed_keys` are always updated.
+        """
         self._data = data
+        cells = self._cells
+        if cells is not None:
+            if changed_keys is None:
+                changed_keys = self._find_changed_keys(data)
+            else:
+                self._remember_values(data, changed_keys)
+
+            for widget in cells.widgets:
+                if hasattr(widget, 'update'):
+                    needed_keys = getattr(widget, 'needed_keys', None)
+                    if needed_keys is None or not changed_keys.isdisjoint(needed_keys):
+                        widget.update(data)
+
+    def _find_changed_keys(self, data):
+        values = self._values
+        changed_keys = set()
+        for key,old_value in values.items():
+            try:
+                new_value = data[key]
+            except KeyError:
+                new_value = _UNKNOWN
+            if old_value is _UNKNOWN or (new_value is not old_value and new_value != old_value):
+                values[key] = new_value
+                changed_keys.add(key)
+        return changed_keys
+
+    def _remember_values(self, data, keys):
+        values = self._values
+        for key in keys:
+            if key in values:
+                try:
+                    values[key] = data[key]
+                except KeyError:
+                    values[key] = _UNKNOWN
+
+    def tick(self):
+        """Update cells that display time-dependent values"""
+        cells = self._cells
+        if cells is not None:
+            for widget in cells.widgets:
+                if getattr(widget, 'time_dependent', False):
+                    widget.update(self._data)
 
     @property
     def id(self):
@@ -151,18 +293,24 @@ class ItemWidgetBase(urwid.WidgetWrap):
         """Displayed data in dictionary form"""
         return self._data
 
+    @property
+    def _has_marked_column(self):
+        if self._table is not None:
+            return 'marked' in self._table.columns
+        else:
+            return self._cells.exists('marked')
+
     @property
     def is_marked(self):
         """Whether this item has been marked by the user"""
-        if self._cells.exists('marked'):
-            return self._cells.marked.is_marked
-        else:
-            return False
+        return self._is_marked and self._has_marked_column
 
     @is_marked.setter
     def is_marked(self, is_marked):
-        if self._cells.exists('marked'):
-            self._cells.marked.is_marked = bool(is_marked)
+        if self._has_marked_column:
+            self._is_marked = bool(is_marked)
+            if self._cells is not None and self._cells.exists('marked'):
+                self._cells.marked.is_marked = self._is_marked
 
 
 class ListWidgetBase(urwid.WidgetWrap):
@@ -175,6 +323,13 @@ class ListWidgetBase(urwid.WidgetWrap):
     palette_name    = NotImplemented
     focusable_items = False
 
+    # Whether cells of list items are only created for rows near the viewport;
+    # this requires that each list item is a single row high
+    virtual_items   = True
+
+    # Seconds between updates of cells with time-dependent values
+    CLOCK_INTERVAL = 10
+
     def __init__(self, srvapi, keymap, columns=None, sort=None, title=None):
         self._srvapi = srvapi
         self._keymap = keymap
@@ -187,11 +342,19 @@ class ListWidgetBase(urwid.WidgetWrap):
         self._data_dict = None
         self._marked = set()
 
-        self._existing_widgets = set()
-        self._hidden_widgets = set()
+        self._existing_widgets = {}  # Map item IDs to item widgets
+        self._visible_ids = set()    # IDs of item widgets in the list walker
+        self._dead_widgets = set()   # Removed item widgets that are still in the list walker
 
         self._sort = sort
         self._sort_orig = sort
+        self._sorted_by = None           # Sorter of the last sort
+        self._sort_keys = {}             # Map sorted widgets to their sort keys
+        self._unsorted_widgets = set()   # Widgets that may have moved since the last sort
+        self._clock_tick = None          # CLOCK_INTERVAL periods since the epoch
+
+        self._hibernating = False
+        self._saved_state = None  # Focus and marks to restore after hibernation
 
         self._title_name = title
         self.title_updater = None
@@ -225,71 +388,139 @@ class ListWidgetBase(urwid.WidgetWrap):
         super()._invalidate()
 
     def render(self, size, focus=False):
+        if self._hibernating:
+            self.wake()
+
         # Remember focused item widget in case items get added or removed
         focusedw = self.focused_widget
 
+        restore_state = self._saved_state is not None and self._data_dict is not None
         if self._data_dict is not None:
-            self._update_existing_widgets(self._data_dict)
+            self._update_existing_widgets(self._data_dict, self._get_changed_keys())
             self._data_dict = None
 
         self._hide_or_unhide_widgets()
         self._sort_widgets()
+        self._maybe_tick()
 
         # Ensure focus doesn't change when items get added or removed
         if focusedw is not None and self.focused_widget is not None and \
-           focusedw.id != self.focused_widget.id:
-            focused_id = focusedw.id
-            for i,w in enumerate(self._listbox.body):
-                if w.id == focused_id:
-                    self._listbox.focus_position = i
-                    break
+           focusedw is not self.focused_widget and focusedw.id in self._visible_ids:
+            self._listbox.focus_position = self._listbox.body.index(focusedw)
+
+        if restore_state:
+            self._restore_state(self._saved_state)
+            self._saved_state = None
 
         # Update number of marked items in this list
         bottombar.marked.update(len(self._marked))
 
         # focus=True because we always want to highlight the focused item, for
         # example when the CLI is open
-        return super().render(size, focus=True)
+        canvas = super().render(size, focus=True)
+
+        if self.virtual_items:
+            self._release_distant_widgets(size[1])
+        return canvas
+
+    def _maybe_tick(self):
+        clock_tick = int(time.time() // self.CLOCK_INTERVAL)
+        if clock_tick != self._clock_tick:
+            self._clock_tick = clock_tick
+            if self.virtual_items:
+                widgets = self._table.member_ids
+            else:
+                widgets = self._existing_widgets.values()
+            for w in widgets:
+                w.tick()
+
+    def _release_distant_widgets(self, maxrow):
+        # Keep cells of the widgets in the viewport and of one screen above and
+        # below it so they're ready for scrolling.  Cells of any other widgets
+        # are given back to the table to be reused.
+        walker = self._listbox.body
+        if walker:
+            top = walker.focus - self._listbox.offset_rows
+            nearby_widgets = set(walker[max(0, top - maxrow):top + 2 * maxrow])
+        else:
+            nearby_widgets = ()
+        for w in self._table.member_ids:
+            if w not in nearby_widgets:
+                w.release()
 
-    def _update_existing_widgets(self, data_dict):
-        existing_widgets = self._existing_widgets
-        dead_widgets = []
+    def _get_changed_keys(self):
+        """
+        Map item IDs to keys with new values since the previous update
 
-        for w in existing_widgets:  # w = *ItemWidget instance
-            id = w.id
-            try:
-                # Update existing *ItemWidget instances with new data
-                w.update(data_dict[id])
-                del data_dict[id]
-            except KeyError:
-                # Item no longer exists in data_dict anymore
-                dead_widgets.append(w)
+        Items that are not in the returned mapping are unchanged.  If an item
+        maps to `None` or if `None` is returned, item widgets find changed keys
+        by comparing values.
+        """
+        return None
 
-        # Remove dead *ItemWidget instances
-        walker = self._listbox.body
-        marked = self._marked
-        for w in dead_widgets:
-            if w in walker:
-                walker.remove(w)
-            existing_widgets.remove(w)
-            marked.discard(w)  # self._marked may have a reference too
-
-        # Any items that haven't been used to update an existing *ItemWidget instance are new
-        if data_dict:
-            table = self._table
-            ListItemClass = self._ListItemClass
-            for data_id,data in data_dict.items():
-                table.register(data_id)
-                row = table.get_row(data_id)
-                existing_widgets.add(ListItemClass(data, row))
+    def _update_existing_widgets(self, data_dict, changed_keys=None):
+        existing_widgets = self._existing_widgets
+        unsorted_widgets = self._unsorted_widgets
+
+        # Remove *ItemWidget instances of items that don't exist anymore
+        dead_ids = existing_widgets.keys() - data_dict.keys()
+        if dead_ids:
+            marked = self._marked
+            sort_keys = self._sort_keys
+            visible_ids = self._visible_ids
+            dead_widgets = self._dead_widgets
+            for id in dead_ids:
+                w = existing_widgets.pop(id)
+                if id in visible_ids:
+                    # Removed from list walker by _hide_or_unhide_widgets()
+                    visible_ids.remove(id)
+                    dead_widgets.add(w)
+                marked.discard(w)  # self._marked may have a reference too
+                unsorted_widgets.discard(w)
+                sort_keys.pop(w, None)
+                w.release()
+
+        # Update existing *ItemWidget instances with new data and create new
+        # ones for new items, which are added to the list walker by
+        # _hide_or_unhide_widgets()
+        table = self._table
+        ListItemClass = self._ListItemClass
+        virtual_items = self.virtual_items
+        visible_ids = self._visible_ids
+        for id,data in data_dict.items():
+            w = existing_widgets.get(id)
+            if w is not None:
+                if changed_keys is None:
+                    keys = None
+                else:
+                    keys = changed_keys.get(id, _NO_CHANGES)
+                w.update(data, keys)
+                # Unchanged items can't have moved
+                if id in visible_ids and keys is not _NO_CHANGES:
+                    unsorted_widgets.add(w)
+            elif virtual_items:
+                existing_widgets[id] = ListItemClass(data, table=table)
+            else:
+                table.register(id)
+                existing_widgets[id] = ListItemClass(data, table.get_row(id))
+
+    # Resort all widgets if more than this fraction of them has moved
+    _FULL_SORT_RATIO = 0.25
 
     def _sort_widgets(self):
+        # Only widgets that were updated, added or unhidden since the last sort
+        # can have moved.  Those are inserted into the already sorted list
+        # unless the sort order changed.
         walker = self._listbox.body
-        if self._sort is not None:
+        sort = self._sort
+        if sort is None:
+            self._sorted_by = None
+        else:
             try:
-                self._sort.apply(walker,
-                                 item_getter=lambda w: w.data,
-                                 inplace=True)
+                if sort is not self._sorted_by:
+                    self._sort_all_widgets(walker, sort)
+                elif self._unsorted_widgets:
+                    self._sort_unsorted_widgets(walker, sort)
             except KeyError:
                 # This happens when adding a new sort order that needs
                 # previously unneeded keys (e.g. "started" needs "time-started",
@@ -300,39 +531,165 @@ class ListWidgetBase(urwid.WidgetWrap):
                 # (I couldn't figure out why this redraw happens.)  Ignoring the
                 # KeyError fixes this because as soon as the RPC response gets
                 # through, a new redraw is issued and the new sort exists.
-                pass
+                self._sorted_by = None
+
+    def _sort_all_widgets(self, walker, sort):
+        sort_key = sort.sort_key
+        sort_keys = {w: sort_key(w.data) for w in walker}
+        walker[:] = sorted(walker, key=sort_keys.__getitem__)
+        self._sort_keys = sort_keys
+        self._sorted_by = sort
+        self._unsorted_widgets.clear()
+
+    def _sort_unsorted_widgets(self, walker, sort):
+        sort_key = sort.sort_key
+        sort_keys = self._sort_keys
+        moved = {}
+        for w in self._unsorted_widgets:
+            key = sort_key(w.data)
+            if sort_keys.get(w) != key:
+                moved[w] = key
+        self._unsorted_widgets.clear()
+
+        if len(moved) > len(walker) * self._FULL_SORT_RATIO:
+            sort_keys.update(moved)
+            walker[:] = sorted(walker, key=sort_keys.__getitem__)
+        elif moved:
+            widgets = [w for w in walker if w not in moved]
+            keys = [sort_keys[w] for w in widgets]
+            for w, key in moved.items():
+                sort_keys[w] = key
+                i = bisect.bisect_right(keys, key)
+                keys.insert(i, key)
+                widgets.insert(i, w)
+            walker[:] = widgets
 
     def _hide_or_unhide_widgets(self):
-        walker = self._listbox.body
         existing_widgets = self._existing_widgets
-        hidden_ids = tuple(w.id for w in self._limit_items(existing_widgets))
-        for w in existing_widgets:
-            widget_is_visible = w in walker
-            hide_widget = w.id in hidden_ids
-            if hide_widget and widget_is_visible:
-                walker.remove(w)
-                self._hidden_widgets.add(w)
-            elif not hide_widget and not widget_is_visible:
-                walker.append(w)
-
-        if self.title_updater is not None:
+        visible_ids = self._visible_ids
+        hidden_ids = self._hidden_ids(existing_widgets.values())
+        hide_ids = visible_ids.intersection(hidden_ids)
+        unhide_ids = existing_widgets.keys() - visible_ids - hidden_ids
+        remove_widgets = self._dead_widgets
+
+        if hide_ids or unhide_ids or remove_widgets:
+            # Rebuild list walker contents only once
+            walker = self._listbox.body
+            sort_keys = self._sort_keys
+            unsorted_widgets = self._unsorted_widgets
+            for id in hide_ids:
+                w = existing_widgets[id]
+                remove_widgets.add(w)
+                sort_keys.pop(w, None)
+                unsorted_widgets.discard(w)
+            visible_ids.difference_update(hide_ids)
+
+            if remove_widgets:
+                widgets = [w for w in walker if w not in remove_widgets]
+                remove_widgets.clear()
+            else:
+                widgets = list(walker)
+
+            for id in unhide_ids:
+                w = existing_widgets[id]
+                widgets.append(w)
+                unsorted_widgets.add(w)
+            visible_ids.update(unhide_ids)
+
+            # Replacing all items moves the focus to the end; keep it at the
+            # same position like removing and appending individual items would
+            focus = walker.focus or 0
+            walker[:] = widgets
+            if widgets:
+                walker.set_focus(min(focus, len(widgets) - 1))
+
+        # Keep the title from before hibernation until we have items again
+        if self.title_updater is not None and self._saved_state is None:
             self.title_updater(self.title, ' [%d]' % self.count)
 
-    def _limit_items(self, existing_widgets):
-        """Iterate over filtered widgets"""
-        return ()
+    def _hidden_ids(self, widgets):
+        """Return frozenset of IDs of `widgets` that are filtered out"""
+        return frozenset()
+
+    @staticmethod
+    def _filtered_out_ids(filter, widgets):
+        # IDs of widgets that don't match `filter`
+        if filter is None:
+            return frozenset()
+        else:
+            return filter.apply_ids((w.data for w in widgets), invert=True)
 
     def clear(self):
         """Remove all list items"""
+        if self.virtual_items:
+            for w in self._table.member_ids:
+                w.release()
         self._table.clear()
         self._listbox.body[:] = ()
         self._listbox._invalidate()
+        self._visible_ids.clear()
+        self._dead_widgets.clear()
         self._marked.clear()
+        self._sort_keys.clear()
+        self._unsorted_widgets.clear()
 
     def refresh(self):
         """Update list items"""
         raise NotImplementedError
 
+    @property
+    def is_hibernating(self):
+        """Whether list items were removed by `hibernate`"""
+        return self._hibernating
+
+    def hibernate(self):
+        """
+        Remove all list items and stop updating them
+
+        Only the IDs of the focused and marked items are kept.  They are
+        restored when the list is rendered again, which calls `wake`.
+        """
+        if not self._hibernating:
+            log.debug('Hibernating %r', self)
+            self._hibernating = True
+            # Don't forget the previous state if we didn't get any items since
+            # we woke up
+            if self._saved_state is None:
+                self._saved_state = self._save_state()
+            self._unsubscribe()
+            self.clear()
+            self._existing_widgets.clear()
+            self._data_dict = None
+
+    def wake(self):
+        """Start updating list items again after `hibernate`"""
+        if self._hibernating:
+            log.debug('Waking up %r', self)
+            self._hibernating = False
+            self._subscribe()
+
+    def _subscribe(self):
+        # Start getting list items again after hibernation
+        self.refresh()
+
+    def _unsubscribe(self):
+        # Stop getting list items while hibernating
+        pass
+
+    def _save_state(self):
+        return (self.focused_id, frozenset(w.id for w in self._marked))
+
+    def _restore_state(self, state):
+        focused_id, marked_ids = state
+        existing_widgets = self._existing_widgets
+        for id in marked_ids:
+            w = existing_widgets.get(id)
+            if w is not None:
+                w.is_marked = True
+                self._marked.add(w)
+        if focused_id in self._visible_ids:
+            self._listbox.focus_position = self._listbox.body.index(existing_widgets[focused_id])
+
 
     @property
     def columns(self):
@@ -341,6 +698,13 @@ class ListWidgetBase(urwid.WidgetWrap):
     @columns.setter
     def columns(self, columns):
         self._table.columns = columns
+        # Cells of new columns are empty until they are updated
+        for w in self._item_widgets:
+            w.reset()
+
+    @property
+    def _item_widgets(self):
+        return self._existing_widgets.values()
 
     @property
     def sort(self):
@@ -407,12 +771,12 @@ class ListWidgetBase(urwid.WidgetWrap):
     @property
     def marked(self):
         """Generator that yields ItemWidgetBase descendants"""
-        secondary_filter = self.secondary_filter
-        if secondary_filter is None:
+        hidden_ids = self._hidden_ids(self._marked)
+        if not hidden_ids:
             yield from self._marked
         else:
             for widget in self._marked:
-                if secondary_filter.match(widget.data):
+                if widget.id not in hidden_ids:
                     yield widget
 
     @property
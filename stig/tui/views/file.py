@@ -36,6 +36,17 @@ class Filename(_COLUMNS['name'], CellWidgetBase):
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['name'].header),
                            style.attrs('header'))
 
+    # Whether the displayed directory is collapsed
+    collapsed = False
+
+    def set_collapsed(self, collapsed):
+        self.collapsed = collapsed
+        self.update(self.data)
+
+    def get_value(self):
+        name = super().get_value()
+        return name + ' [+]' if self.collapsed else name
+
     def get_mode(self):
         if self.data.nodetype == 'leaf':
             return 'file'
@@ -27,87 +27,242 @@ from ...logging import make_logger  # isort:skip
 log = make_logger(__name__)
 
 
-class FileTreeDecorator(ArrowTree):
-    """urwidtrees decorator for TorrentFiles and TorrentFileTrees"""
-
-    def __init__(self, torrents, keymap, table, ffilter):
-        self._filewidgetcls = keymap.wrap(FileItemWidget, context='file')
-        self._table = table
-        self._ffilter = ffilter
-        self._widgets = {}
-        self._filtered_counts = {}
-        forest = self._create_file_forest(torrents)
-        super().__init__(forest, indent=2)
+class FileTree(urwidtrees.Tree):
+    """
+    Lazily expanded urwidtrees tree of the files of one or more torrents
+
+    Positions are tuples of indexes like in urwidtrees.SimpleTree.  The entries
+    of a directory are only sorted when they are needed.  Directories are
+    collapsed unless their key, a (torrent ID, name, name, ...) tuple, is in
+    `expanded`.  If `expanded` is `None`, only the topmost directory of a single
+    torrent is expanded.
+    """
+
+    def __init__(self, torrents, ffilter, expanded=None):
+        self._filetrees = {}        # Map torrent IDs to TorrentFileTrees
+        self._roots = []            # Keys of top-level nodes
+        self._children = {}         # Map directory positions to sorted entry names
+        self._filtered_counts = {}  # Map directory positions to number of filtered files
+        self._keys = {}             # Map positions to keys
+        self._filtered_ids = set()  # IDs of files that don't match ffilter
+
+        filecount = 0
+        for t in sorted(torrents, key=lambda t: t['name'].natsort_key):
+            filetree = self._filetrees[t['id']] = t['files']
+            files = tuple(filetree.files)
+            if files:
+                filtered_ids = tuple(f['id'] for f in files
+                                     if self._file_is_filtered(f, ffilter))
+                self._filtered_ids.update(filtered_ids)
+                rootname = next(iter(filetree))
+                if filetree[rootname].nodetype == 'parent' or not filtered_ids:
+                    self._roots.append((t['id'], rootname))
+                    filecount += len(files) - len(filtered_ids)
+        self.filecount = filecount
+        self.root = (0,) if self._roots else None
+
+        if expanded is None:
+            if len(self._roots) == 1 and self.is_directory((0,)):
+                expanded = (self._roots[0],)
+            else:
+                expanded = ()
+        self._expanded = set(expanded)
 
-    def _file_is_filtered(self, tfile):
-        if self._ffilter is None:
+    @staticmethod
+    def _file_is_filtered(tfile, ffilter):
+        if ffilter is None:
             return False  # No filter specified
-        elif isinstance(self._ffilter, (abc.Sequence, abc.Set)):
+        elif isinstance(ffilter, (abc.Sequence, abc.Set)):
             # ffilter is a collection of file IDs
-            return not tfile['id'] in self._ffilter
+            return not tfile['id'] in ffilter
         else:
             # ffilter is a FileFilter instance
-            return not self._ffilter.match(tfile)
-
-    def _create_file_forest(self, torrents):
-        # Create a list of nested trees in SimpleTree format.  But the leaves
-        # are mappings instead of widgets.  Each mapping contains the
-        # information that the `decorate` method needs to create a widget.
-
-        def create_tree(node, content):
-            if content.nodetype == 'leaf':
-                # Process single file
-                if not self._file_is_filtered(content):
-                    return (content, None)
+            return not ffilter.match(tfile)
+
+    def _key(self, pos):
+        key = self._keys.get(pos)
+        if key is None:
+            if len(pos) == 1:
+                key = self._roots[pos[0]]
+            else:
+                key = self._key(pos[:-1]) + (self._child_names(pos[:-1])[pos[-1]],)
+            self._keys[pos] = key
+        return key
+
+    def _entry(self, pos):
+        tid, *names = self._key(pos)
+        entry = self._filetrees[tid]
+        for name in names:
+            entry = entry[name]
+        return entry
+
+    def _child_names(self, pos):
+        names = self._children.get(pos)
+        if names is None:
+            directory = self._entry(pos)
+            if directory.nodetype == 'leaf':
+                return ()
+            names = []
+            filtered_count = 0
+            filtered_ids = self._filtered_ids
+            for name in humansorted(directory):
+                entry = directory[name]
+                if entry.nodetype == 'leaf' and entry['id'] in filtered_ids:
+                    filtered_count += 1
                 else:
+                    names.append(name)
+            names = self._children[pos] = tuple(names)
+            self._filtered_counts[pos] = filtered_count
+        return names
+
+    def __getitem__(self, pos):
+        entry = self._entry(pos)
+        if entry.nodetype == 'leaf':
+            return entry
+        else:
+            self._child_names(pos)
+            return TorrentFileDirectory(self._key(pos)[-1], tree=entry,
+                                        filtered_count=self._filtered_counts[pos])
+
+    def update(self, torrents):
+        """
+        Use the file trees of `torrents`, which must be the same torrents with the same files
+
+        Return set of indexes of top-level nodes with new values or `None` if
+        any torrents or files were added, removed or renamed.
+        """
+        filetrees = self._filetrees
+        if len(torrents) != len(filetrees):
+            return None
+
+        changed_tids = set()
+        for t in torrents:
+            tid = t['id']
+            old_filetree = filetrees.get(tid)
+            if old_filetree is None:
+                return None
+            new_filetree = t['files']
+            if new_filetree is not old_filetree:
+                filetrees[tid] = new_filetree
+                changed_tids.add(tid)
+        if not changed_tids:
+            return set()
+
+        # Positions of existing nodes are only valid if the entry names of all
+        # directories we looked into are still the same
+        changed_roots = set()
+        for i,(tid,rootname) in enumerate(self._roots):
+            if tid in changed_tids:
+                changed_roots.add(i)
+                if rootname not in filetrees[tid]:
                     return None
+        for pos,names in self._children.items():
+            if pos[0] in changed_roots:
+                try:
+                    directory = self._entry(pos)
+                except KeyError:
+                    return None
+                if directory.nodetype == 'leaf' or \
+                   len(directory) != len(names) + self._filtered_counts[pos] or \
+                   any(name not in directory for name in names):
+                    return None
+        return changed_roots
 
-            elif content.nodetype == 'parent':
-                # Recurse into directory entries (files and subdirectories)
-                tree = []
-                filtered_count = 0
-                content_sorted = humansorted(content.items())
-                for k,v in content_sorted:
-                    if v.nodetype == 'leaf':
-                        if not self._file_is_filtered(v):
-                            tree.append((v, None))
-                            nonlocal fcount
-                            fcount += 1
-                        else:
-                            filtered_count += 1
-                    elif v.nodetype == 'parent':
-                        dirnode = TorrentFileDirectory(name=k, tree=v)
-                        tree.append(create_tree(dirnode, v))
-
-                self._filtered_counts[node['id']] = filtered_count
-                node['name'] = TorrentFileDirectory.create_directory_name(node['name'], filtered_count)
-                return (node, tree or None)
-
-        fcount = 0
-        forest = []  # Multiple trees as siblings
-        for t in humansorted(torrents, key=lambda t: t['name']):
-            filetree = t['files']
-            filecount = len(tuple(filetree.files))
-            if filecount > 0:
-                nodetree = None
-                rootnodename = next(iter(filetree.keys()))
-                if len(tuple(filetree.directories)) == 0:
-                    # Single-file torrent
-                    if not self._file_is_filtered(filetree[rootnodename]):
-                        nodetree = (filetree[rootnodename], None)
-                else:
-                    # Torrent with directory structure
-                    # If we don't ignore the topmost node, the torrent itself is
-                    # displayed as a directory.
-                    content = filetree[rootnodename]
-                    rootnode = TorrentFileDirectory(rootnodename, tree=content)
-                    nodetree = create_tree(rootnode, content)
+    def key(self, pos):
+        """Key of the node at `pos`"""
+        return self._key(pos)
+
+    def position(self, key):
+        """Position of the node with `key` or `None` if it doesn't exist"""
+        tid, rootname, *names = key
+        try:
+            pos = (self._roots.index((tid, rootname)),)
+            for name in names:
+                pos += (self._child_names(pos).index(name),)
+        except ValueError:
+            return None
+        return pos
+
+    def is_directory(self, pos):
+        return self._entry(pos).nodetype == 'parent'
+
+    def is_collapsed(self, pos):
+        return self._key(pos) not in self._expanded
+
+    def set_collapsed(self, pos, collapsed):
+        if collapsed:
+            self._expanded.discard(self._key(pos))
+        else:
+            self._expanded.add(self._key(pos))
+
+    @property
+    def expanded(self):
+        """Keys of expanded directories"""
+        return frozenset(self._expanded)
 
-                if nodetree is not None:
-                    forest.append(nodetree)
+    def is_visible(self, pos):
+        """Whether `pos` exists and all its ancestors are expanded"""
+        try:
+            self._key(pos)
+        except IndexError:
+            return False
+        return not any(self.is_collapsed(pos[:i]) for i in range(1, len(pos)))
+
+    def child_positions(self, pos):
+        """Positions of all entries of the directory at `pos`, even if it is collapsed"""
+        return tuple(pos + (i,) for i in range(len(self._child_names(pos))))
+
+    # urwidtrees.Tree API
+
+    @staticmethod
+    def parent_position(pos):
+        return pos[:-1] if len(pos) > 1 else None
+
+    def first_child_position(self, pos):
+        if not self.is_collapsed(pos) and self._child_names(pos):
+            return pos + (0,)
+
+    def last_child_position(self, pos):
+        if not self.is_collapsed(pos):
+            names = self._child_names(pos)
+            if names:
+                return pos + (len(names) - 1,)
+
+    def next_sibling_position(self, pos):
+        if len(pos) == 1:
+            count = len(self._roots)
+        else:
+            count = len(self._child_names(pos[:-1]))
+        if pos[-1] + 1 < count:
+            return pos[:-1] + (pos[-1] + 1,)
+
+    @staticmethod
+    def prev_sibling_position(pos):
+        if pos[-1] > 0:
+            return pos[:-1] + (pos[-1] - 1,)
+
+    @staticmethod
+    def depth(pos):
+        return len(pos) - 1
 
-        self.filecount = fcount
-        return forest
+
+class FileTreeDecorator(ArrowTree):
+    """urwidtrees decorator for TorrentFiles and TorrentFileTrees"""
+
+    def __init__(self, torrents, keymap, table, ffilter, expanded=None):
+        self._filewidgetcls = keymap.wrap(FileItemWidget, context='file')
+        self._table = table
+        self._widgets = {}    # Map positions to FileItemWidgets
+        self._namecells = {}  # Map positions to Filename cells
+        super().__init__(FileTree(torrents, ffilter, expanded), indent=2)
+
+    def get_decorated(self, pos):
+        # Widgets are only created for nodes that are displayed (or marked)
+        # and kept until the tree is recreated
+        widget = self._widgets.get(pos)
+        if widget is None:
+            widget = self._widgets[pos] = self.decorate(pos, self[pos])
+        return widget
 
     def decorate(self, pos, data, is_first=True):
         # We can use the tree position as table ID
@@ -118,6 +273,9 @@ class FileTreeDecorator(ArrowTree):
         # structure.  But we also need the original update() method so we can
         # apply new data to the widget.  This is dirty but it works.
         if row.exists('name'):
+            tree = self._tree
+            namecell = self._namecells[pos] = row.name
+            namecell.collapsed = tree.is_directory(pos) and tree.is_collapsed(pos)
             update_method = row.name.update
             decowidget = super().decorate(pos, row.name, is_first=is_first)
             decowidget.update = update_method
@@ -125,34 +283,78 @@ class FileTreeDecorator(ArrowTree):
 
         # Wrap the whole row in a FileItemWidget with keymapping.  This also
         # applies all the other values besides the name (size, progress, etc).
-        file_widget = self._filewidgetcls(data, row)
-        self._widgets[data['id']] = file_widget
-        return file_widget
+        return self._filewidgetcls(data, row)
 
     def update(self, torrents):
-        widgets = self._widgets
-        for t in torrents:
-            # Update file nodes
-            for f in t['files'].files:
-                node_id = f['id']
-                # File might be filtered
-                if node_id in widgets:
-                    widgets[node_id].update(f)
-
-            # Update directory nodes
-            for name,content in t['files'].directories:
-                node_id = content.id
-                if node_id in widgets:
-                    filtered_count = self._filtered_counts[node_id]
-                    data = TorrentFileDirectory(name, tree=content,
-                                                filtered_count=filtered_count)
-                    widgets[node_id].update(data)
+        """
+        Apply new values from `torrents` to existing widgets
+
+        Return `False` if the tree must be recreated because torrents or files
+        were added, removed or renamed.
+        """
+        tree = self._tree
+        changed_roots = tree.update(torrents)
+        if changed_roots is None:
+            return False
+        if changed_roots:
+            for pos,widget in self._widgets.items():
+                if pos[0] in changed_roots:
+                    widget.update(tree[pos])
+        return True
+
+    def expand(self, pos):
+        """Show the entries of the directory at `pos`; return whether anything changed"""
+        return self._set_collapsed(pos, False)
+
+    def collapse(self, pos):
+        """Hide the entries of the directory at `pos`; return whether anything changed"""
+        return self._set_collapsed(pos, True)
+
+    def _set_collapsed(self, pos, collapsed):
+        tree = self._tree
+        if tree.is_directory(pos) and tree.is_collapsed(pos) != collapsed:
+            tree.set_collapsed(pos, collapsed)
+            namecell = self._namecells.get(pos)
+            if namecell is not None:
+                namecell.set_collapsed(collapsed)
+            return True
+        return False
+
+    @property
+    def expanded(self):
+        """Keys of expanded directories"""
+        return self._tree.expanded
+
+    def is_visible(self, pos):
+        """Whether `pos` exists and all its ancestors are expanded"""
+        return self._tree.is_visible(pos)
+
+    def key(self, pos):
+        """Key of the node at `pos`"""
+        return self._tree.key(pos)
+
+    def position(self, key):
+        """Position of the node with `key` or `None` if it doesn't exist"""
+        return self._tree.position(key)
+
+    def child_positions(self, pos):
+        """Positions of all entries of the directory at `pos`, even if it is collapsed"""
+        return self._tree.child_positions(pos)
+
+    @property
+    def filecount(self):
+        """Number of listed files"""
+        return self._tree.filecount
 
     @property
     def widgets(self):
         """Yield all file and directory widgets in this tree"""
         yield from self._widgets.values()
 
+    @property
+    def positions_and_widgets(self):
+        """Yield (position, widget) tuples of all file and directory widgets in this tree"""
+        yield from self._widgets.items()
 
 
 class FileItemWidget(ItemWidgetBase):
@@ -182,6 +384,7 @@ class FileListWidget(ListWidgetBase):
     keymap_context  = 'file'
     palette_name    = 'filelist'
     focusable_items = True
+    virtual_items   = False  # Rows are created by FileTreeDecorator
 
     def __init__(self, srvapi, keymap, tfilter, ffilter, columns=None, title=None):
         super().__init__(srvapi, keymap, columns=columns, title=title)
@@ -211,10 +414,15 @@ class FileListWidget(ListWidgetBase):
         self.clear()
         if torrents:
             self._torrents = torrents
-            self._create_filetree()
+            state, self._saved_state = self._saved_state, None
+            if state is None:
+                self._create_filetree()
+            else:
+                self._create_filetree(expanded=state[0])
+                self._restore_state(state)
             self._listbox._invalidate()
 
-    def _create_filetree(self):
+    def _create_filetree(self, expanded=None):
         # Combine primary and secondary file filters
         ffilter = self._ffilter
         sffilter = self._secondary_filter
@@ -223,13 +431,33 @@ class FileListWidget(ListWidgetBase):
         elif sffilter is not None:
             ffilter = ffilter & sffilter
 
-        self._filetree = FileTreeDecorator(self._torrents, self._keymap, self._table, ffilter)
+        self._table.clear()
+        self._filetree = FileTreeDecorator(self._torrents, self._keymap, self._table, ffilter,
+                                           expanded=expanded)
         self._listbox.body = urwidtrees.widgets.TreeListWalker(self._filetree)
 
+    def _recreate_filetree(self):
+        # Keep expanded directories, focus and marks
+        state = self._save_state() if hasattr(self, '_filetree') else None
+        self._marked.clear()
+        if state is None:
+            self._create_filetree()
+        else:
+            self._create_filetree(expanded=state[0])
+            self._restore_state(state)
+
+    @property
+    def _item_widgets(self):
+        if hasattr(self, '_filetree'):
+            return self._filetree.widgets
+        return ()
+
     def _update_listitems(self, torrents=()):
         if torrents:
-            self._filetree.update(torrents)
             self._torrents = torrents
+            if not self._filetree.update(torrents):
+                # Torrents or files were added, removed or renamed
+                self._recreate_filetree()
 
     @property
     def secondary_filter(self):
@@ -241,7 +469,7 @@ class FileListWidget(ListWidgetBase):
             self._secondary_filter = None
         else:
             self._secondary_filter = FileFilter(file_filter)
-        self._create_filetree()
+        self._recreate_filetree()
 
 
     @property
@@ -271,6 +499,70 @@ class FileListWidget(ListWidgetBase):
     def refresh(self):
         self._poller.poll()
 
+    def _subscribe(self):
+        self._poller.on_response(self._handle_files)
+
+    def _unsubscribe(self):
+        self._poller.off_response(self._handle_files)
+
+    def hibernate(self):
+        super().hibernate()
+        # Forget the torrents and the tree with all its widgets
+        if hasattr(self, '_filetree'):
+            del self._filetree
+        self._torrents = None
+
+    def _save_state(self):
+        # Positions may change while we are hibernating, but keys don't
+        if not self._initialized:
+            return None
+        ft = self._filetree
+        focus = self._listbox.body.get_focus()[1]
+        focused_key = ft.key(focus) if isinstance(focus, tuple) else None
+        marked_keys = frozenset(ft.key(pos) for pos,widget in ft.positions_and_widgets
+                                if widget in self._marked)
+        return (ft.expanded, focused_key, marked_keys)
+
+    def _restore_state(self, state):
+        _, focused_key, marked_keys = state
+        ft = self._filetree
+        lb = self._listbox
+        marked_positions = [pos for pos in map(ft.position, marked_keys) if pos is not None]
+        for pos in marked_positions:
+            widget = lb.body[pos]
+            widget.is_marked = True
+            self._marked.add(widget)
+
+        # Mark directories if all their children are marked, starting with the
+        # deepest ones
+        parent_positions = {pos[:i] for pos in marked_positions for i in range(1, len(pos))}
+        for parpos in sorted(parent_positions, key=len, reverse=True):
+            lb.body[parpos].is_marked = builtins.all(lb.body[childpos].is_marked
+                                                     for childpos in ft.child_positions(parpos))
+
+        if focused_key is not None:
+            pos = ft.position(focused_key)
+            if pos is not None and ft.is_visible(pos):
+                lb.focus_position = pos
+
+    def expand(self):
+        """Show the entries of the focused directory"""
+        if self._initialized:
+            lb = self._listbox
+            if self._filetree.expand(lb.focus_position):
+                lb.body.clear_cache()
+
+    def collapse(self):
+        """Hide the entries of the focused directory or focus its parent directory"""
+        if self._initialized:
+            ft = self._filetree
+            lb = self._listbox
+            pos = lb.focus_position
+            if ft.collapse(pos):
+                lb.body.clear_cache()
+            elif ft.parent_position(pos) is not None:
+                lb.focus_position = ft.parent_position(pos)
+
     @property
     def count(self):
         return self._filetree.filecount if hasattr(self, '_filetree') else 0
@@ -312,13 +604,18 @@ class FileListWidget(ListWidgetBase):
 
 
     def all_children(self, pos):
-        """Yield (position, widget) tuples of all sub-nodes (leaves and parents)"""
+        """
+        Yield (position, widget) tuples of all sub-nodes (leaves and parents)
+
+        Widgets are created for the sub-nodes of collapsed directories.
+        """
         ft = self._filetree
         lb = self._listbox
 
         def recurse(subpos):
             widget = lb.body[subpos]
-            if ft.is_leaf(subpos):
+            child_positions = ft.child_positions(subpos)
+            if not child_positions:
                 yield (subpos, widget)
             else:
                 # Yield sub-parent nodes, but not the starting node that was
@@ -326,10 +623,8 @@ class FileListWidget(ListWidgetBase):
                 if subpos != pos:
                     yield (subpos, widget)
 
-                new_subpos = ft.first_child_position(subpos)
-                while new_subpos is not None:
-                    yield from recurse(new_subpos)
-                    new_subpos = ft.next_sibling_position(new_subpos)
+                for childpos in child_positions:
+                    yield from recurse(childpos)
 
         yield from recurse(pos)
 
@@ -359,9 +654,10 @@ class FileListWidget(ListWidgetBase):
 
         if all:
             # Top ancestor node positions are (0,), (1,), (3,) etc
-            for pos in self._filetree.positions():
-                if len(pos) == 1:
-                    mark_leaves(pos, mark)
+            pos = self._filetree.root
+            while pos is not None:
+                mark_leaves(pos, mark)
+                pos = self._filetree.next_sibling_position(pos)
         else:
             mark_leaves(self._listbox.focus_position, mark)
         assert builtins.all(m.nodetype == 'leaf' for m in self._marked)
@@ -373,12 +669,8 @@ class FileListWidget(ListWidgetBase):
         # marked properly from previous runs.
 
         def all_children_marked(pos):
-            marked = True
-            childpos = self._filetree.first_child_position(pos)
-            while childpos is not None:
-                marked = marked and get_widget(childpos).is_marked
-                childpos = self._filetree.next_sibling_position(childpos)
-            return marked
+            return builtins.all(get_widget(childpos).is_marked
+                                for childpos in self._filetree.child_positions(pos))
 
         parpos = self._filetree.parent_position(self._listbox.focus_position)
         while parpos is not None:
@@ -42,11 +42,11 @@ class PeerListWidget(ListWidgetBase):
 
         # Create peer filter generator
         if pfilter is not None:
-            def filter_peers(peers):
-                yield from pfilter.apply(peers)
+            def filter_peers(torrent):
+                return torrent.filtered('peers', pfilter)
         else:
-            def filter_peers(peers):
-                yield from peers
+            def filter_peers(torrent):
+                return torrent['peers']
         self._maybe_filter_peers = filter_peers
 
         self._poller = self._srvapi.create_poller(
@@ -67,7 +67,7 @@ class PeerListWidget(ListWidgetBase):
             # Create list items our base widget can handle
             def peers_combined(torrents):
                 for t in torrents:
-                    yield from self._maybe_filter_peers(t['peers'])
+                    yield from self._maybe_filter_peers(t)
             self._data_dict = {p['id']:p for p in peers_combined(response.torrents)}
         self._invalidate()
 
@@ -79,6 +79,12 @@ class PeerListWidget(ListWidgetBase):
     def refresh(self):
         self._poller.poll()
 
+    def _subscribe(self):
+        self._poller.on_response(self._handle_peers)
+
+    def _unsubscribe(self):
+        self._poller.off_response(self._handle_peers)
+
     @property
     def sort(self):
         return self._sort
@@ -100,7 +106,7 @@ class PeerListWidget(ListWidgetBase):
             self._secondary_filter = PeerFilter(peer_filter)
         self._invalidate()
 
-    def _limit_items(self, peer_widgets):
+    def _hidden_ids(self, peer_widgets):
         # Combine primary and secondary peer filters
         pfilter = self._pfilter
         spfilter = self._secondary_filter
@@ -108,8 +114,4 @@ class PeerListWidget(ListWidgetBase):
             pfilter = spfilter
         elif spfilter is not None:
             pfilter = pfilter & spfilter
-
-        if pfilter is not None:
-            for pw in peer_widgets:
-                if not pfilter.match(pw.data):
-                    yield pw
+        return self._filtered_out_ids(pfilter, peer_widgets)
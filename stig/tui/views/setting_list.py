@@ -166,6 +166,7 @@ class SettingListWidget(ListWidgetBase):
     keymap_context  = 'setting'
     palette_name    = 'settinglist'
     focusable_items = True
+    virtual_items   = False  # Setting descriptions can span multiple rows
 
     def __init__(self, srvapi, keymap, sort=None, columns=None, title='Settings'):
         super().__init__(srvapi, keymap, columns=columns, sort=sort, title=title)
@@ -203,9 +204,5 @@ class SettingListWidget(ListWidgetBase):
             self._secondary_filter = SettingFilter(setting_filter)
         self._invalidate()
 
-    def _limit_items(self, setting_widgets):
-        sfilter = self._secondary_filter
-        if sfilter is not None:
-            for sw in setting_widgets:
-                if not sfilter.match(sw.data):
-                    yield sw
+    def _hidden_ids(self, setting_widgets):
+        return self._filtered_out_ids(self._secondary_filter, setting_widgets)
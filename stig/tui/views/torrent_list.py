@@ -45,6 +45,7 @@ class TorrentListWidget(ListWidgetBase):
         super().__init__(srvapi, keymap, columns=columns, sort=sort, title=title)
         self._tfilter = tfilter
         self._secondary_filter = None
+        self._generation = None  # Torrent cache generation of the last update
         self._register_request()
 
     @property
@@ -91,6 +92,15 @@ class TorrentListWidget(ListWidgetBase):
         self._data_dict = {t['id']:t for t in torrents}
         self._invalidate()
 
+    def _get_changed_keys(self):
+        # Torrents are updated in place by the cache, which also knows which
+        # keys changed since our previous update
+        since = self._generation
+        self._generation, changed, removed = self._srvapi.torrent.changes(since)
+        if since is None:
+            return None
+        return {t['id']:keys for t,keys in changed.items()}
+
     def clear(self):
         for w in self._listbox.body:
             w.data.clearcache()
@@ -99,6 +109,12 @@ class TorrentListWidget(ListWidgetBase):
     def refresh(self):
         self._srvapi.treqpool.poll()
 
+    def _subscribe(self):
+        self._register_request()
+
+    def _unsubscribe(self):
+        self._srvapi.treqpool.remove(self.id)
+
     @property
     def sort(self):
         return self._sort
@@ -129,9 +145,18 @@ class TorrentListWidget(ListWidgetBase):
         log.debug('Filtering %r torrents', self._secondary_filter)
         self._register_request()
 
-    def _limit_items(self, torrent_widgets):
-        f = self._secondary_filter
-        if f is not None:
-            for tw in torrent_widgets:
-                if not f.match(tw.data):
-                    yield tw
+    def _hidden_ids(self, torrent_widgets):
+        sfilter = self._secondary_filter
+        if sfilter is not None:
+            # Torrents that are not found in the search index can't match
+            candidate_ids = self._srvapi.torrent.find_candidates(sfilter)
+            if candidate_ids is not None:
+                candidates = []
+                hidden_ids = set()
+                for w in torrent_widgets:
+                    if w.id in candidate_ids:
+                        candidates.append(w)
+                    else:
+                        hidden_ids.add(w.id)
+                return frozenset(hidden_ids.union(self._filtered_out_ids(sfilter, candidates)))
+        return self._filtered_out_ids(sfilter, torrent_widgets)
@@ -140,6 +140,7 @@ class LastAnnounce(_COLUMNS['last-announce'], CellWidgetBase):
                   extras=('header',))
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['last-announce'].header),
                            style.attrs('header'))
+    time_dependent = True
 
 TUICOLUMNS['last-announce'] = LastAnnounce
 
@@ -149,6 +150,7 @@ class NextAnnounce(_COLUMNS['next-announce'], CellWidgetBase):
                   extras=('header',))
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['next-announce'].header),
                            style.attrs('header'))
+    time_dependent = True
 
 TUICOLUMNS['next-announce'] = NextAnnounce
 
@@ -158,6 +160,7 @@ class LastScrape(_COLUMNS['last-scrape'], CellWidgetBase):
                   extras=('header',))
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['last-scrape'].header),
                            style.attrs('header'))
+    time_dependent = True
 
 TUICOLUMNS['last-scrape'] = LastScrape
 
@@ -167,5 +170,6 @@ class NextScrape(_COLUMNS['next-scrape'], CellWidgetBase):
                   extras=('header',))
     header = urwid.AttrMap(ColumnHeaderWidget(**_COLUMNS['next-scrape'].header),
                            style.attrs('header'))
+    time_dependent = True
 
 TUICOLUMNS['next-scrape'] = NextScrape
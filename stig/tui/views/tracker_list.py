@@ -49,11 +49,11 @@ class TrackerListWidget(ListWidgetBase):
 
         # Create tracker filter generator
         if trkfilter is not None:
-            def filter_trackers(trackers):
-                yield from trkfilter.apply(trackers)
+            def filter_trackers(torrent):
+                return torrent.filtered('trackers', trkfilter)
         else:
-            def filter_trackers(trackers):
-                yield from trackers
+            def filter_trackers(torrent):
+                return torrent['trackers']
         self._maybe_filter_trackers = filter_trackers
 
         self._poller = self._srvapi.create_poller(
@@ -74,13 +74,19 @@ class TrackerListWidget(ListWidgetBase):
             # Create list items our base widget can handle
             def trackers_combined(torrents):
                 for t in torrents:
-                    yield from self._maybe_filter_trackers(t['trackers'])
+                    yield from self._maybe_filter_trackers(t)
             self._data_dict = {trk['id']:trk for trk in trackers_combined(response.torrents)}
         self._invalidate()
 
     def refresh(self):
         self._poller.poll()
 
+    def _subscribe(self):
+        self._poller.on_response(self._handle_trackers)
+
+    def _unsubscribe(self):
+        self._poller.off_response(self._handle_trackers)
+
     @property
     def sort(self):
         return self._sort
@@ -110,7 +116,7 @@ class TrackerListWidget(ListWidgetBase):
             self._secondary_filter = TrackerFilter(tracker_filter)
         self._invalidate()
 
-    def _limit_items(self, tracker_widgets):
+    def _hidden_ids(self, tracker_widgets):
         # Combine primary and secondary tracker filters
         trkfilter = self._trkfilter
         strkfilter = self._secondary_filter
@@ -118,11 +124,4 @@ class TrackerListWidget(ListWidgetBase):
             trkfilter = strkfilter
         elif strkfilter is not None:
             trkfilter = trkfilter & strkfilter
-
-        if trkfilter is not None:
-            for tw in tracker_widgets:
-                if not trkfilter.match(tw.data):
-                    log.debug('%r does not match %r', trkfilter, tw.data['domain'])
-                    yield tw
-                else:
-                    log.debug('%r does match %r', trkfilter, tw.data['domain'])
+        return self._filtered_out_ids(trkfilter, tracker_widgets)
@@ -9,6 +9,7 @@
 # GNU General Public License for more details
 # http://www.gnu.org/licenses/gpl-3.0.txt
 
+from collections import OrderedDict
 from types import SimpleNamespace
 
 from ._converter import DataSizeConverter
@@ -43,3 +44,83 @@ def cached_property(fget=None, *, after_creation=None):
         return _cached_property
     else:
         return _cached_property(fget)
+
+
+def _freeze(value):
+    # Subclasses of str may implement __eq__() and __hash__() in surprising
+    # ways (e.g. SortOrder in settings.defaults), so we use plain strings
+    if isinstance(value, str):
+        return str(value)
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    else:
+        return value
+
+class LRUCache():
+    """
+    Remember a limited number of recently used values
+
+    maxsize: Maximum number of cached values
+    """
+    _NOT_FOUND = object()
+
+    def __init__(self, maxsize=128):
+        self._maxsize = maxsize
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, create, cacheable=None):
+        """
+        Return cached value for `key` or cache and return `create()`
+
+        Strings in `key` are converted to `str` and lists to tuples.  If `key`
+        is not hashable, `create()` is returned without caching it.
+
+        cacheable: Callable that gets the return value of `create()` and
+                   returns whether it may be cached or `None` to cache all
+                   values
+        """
+        try:
+            key = _freeze(key)
+            value = self._cache.get(key, self._NOT_FOUND)
+        except TypeError:
+            return create()
+
+        if value is self._NOT_FOUND:
+            self._misses += 1
+            value = create()
+            if cacheable is None or cacheable(value):
+                self._cache[key] = value
+                if len(self._cache) > self._maxsize:
+                    self._cache.popitem(last=False)
+        else:
+            self._hits += 1
+            self._cache.move_to_end(key)
+        return value
+
+    def clear(self):
+        """Forget all cached values"""
+        self._cache.clear()
+
+    @property
+    def hits(self):
+        """How often a cached value was returned"""
+        return self._hits
+
+    @property
+    def misses(self):
+        """How often a value had to be created"""
+        return self._misses
+
+    @property
+    def maxsize(self):
+        """Maximum number of cached values"""
+        return self._maxsize
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __repr__(self):
+        return '<%s %d/%d, hits=%d, misses=%d>' % (type(self).__name__, len(self),
+                                                   self._maxsize, self._hits, self._misses)
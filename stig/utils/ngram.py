@@ -0,0 +1,89 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details
+# http://www.gnu.org/licenses/gpl-3.0.txt
+
+"""Index strings by their n-grams to find substrings quickly"""
+
+_EMPTY = frozenset()
+
+
+class NgramIndex():
+    """
+    Map keys to strings and find keys of strings that may contain a substring
+
+    Strings are casefolded, so lookups are case-insensitive and may return keys
+    of strings that don't contain the substring.  Substrings that are shorter
+    than `n` characters can't be looked up.
+    """
+
+    def __init__(self, n=3):
+        self._n = n
+        self._strings = {}  # Map keys to casefolded strings
+        self._postings = {}  # Map n-grams to sets of keys
+
+    def _ngrams(self, string):
+        n = self._n
+        return {string[i:i + n] for i in range(len(string) - n + 1)}
+
+    def update(self, key, string):
+        """Index `string` under `key`, replacing any previously indexed string"""
+        string = str(string).casefold()
+        old_string = self._strings.get(key)
+        if string == old_string:
+            return
+        elif old_string is not None:
+            self.remove(key)
+
+        self._strings[key] = string
+        postings = self._postings
+        for ngram in self._ngrams(string):
+            keys = postings.get(ngram)
+            if keys is None:
+                postings[ngram] = {key}
+            else:
+                keys.add(key)
+
+    def remove(self, key):
+        """Remove string indexed under `key` if there is one"""
+        string = self._strings.pop(key, None)
+        if string is not None:
+            postings = self._postings
+            for ngram in self._ngrams(string):
+                keys = postings[ngram]
+                keys.discard(key)
+                if not keys:
+                    del postings[ngram]
+
+    def candidates(self, substring):
+        """
+        Return set of keys of strings that may contain `substring`
+
+        Return `None` if `substring` is too short to be looked up.
+        """
+        ngrams = self._ngrams(str(substring).casefold())
+        if not ngrams:
+            return None
+        postings = self._postings
+        key_sets = sorted((postings.get(ngram, _EMPTY) for ngram in ngrams), key=len)
+        return set(key_sets[0]).intersection(*key_sets[1:])
+
+    def clear(self):
+        self._strings.clear()
+        self._postings.clear()
+
+    def __contains__(self, key):
+        return key in self._strings
+
+    def __len__(self):
+        return len(self._strings)
+
+    def __repr__(self):
+        return '<%s n=%d strings=%d ngrams=%d>' % (type(self).__name__, self._n,
+                                                   len(self._strings), len(self._postings))
@@ -135,10 +135,11 @@ class TorrentFileDirectory(dict):
     @staticmethod
     def _sum_size(tfiles, key):
         sizes = tuple(tfile[key] for tfile in tfiles)
-        # Preserve the original type (Float)
+        # Preserve the original type (Float), but add up plain floats because
+        # adding Floats creates a new instance for each addition
         first_size = sizes[0]
         start_value = type(first_size)(0, unit=first_size.unit, prefix=first_size.prefix)
-        return sum(sizes, start_value)
+        return start_value + sum(float(size) for size in sizes)
 
     @staticmethod
     def _sum_priority(tfiles):
@@ -1,3 +1,4 @@
+import asyncio
 from types import SimpleNamespace
 
 import asynctest
@@ -17,9 +18,12 @@ class FakeTransmissionRPC():
 
 
 class FakeRequestPoller():
-    def __init__(self, request, interval, *args, **kwargs):
+    def __init__(self, request, interval, *args, fingerprint=None, **kwargs):
         self.request = request
         self.interval = interval
+        self.fingerprint = fingerprint
+        self.prev_fingerprint = None
+        self.suppressed_callbacks = 0
 
     def on_response(self, callback, autoremove=True):
         self.cb_response = callback
@@ -27,8 +31,20 @@ class FakeRequestPoller():
     def on_error(self, callback, autoremove=True):
         self.cb_error = callback
 
+    def reset_fingerprint(self):
+        self.prev_fingerprint = None
+
     async def fake_response(self):
-        self.cb_response(await self.request())
+        response = await self.request()
+        if response is None:
+            self.prev_fingerprint = None
+        else:
+            fp = self.fingerprint(response)
+            if fp == self.prev_fingerprint:
+                self.suppressed_callbacks += 1
+                return
+            self.prev_fingerprint = fp
+        self.cb_response(response)
 
     async def start(self):
         pass
@@ -107,6 +123,7 @@ class TestStatusAPI(asynctest.TestCase):
 
         await self.api._poller_stats.fake_response()
         await self.api._poller_tcount.fake_response()
+        await asyncio.sleep(0)
         self.assertEqual(cb.calls, 1)
         status = cb.args[0][0]
         self.assertEqual(status.rate_down, 789)
@@ -122,7 +139,7 @@ class TestStatusAPI(asynctest.TestCase):
         self.torrent.fake_tlist = None
         await self.api._poller_stats.fake_response()
         await self.api._poller_tcount.fake_response()
-
+        await asyncio.sleep(0)
         self.assertEqual(cb.calls, 2)
         status = cb.args[0][0]
         self.assertEqual(status.rate_down, const.DISCONNECTED)
@@ -133,3 +150,42 @@ class TestStatusAPI(asynctest.TestCase):
         self.assertEqual(status.count.uploading, const.DISCONNECTED)
         self.assertEqual(status.count.downloading, const.DISCONNECTED)
         self.assertEqual(status.count.isolated, const.DISCONNECTED)
+
+    async def test_on_update_callback_is_not_called_if_nothing_changed(self):
+        cb = rsrc.FakeCallback('handle_info')
+        self.api.on_update(cb)
+        for _ in range(3):
+            await self.api._poller_stats.fake_response()
+            await self.api._poller_tcount.fake_response()
+            await asyncio.sleep(0)
+        self.assertEqual(cb.calls, 1)
+        self.assertEqual(self.api._poller_stats.suppressed_callbacks, 2)
+        self.assertEqual(self.api._poller_tcount.suppressed_callbacks, 2)
+
+        self.rpc.fake_stats['downloadSpeed'] = 790
+        await self.api._poller_stats.fake_response()
+        await self.api._poller_tcount.fake_response()
+        await asyncio.sleep(0)
+        self.assertEqual(cb.calls, 2)
+
+        # Counters that we don't provide are ignored
+        self.rpc.fake_stats['cumulative-stats'] = {'secondsActive': 1}
+        await self.api._poller_stats.fake_response()
+        await asyncio.sleep(0)
+        self.assertEqual(cb.calls, 2)
+
+    async def test_late_subscriber_gets_unchanged_status(self):
+        cb1 = rsrc.FakeCallback('handle_info')
+        self.api.on_update(cb1)
+        for _ in range(2):
+            await self.api._poller_stats.fake_response()
+            await self.api._poller_tcount.fake_response()
+            await asyncio.sleep(0)
+        self.assertEqual(cb1.calls, 1)
+
+        cb2 = rsrc.FakeCallback('handle_info')
+        self.api.on_update(cb2)
+        await self.api._poller_stats.fake_response()
+        await self.api._poller_tcount.fake_response()
+        await asyncio.sleep(0)
+        self.assertEqual(cb2.calls, 1)
@@ -1,10 +1,11 @@
 import os.path
+import unittest
 
 import asynctest
 
 import resources_aiotransmission as rsrc
 from stig.client import MAX_TORRENT_FILE_SIZE
-from stig.client.aiotransmission.api_torrent import TorrentAPI
+from stig.client.aiotransmission.api_torrent import TorrentAPI, _TorrentCache
 from stig.client.aiotransmission.rpc import TransmissionRPC
 from stig.client.aiotransmission.torrent import Torrent
 from stig.client.filters.torrent import TorrentFilter
@@ -13,6 +14,34 @@ assert os.path.exists(rsrc.TORRENTFILE)
 assert not os.path.exists(rsrc.TORRENTFILE_NOEXIST)
 
 
+class TestTorrentCache(unittest.TestCase):
+    def test_changes(self):
+        tcache = _TorrentCache()
+        tcache.update(({'id': 1, 'name': 'Foo'}, {'id': 2, 'name': 'Bar'}))
+        gen1, changed, removed = tcache.changes(None)
+        self.assertEqual(changed, {Torrent({'id': 1}): None, Torrent({'id': 2}): None})
+        self.assertEqual(removed, set())
+
+        tcache.update(({'id': 1, 'name': 'Foo', 'rateUpload': 5}, {'id': 2, 'name': 'Bar'}))
+        tcache.update(({'id': 3, 'name': 'Baz'},))
+        gen2, changed, removed = tcache.changes(gen1)
+        self.assertEqual(changed, {Torrent({'id': 1}): {'rate-up', 'status'},
+                                   Torrent({'id': 3}): None})
+        self.assertEqual(removed, set())
+
+        tcache.purge(existing_tids=(2, 3))
+        gen3, changed, removed = tcache.changes(gen2)
+        self.assertEqual(changed, {})
+        self.assertEqual(removed, {1})
+        self.assertEqual(tcache.changes(gen3), (gen3, {}, set()))
+
+    def test_get_existing(self):
+        tcache = _TorrentCache()
+        tcache.update(({'id': 1, 'name': 'Foo'}, {'id': 2, 'name': 'Bar'}))
+        self.assertEqual(tcache.get_existing({2, 3}), (Torrent({'id': 2}),))
+        self.assertEqual(tcache.get_existing(()), ())
+
+
 class TorrentAPITestCase(asynctest.TestCase):
     async def setUp(self):
         self.daemon = rsrc.FakeTransmissionDaemon()
@@ -87,6 +116,10 @@ class TestAddingTorrents(TorrentAPITestCase):
 
 
 class TestGettingTorrents(TorrentAPITestCase):
+    @property
+    def torrent_get_requests(self):
+        return [rq for rq in self.daemon.requests if rq.get('method') == 'torrent-get']
+
     async def test_get_all_torrents(self):
         self.daemon.response = rsrc.response_torrents(
             {'id': 1, 'name': 'Torrent1'},
@@ -160,6 +193,111 @@ class TestGettingTorrents(TorrentAPITestCase):
         self.assertEqual(response.msgs, ())
         self.assertEqual(response.errors, ('No matching torrents: =Nope',))
 
+    async def test_get_torrents_by_filter_with_pinned_ids(self):
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'name': 'Foo'},
+            {'id': 2, 'name': 'Bar'},
+            {'id': 3, 'name': 'Boo'},
+        )
+        response = await self.api.torrents(torrents=TorrentFilter('id=2|id=3&name~B'), keys=('name',))
+        self.assertEqual(response.success, True)
+        self.assertEqual(response.torrents,
+                         (Torrent({'id': 2, 'name': 'Bar'}),
+                          Torrent({'id': 3, 'name': 'Boo'})))
+        self.assertEqual(len(self.torrent_get_requests), 1)
+        self.assertEqual(set(self.torrent_get_requests[-1]['arguments']['ids']), {2, 3})
+
+        # Unpinned OR-part requires full list
+        response = await self.api.torrents(torrents=TorrentFilter('id=2|name~Foo'), keys=('name',))
+        self.assertEqual(response.success, True)
+        self.assertEqual(response.torrents,
+                         (Torrent({'id': 1, 'name': 'Foo'}),
+                          Torrent({'id': 2, 'name': 'Bar'})))
+        self.assertNotIn('ids', self.torrent_get_requests[-2]['arguments'])
+
+    async def test_get_torrents_by_filter_with_name_is_not_pinned_from_cache(self):
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'name': 'Foo'},
+            {'id': 2, 'name': 'Bar'},
+            {'id': 3, 'name': 'Boo'},
+        )
+        await self.api.torrents(torrents=TorrentFilter('name=Boo'), keys=('name',))
+
+        # A matching torrent was added after all torrents were cached
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'name': 'Foo'},
+            {'id': 2, 'name': 'Bar'},
+            {'id': 3, 'name': 'Boo'},
+            {'id': 4, 'name': 'Boo'},
+        )
+        self.daemon.requests.clear()
+        response = await self.api.torrents(torrents=TorrentFilter('name=Boo'), keys=('name',))
+        self.assertEqual(response.torrents, (Torrent({'id': 3, 'name': 'Boo'}),
+                                             Torrent({'id': 4, 'name': 'Boo'})))
+        self.assertNotIn('ids', self.torrent_get_requests[0]['arguments'])
+
+
+    async def test_get_torrents_by_filter_with_search_index(self):
+        self.api.search_index = True
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'name': 'Foo'},
+            {'id': 2, 'name': 'Bar'},
+            {'id': 3, 'name': 'Baz'},
+        )
+        await self.api.torrents(torrents=TorrentFilter('name~ba'), keys=('name',))
+
+        # The index is only used after the cache is updated because torrents
+        # may have been added or renamed
+        self.daemon.requests.clear()
+        response = await self.api.torrents(torrents=TorrentFilter('name~Baz|name=~Foo'), keys=('name',))
+        self.assertEqual(response.torrents, (Torrent({'id': 1, 'name': 'Foo'}),
+                                             Torrent({'id': 3, 'name': 'Baz'})))
+        self.assertEqual(len(self.torrent_get_requests), 2)
+        self.assertNotIn('ids', self.torrent_get_requests[0]['arguments'])
+        self.assertEqual(set(self.torrent_get_requests[1]['arguments']['ids']), {1, 3})
+
+        # Too short for the index
+        self.daemon.requests.clear()
+        await self.api.torrents(torrents=TorrentFilter('name~a'), keys=('name',))
+        self.assertNotIn('ids', self.torrent_get_requests[0]['arguments'])
+
+        # Paths are normalized before they are looked up
+        self.daemon.requests.clear()
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'name': 'Foo', 'downloadDir': '/data/movies'},
+            {'id': 2, 'name': 'Bar', 'downloadDir': '/data/music'},
+        )
+        response = await self.api.torrents(torrents=TorrentFilter('path~/data//movies/'),
+                                           keys=('name',))
+        self.assertEqual(response.torrents, (Torrent({'id': 1, 'name': 'Foo'}),))
+
+        # No candidates in the index
+        self.daemon.requests.clear()
+        response = await self.api.torrents(torrents=TorrentFilter('name~xyz'), keys=('name',))
+        self.assertEqual(response.torrents, ())
+        self.assertEqual(len(self.torrent_get_requests), 1)
+
+    async def test_get_torrents_by_filter_in_two_phases(self):
+        self.daemon.response = rsrc.response_torrents(
+            {'id': 1, 'name': 'Foo', 'rateDownload': 100, 'trackerStats': []},
+            {'id': 2, 'name': 'Bar', 'rateDownload': 0, 'trackerStats': []},
+            {'id': 3, 'name': 'Baz', 'rateDownload': 0, 'trackerStats': []},
+        )
+        await self.api.torrents(torrents=TorrentFilter('downloading|tracker~foo&name~a'),
+                                keys=('name',))
+        self.assertEqual(len(self.torrent_get_requests), 3)
+        phase1, phase2, final = (rq['arguments'] for rq in self.torrent_get_requests)
+        self.assertNotIn('ids', phase1)
+        self.assertNotIn('trackerStats', phase1['fields'])
+        self.assertEqual(set(phase2['ids']), {2, 3})
+        self.assertIn('trackerStats', phase2['fields'])
+        self.assertEqual(final['ids'], [1])
+
+        # Filters that need the same kind of keys are applied in one go
+        self.daemon.requests.clear()
+        await self.api.torrents(torrents=TorrentFilter('downloading|name~a'), keys=('name',))
+        self.assertEqual(len(self.torrent_get_requests), 2)
+
 
 class TestManipulatingTorrents(TorrentAPITestCase):
     async def setUp(self):
@@ -1,6 +1,12 @@
 import unittest
+from collections import OrderedDict, defaultdict, deque
+from unittest.mock import patch
 
 from stig.client.aiotransmission import torrent
+from stig.client.filters.file import FileFilter
+from stig.client.filters.peer import PeerFilter
+from stig.client.filters.tracker import TrackerFilter
+from stig.client.ttypes import TorrentPeer
 
 
 def test_all_dependencies_are_standard_keys():
@@ -73,6 +79,15 @@ class TestTorrent(unittest.TestCase):
         self.assertEqual(set(t), {'id', 'name', 'rate-down', 'hash',
                                   'time-created', '%verified'})
 
+    def test_update_returns_changed_keys(self):
+        t = torrent.Torrent({'id': 1, 'name': 'Foo', 'rateDownload': 0, 'rateUpload': 0})
+        self.assertEqual(t['rate-down'], 0)
+        self.assertEqual(t.update({'id': 1, 'name': 'Foo', 'rateDownload': 0}), set())
+        self.assertEqual(t.update({'id': 1, 'rateDownload': 10, 'rateUpload': 0}),
+                         {'rate-down', 'status'})
+        self.assertEqual(t['rate-down'], 10)
+        self.assertEqual(t.update({'id': 1, 'comment': 'Hello'}), {'comment'})
+
 class TestTorrentFileTree(unittest.TestCase):
     def test_update(self):
         raw = {'id': 1, 'name': 'Fake torrent', 'downloadDir': '/a/path',
@@ -100,3 +115,82 @@ class TestTorrentFileTree(unittest.TestCase):
         self.assertEqual(ft['Fake torrent']['file1']['size-downloaded'], 500)
         self.assertEqual(ft['Fake torrent']['subdir']['file2']['%downloaded'], 10)
         self.assertEqual(ft['Fake torrent']['subdir']['file2']['size-downloaded'], 200)
+
+    def test_filtered_files(self):
+        raw = {'id': 1, 'name': 'Fake torrent', 'downloadDir': '/a/path',
+               'fileStats': [{'bytesCompleted': 1000, 'priority': 0, 'wanted': True},
+                             {'bytesCompleted': 0, 'priority': 0, 'wanted': True},
+                             {'bytesCompleted': 0, 'priority': 1, 'wanted': False}],
+               'files': [{'bytesCompleted': 1000, 'length': 1000, 'name': 'Fake torrent/file1'},
+                         {'bytesCompleted': 0, 'length': 2000, 'name': 'Fake torrent/subdir/file2'},
+                         {'bytesCompleted': 0, 'length': 3000, 'name': 'Fake torrent/subdir/file3'}]}
+        t = torrent.Torrent(raw)
+        for ffilter in (FileFilter('complete'), FileFilter('size>1500'),
+                        FileFilter('path~subdir&wanted'), FileFilter('priority=off|name=file1')):
+            exp = tuple(f['id'] for f in ffilter.apply(t['files'].files))
+            ft = t.filtered('files', ffilter)
+            self.assertEqual(tuple(f['id'] for f in ft.files), exp)
+
+        ft = t.filtered('files', FileFilter('size>1500'))
+        self.assertEqual(tuple(ft['Fake torrent']), ('subdir',))
+        self.assertEqual(ft['Fake torrent'].filtered_count, 1)
+        self.assertEqual(ft['Fake torrent']['subdir'].filtered_count, 0)
+
+
+class TestFilteringRawItems(unittest.TestCase):
+    def setUp(self):
+        def raw_peer(address, progress, rate_up):
+            return {'address': address, 'port': 1234, 'clientName': 'Foo 1.0',
+                    'progress': progress, 'rateToPeer': rate_up, 'rateToClient': 0}
+
+        def raw_tracker(id, announce, state):
+            return {'id': id, 'tier': 0, 'announce': announce, 'scrape': announce,
+                    'announceState': state, 'scrapeState': 1,
+                    'hasAnnounced': True, 'lastAnnounceResult': 'Success',
+                    'hasScraped': False, 'lastScrapeResult': '',
+                    'downloadCount': 0, 'leecherCount': 0, 'seederCount': 0,
+                    'lastAnnounceTime': 0, 'lastScrapeTime': 0,
+                    'nextAnnounceTime': 0, 'nextScrapeTime': 0}
+
+        self.torrent = torrent.Torrent({
+            'id': 1, 'name': 'Foo', 'totalSize': 1000,
+            'peers': [raw_peer('1.2.3.4', 0.5, 0), raw_peer('1.2.3.5', 1, 100),
+                      raw_peer('1.2.3.6', 0.1, 200)],
+            'trackerStats': [raw_tracker(0, 'http://foo.example.org/announce', 1),
+                             raw_tracker(1, 'http://bar.example.org/announce', 3)],
+        })
+
+    def test_peers(self):
+        for pfilter in (PeerFilter('uploading'), PeerFilter('downloaded>400'),
+                        PeerFilter('host~.5|%downloaded<20'), PeerFilter('seeding&!uploading')):
+            exp = tuple(p['ip'] for p in pfilter.apply(self.torrent['peers']))
+            self.torrent.clearcache()
+            peers = self.torrent.filtered('peers', pfilter)
+            self.assertEqual(tuple(p['ip'] for p in peers), exp)
+            self.assertNotIn('peers', self.torrent._cache)
+
+    def test_trackers(self):
+        for trkfilter in (TrackerFilter('domain~foo'), TrackerFilter('status=announcing'),
+                          TrackerFilter('!error&tier=0')):
+            exp = tuple(trk['url-announce'] for trk in trkfilter.apply(self.torrent['trackers']))
+            self.torrent.clearcache()
+            trackers = self.torrent.filtered('trackers', trkfilter)
+            self.assertEqual(tuple(trk['url-announce'] for trk in trackers), exp)
+
+    def test_progress_of_filtered_out_peers_is_recorded(self):
+        progress_data = defaultdict(lambda: deque(maxlen=10))
+        with patch.object(TorrentPeer, '_PEER_PROGRESS_DATA', progress_data), \
+             patch.object(TorrentPeer, '_PEER_PROGRESS_BUCKETS', OrderedDict()):
+            peers = self.torrent.filtered('peers', PeerFilter('uploading'))
+        self.assertEqual(tuple(p['ip'] for p in peers), ('1.2.3.5', '1.2.3.6'))
+        # Peers that have downloaded everything don't need samples
+        self.assertEqual(set(progress_data), {(1, '1.2.3.4', 1234), (1, '1.2.3.6', 1234)})
+        self.assertEqual([samples[-1][1] for samples in progress_data.values()], [0.5, 0.1])
+
+    def test_only_matching_items_are_created(self):
+        with patch.object(TorrentPeer, '__init__', autospec=True,
+                          side_effect=TorrentPeer.__init__) as init:
+            peers = self.torrent.filtered('peers', PeerFilter('uploading'))
+        self.assertEqual(tuple(p['ip'] for p in peers), ('1.2.3.5', '1.2.3.6'))
+        self.assertEqual([call[1]['ip'] for call in init.call_args_list],
+                         ['1.2.3.5', '1.2.3.6'])
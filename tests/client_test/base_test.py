@@ -30,6 +30,19 @@ class TestFreeSpaceAPI(asynctest.ClockedTestCase):
         self.assertEqual(self.mock_settings.on_update.call_args_list,
                          [call(self.freespace._gather_info_wrapper)])
 
+    async def test_free_space_is_requested_at_every_interval(self):
+        self.get_free_space.return_value = 123
+        await self.freespace.start()
+        await self.advance(2.5)
+        self.assertEqual(self.get_free_space.call_args_list,
+                         [call('/foo'), call('/bar')] * 3)
+        self.assertEqual(self.update_cb.call_args_list, [call(self.freespace)])
+
+        self.get_free_space.return_value = 100
+        await self.advance(1)
+        self.assertEqual(self.update_cb.call_args_list, [call(self.freespace), call(self.freespace)])
+        await self.freespace.stop()
+
     async def test_info_is_updated(self):
         self.get_free_space.side_effect = (123, 456)
         await self.freespace._gather_info_wrapper_coro()
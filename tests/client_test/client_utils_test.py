@@ -5,6 +5,8 @@ import unittest
 from datetime import datetime
 from unittest.mock import patch
 
+from natsort import humansorted
+
 from stig.client import utils
 
 
@@ -80,6 +82,26 @@ class TestSmartCmpStr(unittest.TestCase):
         self.assertTrue('foo' in utils.SmartCmpStr('Foo'))
         self.assertFalse('Foo' in utils.SmartCmpStr('foo'))
 
+    def test_other_SmartCmpStr(self):
+        self.assertTrue(utils.SmartCmpStr('Foo') == utils.SmartCmpStr('foo'))
+        self.assertFalse(utils.SmartCmpStr('foo') == utils.SmartCmpStr('Foo'))
+        self.assertTrue(utils.SmartCmpStr('foo') > utils.SmartCmpStr('Foo'))
+        self.assertTrue(utils.SmartCmpStr('oo') in utils.SmartCmpStr('FOO'))
+        self.assertFalse(utils.SmartCmpStr('OO') in utils.SmartCmpStr('foo'))
+
+    def test_casefold(self):
+        s = utils.SmartCmpStr('FooBar')
+        self.assertNotIn('_casefolded', vars(s))
+        self.assertEqual(s.casefold(), 'foobar')
+        self.assertIs(s.casefold(), s.casefold())
+        self.assertEqual(utils.SmartCmpPath('/Foo/../Bar/').casefold(), '/bar')
+
+    def test_natsort_key(self):
+        names = [utils.SmartCmpStr(n) for n in ('foo10', 'Foo9', 'bar', 'foo1')]
+        self.assertEqual(sorted(names, key=lambda n: n.natsort_key),
+                         humansorted(names))
+        self.assertIs(names[0].natsort_key, names[0].natsort_key)
+
 
 class TestURL(unittest.TestCase):
     def test_empty_string(self):
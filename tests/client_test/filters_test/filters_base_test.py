@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from stig.client.filters.base import BoolFilterSpec, CmpFilterSpec, Filter, FilterChain
@@ -372,6 +373,15 @@ class TestFilter_apply(unittest.TestCase):
             for item,result in zip(items, results):
                 self.assertEqual(FooFilter(filter_str).match(item), result)
 
+    def test_converted_value(self):
+        class FooFilter(Filter):
+            BOOLEAN_FILTERS = {'everything': BoolFilterSpec(None)}
+            COMPARATIVE_FILTERS = {'v': CmpFilterSpec(value_type=int, value_getter=lambda i: i['v'])}
+        self.assertEqual(FooFilter('v=3').value, '3')
+        self.assertEqual(FooFilter('v=3').converted_value, 3)
+        self.assertIs(FooFilter('v').converted_value, None)
+        self.assertIs(FooFilter('everything').converted_value, None)
+
 
 class TestFilterChain_parser(unittest.TestCase):
     def setUp(self):
@@ -397,6 +407,34 @@ class TestFilterChain_parser(unittest.TestCase):
             FooFilterChain()
         self.assertEqual(str(cm.exception), 'Attribute "filterclass" must be set to a Filter subclass')
 
+    def test_parsed_filters_are_cached(self):
+        hits, misses = self.f.parse_cache.hits, self.f.parse_cache.misses
+        f1 = self.f('b1|c~foo')
+        f2 = self.f('b1|c~foo')
+        self.assertIsNot(f2, f1)
+        self.assertIs(f2.chains, f1.chains)
+        self.assertIsNot(f2._planner, f1._planner)
+        self.assertIs(self.f(['b1', 'c~foo']).chains, self.f(('b1', 'c~foo')).chains)
+        self.assertNotEqual(self.f('b1|c~bar'), f1)
+        self.assertEqual(self.f.parse_cache.hits - hits, 2)
+        self.assertEqual(self.f.parse_cache.misses - misses, 3)
+
+    def test_volatile_filters_are_not_cached(self):
+        class VolatileFilter(Filter):
+            BOOLEAN_FILTERS = {}
+            COMPARATIVE_FILTERS = {'c': CmpFilterSpec(value_type=str, value_getter=lambda i: i['v'],
+                                                      volatile=True)}
+            DEFAULT_FILTER = 'c'
+
+        class VolatileFilterChain(FilterChain):
+            filterclass = VolatileFilter
+
+        misses = VolatileFilterChain.parse_cache.misses
+        f1 = VolatileFilterChain('c=foo')
+        f2 = VolatileFilterChain('c=foo')
+        self.assertIsNot(f2.chains, f1.chains)
+        self.assertEqual(VolatileFilterChain.parse_cache.misses - misses, 2)
+
     def test_passing_FilterChain_instance(self):
         self.assertEqual(str(self.f(self.f('ci=x'))), 'ci=x')
 
@@ -503,13 +541,38 @@ class TestFilterChain_parser(unittest.TestCase):
         f1 = self.f('b1') & self.f('c~foo')
         self.assertEqual(f1, self.f('b1&c~foo'))
         f2 = self.f('b2|ci~bar')
-        self.assertEqual(f1 & f2, self.f('b1&c~foo&b2|ci~bar'))
-        self.assertEqual(f1 & f2, self.f('ci~bar|b2&b1&c~foo'))
+        self.assertEqual(f1 & f2, self.f('b1&c~foo&b2|b1&c~foo&ci~bar'))
+        self.assertEqual(f1 & f2, self.f('ci~bar&b1&c~foo|b2&b1&c~foo'))
 
     def test_combining_catch_all_filter(self):
         self.assertEqual(self.f('b2') & self.f('c~foo') | self.f('everything'), self.f('everything'))
-        self.assertEqual(self.f('b2') & self.f('everything') | self.f('c~foo'), self.f('everything'))
-        self.assertEqual(self.f('b2') | self.f('everything') & self.f('c~foo'), self.f('everything'))
+        self.assertEqual(self.f('b2') & self.f('everything') | self.f('c~foo'), self.f('b2|c~foo'))
+        self.assertEqual(self.f('b2') | self.f('everything') & self.f('c~foo'), self.f('b2|c~foo'))
+        self.assertEqual(self.f('b2') & self.f('!everything') | self.f('c~foo'), self.f('c~foo'))
+        self.assertEqual(self.f('b2') | self.f(''), self.f(''))
+        self.assertEqual(self.f('b2') & self.f(''), self.f('b2'))
+
+    def test_combining_simplifies_duplicates(self):
+        self.assertEqual(str(self.f('b1&b2') & self.f('b2')), 'b1&b2')
+        self.assertEqual(str(self.f('b1|b2') | self.f('b2|b1')), 'b1|b2')
+        self.assertEqual(str(self.f('b1&b2') | self.f('b2&b1')), 'b1&b2')
+
+    def test_combining_simplifies_absorbed_terms(self):
+        self.assertEqual(str(self.f('b1') | self.f('b1&b2')), 'b1')
+        self.assertEqual(str(self.f('b1&b2|c~foo') | self.f('b2')), '~foo|b2')
+        self.assertEqual(str(self.f('b1|b2') & self.f('b1')), 'b1')
+
+    def test_combining_removes_contradictions(self):
+        self.assertEqual(str(self.f('b1|b2') & self.f('!b1')), 'b2&!b1')
+        self.assertEqual(str(self.f('b1') & self.f('!b1')), 'b1&!b1')
+
+    def test_inverting(self):
+        self.assertEqual(~self.f('b1'), self.f('!b1'))
+        self.assertEqual(~self.f('b1&c~foo'), self.f('!b1|!c~foo'))
+        self.assertEqual(~self.f('b1|c~foo'), self.f('!b1&!c~foo'))
+        self.assertEqual(~self.f('b1&b2|c~foo'), self.f('!b1&!c~foo|!b2&!c~foo'))
+        self.assertEqual(~~self.f('b1&b2|c~foo'), self.f('b1&b2|c~foo'))
+        self.assertEqual(~self.f(''), self.f('!everything'))
 
 
 class TestFilterChain_apply(unittest.TestCase):
@@ -574,3 +637,114 @@ class TestFilterChain_apply(unittest.TestCase):
             self.assertEqual(self.f('!mod3').match(item), item['v'] % 3 != 0)
             self.assertEqual(self.f('n_abs>0').match(item), abs(item['v']) > 0)
             self.assertEqual(self.f('n_abs!>0').match(item), abs(item['v']) <= 0)
+
+    def test_match_returns_bool(self):
+        class FooFilter(Filter):
+            BOOLEAN_FILTERS = {'v': BoolFilterSpec(lambda i: i['v'])}
+            COMPARATIVE_FILTERS = {'r': CmpFilterSpec(value_type=str, value_getter=lambda i: i['s'])}
+
+        class FooFilterChain(FilterChain):
+            filterclass = FooFilter
+
+        for filter_str in ('v', '!v', 'v&v&v', 'v|v|v', 'r=~o', 'r!=~o'):
+            for item in ({'v': 0, 's': 'foo'}, {'v': 'x', 's': 'bar'}):
+                self.assertIsInstance(FooFilterChain(filter_str).match(item), bool)
+
+    def test_multiple_values(self):
+        class FooFilter(Filter):
+            COMPARATIVE_FILTERS = {'t': CmpFilterSpec(value_type=str, value_getter=lambda i: iter(i['t']))}
+
+        class FooFilterChain(FilterChain):
+            filterclass = FooFilter
+
+        items = ({'t': ('foo', 'bar')}, {'t': ('baz',)}, {'t': ()})
+        self.assertEqual(tuple(FooFilterChain('t=bar').apply(items)), items[:1])
+        self.assertEqual(tuple(FooFilterChain('t!=bar').apply(items)), items[1:])
+        self.assertEqual(tuple(FooFilterChain('t~ba&t!~r').apply(items)), items[1:2])
+        self.assertEqual(tuple(FooFilterChain('t').apply(items)), items[:2])
+
+    def test_apply_ids(self):
+        items = tuple({'id': i, 'v': i} for i in range(-5, 6))
+        self.assertEqual(self.f('mod2&positive').apply_ids(items), {0, 2, 4})
+        self.assertEqual(self.f('mod2&positive').apply_ids(items, invert=True),
+                         {-5, -4, -3, -2, -1, 1, 3, 5})
+        self.assertEqual(self.f('mod5').apply_ids(items, key='v'), {-5, 0, 5})
+        marked = {1, 2, 3}
+        self.assertEqual(marked & self.f('mod3').apply_ids(items), {3})
+
+
+class TestFilterChain_planner(unittest.TestCase):
+    def setUp(self):
+        self.calls = calls = {'cheap': 0, 'expensive': 0}
+
+        def cheap(i):
+            calls['cheap'] += 1
+            return i['v'] % 10 == 0
+
+        def expensive(i):
+            calls['expensive'] += 1
+            return i['v'] >= 0
+
+        class FooFilter(Filter):
+            BOOLEAN_FILTERS = {'mod2': BoolFilterSpec(lambda i: i['v'] % 2 == 0),
+                               'mod3': BoolFilterSpec(lambda i: i['v'] % 3 == 0),
+                               'mod5': BoolFilterSpec(lambda i: i['v'] % 5 == 0),
+                               'cheap': BoolFilterSpec(cheap),
+                               'expensive': BoolFilterSpec(expensive, cost=10)}
+            COMPARATIVE_FILTERS = {'n': CmpFilterSpec(value_type=int, value_getter=lambda i: i['v']),
+                                   's': CmpFilterSpec(value_type=str, value_getter=lambda i: str(i['v']))}
+
+        class FooFilterChain(FilterChain):
+            filterclass = FooFilter
+
+        self.f = FooFilterChain
+        self.items = tuple({'v': v} for v in range(-500, 500))
+
+    @staticmethod
+    def naive_match(fchain, item):
+        return any(all(f.match(item) for f in AND_chain) for AND_chain in fchain.chains)
+
+    def test_cost_estimates(self):
+        filterclass = self.f.filterclass
+        self.assertLess(filterclass('mod2').cost, filterclass('n>3').cost)
+        self.assertLess(filterclass('n>3').cost, filterclass('s~3').cost)
+        self.assertLess(filterclass('s~3').cost, filterclass('s=~3').cost)
+        self.assertLess(filterclass('s=~3').cost, filterclass('expensive').cost)
+
+    def test_reordering_matches_naive_evaluator(self):
+        rng = random.Random(0)
+        names = ('mod2', '!mod2', 'mod3', '!mod5', 'n>100', 'n<=-250', 's~7', 's=~^-?1', 'expensive')
+        for _ in range(50):
+            fchain = self.f('|'.join('&'.join(rng.sample(names, rng.randint(1, 4)))
+                                     for _ in range(rng.randint(1, 4))))
+            exp = tuple(item for item in self.items if self.naive_match(fchain, item))
+            # First run learns the selectivity, second run uses it
+            self.assertEqual(tuple(fchain.apply(self.items)), exp, str(fchain))
+            self.assertEqual(tuple(fchain.apply(self.items)), exp, str(fchain))
+            for item in self.items[:50]:
+                self.assertEqual(fchain.match(item), self.naive_match(fchain, item))
+
+    def test_selective_filters_are_evaluated_first(self):
+        fchain = self.f('expensive&cheap')
+        self.assertEqual(str(fchain), 'expensive&cheap')
+        list(fchain.apply(self.items))
+        self.calls.update(cheap=0, expensive=0)
+        list(fchain.apply(self.items))
+        self.assertEqual(self.calls['cheap'], len(self.items))
+        self.assertEqual(self.calls['expensive'], len(self.items) // 10)
+
+    def test_likely_AND_chains_are_evaluated_first(self):
+        fchain = self.f('mod5&mod3|mod2')
+        list(fchain.apply(self.items))
+        self.assertEqual(fchain._planner.order[0], (self.f.filterclass('mod2'),))
+
+    def test_match_partial(self):
+        def cheap(f):
+            return f.name != 'expensive'
+
+        fchain = self.f('mod2|mod3&expensive')
+        self.assertIs(fchain.match_partial({'v': 2}, cheap), True)
+        self.assertIs(fchain.match_partial({'v': 3}, cheap), None)
+        self.assertIs(fchain.match_partial({'v': 5}, cheap), False)
+        self.assertIs(fchain.match_partial({'v': 3}, lambda f: True), True)
+        self.assertIs(self.f('').match_partial({'v': 5}, cheap), True)
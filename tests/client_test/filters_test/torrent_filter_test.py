@@ -1,8 +1,9 @@
 import unittest
 
 from filter_helpers import HelpersMixin
+from stig.client.filters.torrent import TorrentFilter as TorrentFilterChain
 from stig.client.filters.torrent import _SingleFilter as TorrentFilter
-from stig.client.utils import Status
+from stig.client.utils import Status, Timestamp
 
 
 class TestTorrentFilter(unittest.TestCase, HelpersMixin):
@@ -272,3 +273,80 @@ class TestTorrentFilter(unittest.TestCase, HelpersMixin):
         self.check_timestamp_filter(TorrentFilter, default_sign=-1,
                                     filter_names=('completed', 'tcmp'),
                                     key='time-completed')
+
+
+class FakeTorrent(dict):
+    def __hash__(self):
+        return self['id']
+
+
+class FakeTorrentSource():
+    def __init__(self, *torrents):
+        self.torrents = {t['id']: FakeTorrent(t) for t in torrents}
+        self.generation = 0
+        self.changed = {}
+        self.removed = set()
+        self.requested = []
+
+    def change(self, tid, **values):
+        self.torrents[tid].update(values)
+        self.changed[tid] = set(values)
+
+    def changes(self, since):
+        self.requested.append(since)
+        if since is None:
+            changed = dict.fromkeys(self.torrents.values())
+        else:
+            changed = {self.torrents[tid]: keys for tid,keys in self.changed.items()}
+        self.generation += 1
+        self.changed = {}
+        return self.generation, changed, self.removed
+
+
+class TestTorrentFilterChain(unittest.TestCase):
+    def test_apply_incremental(self):
+        source = FakeTorrentSource({'id': 1, 'name': 'Foo', 'comment': ''},
+                                   {'id': 2, 'name': 'Bar', 'comment': ''},
+                                   {'id': 3, 'name': 'Baz', 'comment': ''})
+        tfilter = TorrentFilterChain('name~Ba')
+        self.assertEqual(set(tfilter.apply_incremental(source)), {2, 3})
+
+        source.change(1, name='Bam')
+        source.change(2, name='Foo')
+        self.assertEqual(set(tfilter.apply_incremental(source)), {1, 3})
+
+        # Changes to keys that are not needed are ignored
+        source.torrents[3]['name'] = 'Foo'
+        source.change(3, comment='Hello')
+        self.assertEqual(set(tfilter.apply_incremental(source)), {1, 3})
+
+        source.removed = {1}
+        self.assertEqual(set(tfilter.apply_incremental(source)), {3})
+        self.assertEqual(source.requested, [None, 1, 2, 3])
+
+    def test_apply_incremental_keeps_state_per_source(self):
+        source1 = FakeTorrentSource({'id': 1, 'name': 'Foo'}, {'id': 2, 'name': 'Bar'})
+        source2 = FakeTorrentSource({'id': 3, 'name': 'Baz'})
+        tfilter = TorrentFilterChain('name~Ba')
+        self.assertEqual(set(tfilter.apply_incremental(source1)), {2})
+        self.assertEqual(set(tfilter.apply_incremental(source2)), {3})
+        self.assertEqual(set(tfilter.apply_incremental(source1)), {2})
+        self.assertEqual(set(tfilter.apply_incremental(source2)), {3})
+        self.assertEqual(source1.requested, [None, 1])
+        self.assertEqual(source2.requested, [None, 1])
+
+    def test_apply_incremental_returns_unchanging_mapping(self):
+        source = FakeTorrentSource({'id': 1, 'name': 'Foo'}, {'id': 2, 'name': 'Bar'})
+        tfilter = TorrentFilterChain('name~Ba')
+        matches = tfilter.apply_incremental(source)
+        source.change(1, name='Bam')
+        self.assertEqual(set(tfilter.apply_incremental(source)), {1, 2})
+        self.assertEqual(set(matches), {2})
+
+    def test_volatile_filters_are_always_applied_to_all_torrents(self):
+        source = FakeTorrentSource({'id': 1, 'time-added': Timestamp(0)})
+        tfilter = TorrentFilterChain('added<1d')
+        self.assertTrue(tfilter.volatile)
+        self.assertEqual(set(tfilter.apply_incremental(source)), set())
+        self.assertEqual(set(tfilter.apply_incremental(source)), set())
+        self.assertEqual(source.requested, [None, None])
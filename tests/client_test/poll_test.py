@@ -3,7 +3,7 @@ import asyncio
 import asynctest
 
 from stig.client.errors import AuthError, ConnectionError
-from stig.client.poll import RequestPoller
+from stig.client.poll import PollScheduler, RequestPoller
 
 
 class TestRequestPoller(asynctest.ClockedTestCase):
@@ -217,3 +217,348 @@ class TestRequestPoller(asynctest.ClockedTestCase):
         await self.advance(0)
         self.assertEqual(self.mock_request_calls, 3)
         await rp.stop()
+
+
+class TestRequestPollerFinishingOngoingRequests(asynctest.ClockedTestCase):
+    async def test_changing_request_does_not_cancel_ongoing_request(self):
+        status = []
+
+        async def request1():
+            await asyncio.sleep(5)
+            status.append('request1')
+            return 'response1'
+
+        async def request2():
+            status.append('request2')
+            return 'response2'
+
+        responses = []
+        rp = RequestPoller(request1, interval=10, finish_ongoing=True)
+        rp.on_response(responses.append, autoremove=False)
+        await rp.start()
+        await self.advance(1)
+        rp.set_request(request2)
+        await self.advance(0)
+        self.assertEqual(status, [])
+        await self.advance(5)
+        # Response from outdated request is discarded and the new request is
+        # made immediately
+        self.assertEqual(status, ['request1', 'request2'])
+        self.assertEqual(responses, ['response2'])
+        await rp.stop()
+
+    async def test_reconciling_response(self):
+        async def request1():
+            await asyncio.sleep(5)
+            return 'response1'
+
+        async def request2():
+            return 'response2'
+
+        class MyPoller(RequestPoller):
+            async def _reconcile_response(self, request, response):
+                return '%s, reconciled' % (response,)
+
+        responses = []
+        rp = MyPoller(request1, interval=10, finish_ongoing=True)
+        rp.on_response(responses.append, autoremove=False)
+        await rp.start()
+        await self.advance(1)
+        rp.set_request(request2)
+        await self.advance(5)
+        self.assertEqual(responses, ['response1, reconciled'])
+        await self.advance(10)
+        self.assertEqual(responses, ['response1, reconciled', 'response2'])
+        await rp.stop()
+
+    async def test_manual_polling_during_ongoing_request(self):
+        calls = 0
+
+        async def request():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(5)
+            return calls
+
+        responses = []
+        rp = RequestPoller(request, interval=10, finish_ongoing=True)
+        rp.on_response(responses.append, autoremove=False)
+        await rp.start()
+        await self.advance(1)
+        rp.poll()
+        await self.advance(5)
+        self.assertEqual(responses, [1])
+        self.assertEqual(calls, 2)
+        await self.advance(5)
+        self.assertEqual(responses, [1, 2])
+        self.assertEqual(calls, 2)
+        await rp.stop()
+
+
+class TestPollScheduler(asynctest.ClockedTestCase):
+    def make_request(self, name, delay, log):
+        async def request():
+            log.append((name, 'sent', self.loop.time()))
+            await asyncio.sleep(delay)
+            return name
+        return request
+
+    async def test_requests_are_sent_concurrently_and_delivered_together(self):
+        log = []
+        sched = PollScheduler(interval=10)
+        rp1 = RequestPoller(self.make_request('a', 1, log), scheduler=sched)
+        rp2 = RequestPoller(self.make_request('b', 3, log), scheduler=sched)
+        rp1.on_response(lambda r: log.append((r, 'received', self.loop.time())), autoremove=False)
+        rp2.on_response(lambda r: log.append((r, 'received', self.loop.time())), autoremove=False)
+        await rp1.start()
+        await rp2.start()
+        self.assertEqual((rp1.running, rp2.running), (True, True))
+        await self.advance(5)
+        self.assertEqual(log, [('a', 'sent', 0), ('b', 'sent', 0),
+                               ('a', 'received', 3), ('b', 'received', 3)])
+        log.clear()
+        await self.advance(10)
+        self.assertEqual(log, [('a', 'sent', 10), ('b', 'sent', 10),
+                               ('a', 'received', 13), ('b', 'received', 13)])
+        await rp1.stop()
+        await rp2.stop()
+        self.assertEqual((rp1.running, rp2.running), (False, False))
+
+    async def test_manual_polling_only_polls_wanted_poller(self):
+        log = []
+        sched = PollScheduler(interval=10)
+        rp1 = RequestPoller(self.make_request('a', 0, log), scheduler=sched)
+        rp2 = RequestPoller(self.make_request('b', 0, log), scheduler=sched)
+        await rp1.start()
+        await rp2.start()
+        await self.advance(1)
+        log.clear()
+        rp1.poll()
+        await self.advance(1)
+        self.assertEqual(log, [('a', 'sent', 1)])
+        log.clear()
+        await self.advance(9)
+        self.assertEqual(log, [('a', 'sent', 10), ('b', 'sent', 10)])
+        await rp1.stop()
+        await rp2.stop()
+
+    async def test_stopped_poller_does_not_get_response(self):
+        log = []
+        responses = []
+        sched = PollScheduler(interval=10)
+        rp1 = RequestPoller(self.make_request('a', 2, log), scheduler=sched)
+        rp2 = RequestPoller(self.make_request('b', 2, log), scheduler=sched)
+        rp1.on_response(responses.append, autoremove=False)
+        rp2.on_response(responses.append, autoremove=False)
+        await rp1.start()
+        await rp2.start()
+        await self.advance(1)
+        await rp1.stop()
+        self.assertEqual(responses, [None])
+        await self.advance(2)
+        self.assertEqual(responses, [None, 'b'])
+        await rp2.stop()
+
+    async def test_changing_interval(self):
+        log = []
+        sched = PollScheduler(interval=10)
+        rp = RequestPoller(self.make_request('a', 0, log), scheduler=sched)
+        await rp.start()
+        await self.advance(1)
+        sched.interval = 2
+        await self.advance(4)
+        self.assertEqual([t for _,_,t in log], [0, 1, 3, 5])
+        await rp.stop()
+
+    async def test_slow_request_does_not_delay_other_pollers(self):
+        log = []
+        sched = PollScheduler(interval=10)
+        rp1 = RequestPoller(self.make_request('a', 0.5, log), scheduler=sched)
+        rp2 = RequestPoller(self.make_request('b', 15, log), scheduler=sched)
+        rp1.on_response(lambda r: log.append((r, 'received', self.loop.time())), autoremove=False)
+        rp2.on_response(lambda r: log.append((r, 'received', self.loop.time())), autoremove=False)
+        await rp1.start()
+        await rp2.start()
+        await self.advance(18)
+        self.assertEqual(log, [('a', 'sent', 0), ('b', 'sent', 0),
+                               ('a', 'received', 10),
+                               ('a', 'sent', 10), ('a', 'received', 10.5),
+                               ('b', 'received', 15)])
+        await rp1.stop()
+        await rp2.stop()
+
+    async def test_manual_polling_during_slow_request(self):
+        log = []
+        sched = PollScheduler(interval=1)
+        rp = RequestPoller(self.make_request('a', 2.8, log), scheduler=sched, finish_ongoing=True)
+        rp.on_response(lambda r: log.append((r, 'received', self.loop.time())), autoremove=False)
+        await rp.start()
+        await self.advance(1.2)
+        rp.poll()
+        await self.advance(1.7)
+        self.assertEqual(log, [('a', 'sent', 0), ('a', 'received', 2.8), ('a', 'sent', 2.8)])
+        await rp.stop()
+
+    async def test_broken_poller_is_stopped(self):
+        async def request():
+            raise RuntimeError('Boom')
+
+        exceptions = []
+        self.loop.set_exception_handler(lambda loop, context: exceptions.append(context['exception']))
+        sched = PollScheduler(interval=10)
+        rp = RequestPoller(request, scheduler=sched)
+        await rp.start()
+        await self.advance(1)
+        self.assertEqual([str(e) for e in exceptions], ['Boom'])
+        self.assertNotIn(rp, sched)
+        self.assertFalse(rp.running)
+        await rp.start()
+        self.assertIn(rp, sched)
+        await rp.stop()
+
+    async def test_unhashable_pollers(self):
+        class UnhashablePoller(RequestPoller):
+            __hash__ = None
+
+            def __eq__(self, other):
+                return True
+
+        log = []
+        responses = []
+        sched = PollScheduler(interval=10)
+        rp1 = UnhashablePoller(self.make_request('a', 0, log), scheduler=sched)
+        rp2 = UnhashablePoller(self.make_request('b', 0, log), scheduler=sched)
+        rp1.on_response(responses.append, autoremove=False)
+        rp2.on_response(responses.append, autoremove=False)
+        await rp1.start()
+        await rp2.start()
+        await self.advance(1)
+        self.assertEqual(sorted(responses), ['a', 'b'])
+        await rp1.stop()
+        self.assertEqual((rp1.running, rp2.running), (False, True))
+        await rp2.stop()
+
+
+class TestRequestPollerFingerprint(asynctest.ClockedTestCase):
+    async def test_unchanged_responses_are_not_passed_to_callbacks(self):
+        responses = iter(({'a': 1}, {'a': 1}, {'a': 2}, {'a': 2}, {'a': 1}))
+
+        async def request():
+            return next(responses)
+
+        received = []
+        rp = RequestPoller(request, interval=1, fingerprint=True)
+        rp.on_response(received.append, autoremove=False)
+        await rp.start()
+        await self.advance(4.5)
+        self.assertEqual(received, [{'a': 1}, {'a': 2}, {'a': 1}])
+        self.assertEqual(rp.suppressed_callbacks, 2)
+        await rp.stop()
+
+    async def test_errors_reset_fingerprint(self):
+        responses = iter(({'a': 1}, ConnectionError('foo'), {'a': 1}))
+
+        async def request():
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        received = []
+        errors = []
+        rp = RequestPoller(request, interval=1, fingerprint=True)
+        rp.on_response(received.append, autoremove=False)
+        rp.on_error(errors.append, autoremove=False)
+        await rp.start()
+        await self.advance(2.5)
+        self.assertEqual(received, [{'a': 1}, None, {'a': 1}])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(rp.suppressed_callbacks, 0)
+        await rp.stop()
+
+    async def test_custom_fingerprint(self):
+        responses = iter(({'a': 1, 'b': 1}, {'a': 1, 'b': 2}, {'a': 2, 'b': 2}))
+
+        async def request():
+            return next(responses)
+
+        received = []
+        rp = RequestPoller(request, interval=1, fingerprint=lambda r: r['a'])
+        rp.on_response(received.append, autoremove=False)
+        await rp.start()
+        await self.advance(2.5)
+        self.assertEqual(received, [{'a': 1, 'b': 1}, {'a': 2, 'b': 2}])
+        self.assertEqual(rp.suppressed_callbacks, 1)
+        await rp.stop()
+
+    async def test_new_callback_gets_unchanged_response(self):
+        async def request():
+            return {'a': 1}
+
+        received1, received2 = [], []
+        rp = RequestPoller(request, interval=1, fingerprint=True)
+        rp.on_response(received1.append, autoremove=False)
+        await rp.start()
+        await self.advance(1.5)
+        self.assertEqual(received1, [{'a': 1}])
+        self.assertEqual(rp.suppressed_callbacks, 1)
+
+        rp.on_response(received2.append, autoremove=False)
+        rp.poll()
+        await self.advance(0)
+        self.assertEqual(received2, [{'a': 1}])
+        self.assertEqual(rp.suppressed_callbacks, 1)
+        await rp.stop()
+
+    async def test_poll_passes_unchanged_response_to_callbacks(self):
+        async def request():
+            return {'a': 1}
+
+        received = []
+        rp = RequestPoller(request, interval=1, fingerprint=True)
+        rp.on_response(received.append, autoremove=False)
+        await rp.start()
+        await self.advance(1.5)
+        self.assertEqual(received, [{'a': 1}])
+        rp.poll()
+        await self.advance(0)
+        self.assertEqual(received, [{'a': 1}, {'a': 1}])
+        self.assertEqual(rp.suppressed_callbacks, 1)
+        await rp.stop()
+
+
+class TestRequestPollerCallbacksChanged(asynctest.ClockedTestCase):
+    async def test_callbacks_changed(self):
+        class Receiver():
+            def handle(self, response):
+                pass
+
+        async def request():
+            pass
+
+        calls = []
+        rp = RequestPoller(request)
+        rp.on_callbacks_changed(lambda poller: calls.append(poller.has_callbacks), autoremove=False)
+        receiver = Receiver()
+        rp.on_response(receiver.handle)
+        self.assertEqual(calls, [True])
+        del receiver
+        self.assertEqual(calls, [True])
+        await asyncio.sleep(0)
+        self.assertEqual(calls, [True, False])
+
+    async def test_removing_callback(self):
+        async def request():
+            pass
+
+        calls = []
+        rp = RequestPoller(request)
+        rp.on_callbacks_changed(lambda poller: calls.append(poller.has_callbacks), autoremove=False)
+
+        def cb(response):
+            pass
+
+        rp.on_response(cb)
+        self.assertEqual(calls, [True])
+        rp.off_response(cb)
+        self.assertEqual(calls, [True, False])
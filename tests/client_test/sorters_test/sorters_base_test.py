@@ -174,3 +174,61 @@ class TestSorterBase(unittest.TestCase):
 
         srted = self.sortercls(('!bar',)).apply(items, item_getter=item_getter)
         self.assertEqual(tuple(obj.id for obj in srted), (1, 2, 3))
+
+    def test_parsed_instances_are_cached(self):
+        self.assertIs(self.sortercls(('foo', '!bar')), self.sortercls(['foo', '!bar']))
+        self.assertIsNot(self.sortercls(('foo', '!bar')), self.sortercls(('foo', 'bar')))
+
+    def test_keys_are_computed_once_per_item(self):
+        calls = []
+
+        def key(item):
+            calls.append(item['id'])
+            return item['foo']
+
+        class TestSorter(SorterBase):
+            DEFAULT_SORT = 'foo'
+            SORTSPECS = {'foo': SortSpec(key, description='foo'),
+                         'bar': SortSpec(lambda item: item['bar'], description='bar')}
+
+        items = [{'id': i, 'foo': i % 3, 'bar': -i} for i in range(10)]
+        sorted_items = TestSorter(('!bar',)).apply(items)
+        self.assertEqual(sorted(calls), list(range(10)))
+        self.assertEqual(tuple(i['id'] for i in sorted_items), tuple(range(10)))
+
+    def test_sorting_iterables(self):
+        items = {1: {'id': 1, 'foo': 'b'}, 2: {'id': 2, 'foo': 'a'}}
+        items_sorted = self.sortercls(('foo',)).apply(items.values())
+        self.assertEqual(tuple(i['id'] for i in items_sorted), (2, 1))
+
+    def test_mixed_sort_directions_match_sequential_sorting(self):
+        rng = random.Random(0)
+
+        class TestSorter(SorterBase):
+            SORTSPECS = {name: SortSpec(lambda item, n=name: item[n], description=name)
+                         for name in ('a', 'b', 'c')}
+
+        items = [{'id': i, 'a': rng.randint(0, 2), 'b': rng.randint(0, 2), 'c': rng.randint(0, 2)}
+                 for i in range(100)]
+        for sortstrings in (('a', '!b'), ('!a', '!b', 'c'), ('a', 'b', '!c'), ('!c',)):
+            exp = list(items)
+            for sortstring in sortstrings:
+                name = sortstring.lstrip('!')
+                exp.sort(key=lambda item: item[name], reverse=sortstring.startswith('!'))
+            self.assertEqual(TestSorter(sortstrings).apply(items), exp)
+
+    def test_sort_key(self):
+        rng = random.Random(0)
+        items = [{'id': i, 'foo': rng.randint(0, 3), 'bar': rng.randint(0, 3)} for i in range(100)]
+        for sortstrings in (('foo',), ('!foo',), ('foo', '!bar'), ('!foo', 'bar'), ('!bar', '!foo')):
+            sorter = self.sortercls(sortstrings)
+            self.assertEqual(sorted(items, key=sorter.sort_key), sorter.apply(items))
+
+    def test_limit(self):
+        rng = random.Random(0)
+        items = [{'id': i, 'foo': rng.randint(0, 3), 'bar': rng.randint(0, 3)} for i in range(100)]
+        for sortstrings in (('foo',), ('!foo',), ('foo', '!bar')):
+            sorter = self.sortercls(sortstrings)
+            for limit in (0, 1, 10, 99, 100, 200):
+                self.assertEqual(sorter.apply(items, limit=limit), sorter.apply(items)[:limit])
+                self.assertEqual(sorter.apply(items, limit=-limit), sorter.apply(items)[-limit:] if limit else [])
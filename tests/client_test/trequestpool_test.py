@@ -23,15 +23,17 @@ class FakeTorrentAPI():
         self.exc = None
         self.tlist = FAKE_TORRENTS
         self.delay = 0
+        self.requests = []
 
     async def torrents(self, torrents=None, keys='ALL'):
+        self.requests.append((torrents, set(keys)))
         if self.delay:
             await asyncio.sleep(self.delay)
         self.calls += 1
         self.arg_torrents = torrents
         self.arg_keys = keys
         if self.exc is None:
-            return Response(success=False, torrents=self.tlist)
+            return Response(success=True, torrents=self.tlist)
         else:
             raise self.exc
 
@@ -231,3 +233,54 @@ class TestTorrentRequestPool(asynctest.ClockedTestCase):
         self.assertEqual(self.api.calls, apicalls + 1)
 
         await self.rp.stop()
+
+
+class TestTorrentRequestPoolFinishingOngoingRequests(asynctest.ClockedTestCase):
+    async def setUp(self):
+        self.api = FakeTorrentAPI()
+        srvapi = SimpleNamespace(torrent=self.api)
+        self.rp = TorrentRequestPool(srvapi, finish_ongoing=True)
+
+    async def test_missing_keys_are_requested_for_unchanged_subscribers(self):
+        self.api.delay = 5
+        await self.rp.start()
+        cb = FakeCallback()
+        self.rp.register('cb', cb, keys=('name',))
+        await self.advance(1)
+        self.assertEqual(self.api.requests, [(None, {'name'})])
+
+        # Subscriber wants another key while request is ongoing
+        self.rp.register('cb', cb, keys=('name', 'rate-up'))
+        await self.advance(4)
+        self.assertEqual(cb.calls, 0)
+        self.assertEqual(self.api.requests, [(None, {'name'}),
+                                             ((1, 2, 3), {'rate-up'})])
+        await self.advance(5)
+        self.assertEqual(cb.calls, 1)
+        self.assertEqual(cb.args, FAKE_TORRENTS)
+        self.assertEqual(len(self.api.requests), 2)
+        await self.rp.stop()
+
+    async def test_new_subscribers_get_followup_request(self):
+        self.api.delay = 5
+        await self.rp.start()
+        foo = Subscriber('name~foo', 'name')
+        self.rp.register('foo', foo.callback, keys=foo.keys, tfilter=foo.tfilter)
+        await self.advance(1)
+        bar = Subscriber('name~bar', 'name')
+        self.rp.register('bar', bar.callback, keys=bar.keys, tfilter=bar.tfilter)
+        await self.advance(4)
+
+        # First request was for foo only
+        self.assertEqual(foo.callback.calls, 1)
+        self.assertEqual(tuple(foo.callback.args), (FAKE_TORRENTS[0],))
+        self.assertEqual(bar.callback.calls, 0)
+
+        # Follow-up request is made immediately
+        self.assertEqual(len(self.api.requests), 2)
+        self.assertEqual(self.api.requests[-1][0], (foo + bar).tfilter)
+        await self.advance(5)
+        self.assertEqual(foo.callback.calls, 2)
+        self.assertEqual(bar.callback.calls, 1)
+        self.assertEqual(tuple(bar.callback.args), (FAKE_TORRENTS[1],))
+        await self.rp.stop()
@@ -60,3 +60,44 @@ class TestTorrentFilePriority(unittest.TestCase):
 
         for _ in range(10):
             self.assertEqual(sorted(shuffle(prios)), prios)
+
+
+class TestTorrentPeerProgressData(unittest.TestCase):
+    def setUp(self):
+        self.TorrentPeer = ttypes.TorrentPeer
+        self.TorrentPeer._PEER_PROGRESS_DATA.clear()
+        self.TorrentPeer._PEER_PROGRESS_BUCKETS.clear()
+
+    def tearDown(self):
+        self.TorrentPeer._PEER_PROGRESS_DATA.clear()
+        self.TorrentPeer._PEER_PROGRESS_BUCKETS.clear()
+
+    def add_sample(self, peer_id, now, progress):
+        self.TorrentPeer._prune_peer_progress_data(now)
+        samples = self.TorrentPeer._PEER_PROGRESS_DATA[peer_id]
+        self.TorrentPeer._add_peer_progress_sample(peer_id, samples, now, progress)
+
+    def test_stale_peers_are_pruned_when_bucket_expires(self):
+        max_age = self.TorrentPeer._MAX_PEER_PROGRESS_SAMPLE_AGE
+        self.add_sample('a', 0, 0.1)
+        self.add_sample('b', 0, 0.1)
+        self.add_sample('b', max_age / 2, 0.2)
+        self.add_sample('c', max_age + 60, 0.1)
+        self.assertEqual(set(self.TorrentPeer._PEER_PROGRESS_DATA), {'b', 'c'})
+        self.add_sample('c', max_age * 2, 0.2)
+        self.assertEqual(set(self.TorrentPeer._PEER_PROGRESS_DATA), {'c'})
+
+    def test_old_samples_are_removed_from_active_peers(self):
+        max_age = self.TorrentPeer._MAX_PEER_PROGRESS_SAMPLE_AGE
+        self.add_sample('a', 0, 0.1)
+        self.add_sample('a', 10, 0.2)
+        self.add_sample('a', max_age + 5, 0.3)
+        self.assertEqual(list(self.TorrentPeer._PEER_PROGRESS_DATA['a']),
+                         [(10, 0.2), (max_age + 5, 0.3)])
+
+    def test_peers_without_progress_are_not_stored(self):
+        self.TorrentPeer._guess_peer_rate_and_eta('a', 0.0, 1000)
+        self.TorrentPeer._guess_peer_rate_and_eta('b', 1.0, 1000)
+        self.assertEqual(dict(self.TorrentPeer._PEER_PROGRESS_DATA), {})
+        self.TorrentPeer._guess_peer_rate_and_eta('a', 0.1, 1000)
+        self.assertEqual([p for t,p in self.TorrentPeer._PEER_PROGRESS_DATA['a']], [0.1])
@@ -116,10 +116,13 @@ def mock_select_torrents(self, *args, **kwargs):
 
 
 class MockTorrentSorter(MockTorrentFilter):
-    def apply(self, torrents):
+    def apply(self, torrents, limit=None):
         if hasattr(self, 'raises'):
             raise self.raises
         self.applied = torrents
+        self.limit = limit
+        if limit is not None:
+            return torrents[:limit] if limit >= 0 else torrents[limit:]
         return torrents
 
 def mock_get_torrent_sorter(self, *args, **kwargs):
@@ -303,6 +303,28 @@ class TestListTorrentsCmd(CommandTestCase):
     async def test_sort_and_filter(self):
         await self.do(['-s', 'name,size', 'downloading', 'uploading'], errors=())
 
+    async def do_limit(self, args):
+        self.srvapi.torrent.response = Response(success=True, errors=(), msgs=(), torrents=(
+            MockTorrent(id=1, name='Some Torrent'),
+            MockTorrent(id=2, name='Another Torrent')
+        ))
+        return await self.execute(ListTorrentsCmd, *args)
+
+    async def test_limit(self):
+        process = await self.do_limit(['--limit', '1'])
+        self.assertEqual(process.mock_tsorter.limit, 1)
+        self.assert_stdout('Some Torrent')
+
+    async def test_negative_limit(self):
+        process = await self.do_limit(['-l', '-1'])
+        self.assertEqual(process.mock_tsorter.limit, -1)
+        self.assert_stdout('Another Torrent')
+
+    async def test_invalid_limit(self):
+        process = await self.do_limit(['--limit', 'foo'])
+        self.assertEqual(process.success, False)
+        self.assert_stderr("%s: Argument --limit/-l: invalid int value: 'foo'" % ListTorrentsCmd.name)
+
     async def test_invalid_filter(self):
         def bad_select_torrents(self, *args, **kwargs):
             raise ValueError('Nope!')
@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+
+import urwid
+
+from stig.tui.mainloop import MainLoop
+
+
+class FakeScreen(urwid.BaseScreen):
+    def __init__(self):
+        super().__init__()
+        self._started = True
+        self.drawn = []
+
+    def hook_event_loop(self, event_loop, callback):
+        pass
+
+    def get_cols_rows(self):
+        return (20, 1)
+
+    def draw_screen(self, size, canvas):
+        self.drawn.append(canvas)
+
+
+class TestMainLoop(unittest.TestCase):
+    def setUp(self):
+        self.text = urwid.Text('foo')
+        self.screen = FakeScreen()
+        self.keys = []
+        self.orig_aioloop = asyncio.get_event_loop()
+        self.aioloop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.aioloop)
+        self.loop = MainLoop(urwid.Filler(self.text), screen=self.screen,
+                             event_loop=urwid.AsyncioEventLoop(loop=self.aioloop),
+                             unhandled_input=self.keys.append, fps=10)
+
+    def tearDown(self):
+        self.aioloop.close()
+        asyncio.set_event_loop(self.orig_aioloop)
+
+    def run_for(self, seconds):
+        self.aioloop.run_until_complete(asyncio.sleep(seconds))
+
+    def test_fps(self):
+        self.assertEqual(self.loop.fps, 10)
+        self.loop.fps = 4
+        self.assertEqual(self.loop.fps, 4)
+
+    def test_invalidations_within_one_frame_are_drawn_together(self):
+        for i in range(50):
+            self.text.set_text(str(i))
+            self.loop.entering_idle()
+        self.run_for(0.05)
+        self.assertEqual(len(self.screen.drawn), 1)
+
+        # The next frame is drawn when the frame interval has passed
+        for i in range(50):
+            self.text.set_text(str(i + 50))
+            self.loop.entering_idle()
+        self.run_for(0.02)
+        self.assertEqual(len(self.screen.drawn), 1)
+        self.run_for(0.1)
+        self.assertEqual(len(self.screen.drawn), 2)
+        self.assertEqual(self.screen.drawn[-1].text, [b'99                  '])
+
+        # Nothing is drawn without invalidations
+        self.run_for(0.15)
+        self.assertEqual(len(self.screen.drawn), 2)
+
+    def test_changing_fps_changes_frame_interval(self):
+        self.loop.fps = 50
+        for _ in range(3):
+            self.loop.entering_idle()
+            self.run_for(0.03)
+        self.assertEqual(len(self.screen.drawn), 3)
+
+    def test_invalid_fps(self):
+        for fps in (0, -1):
+            with self.assertRaises(ValueError):
+                self.loop.fps = fps
+        self.assertEqual(self.loop.fps, 10)
+
+    def test_frame_times_are_recorded_for_new_canvases(self):
+        self.assertEqual(self.loop.frame_times, ())
+        self.loop.draw_screen()
+        self.assertEqual(len(self.loop.frame_times), 1)
+        self.loop.draw_screen()
+        self.assertEqual(len(self.loop.frame_times), 1)
+        self.text.set_text('bar')
+        self.loop.draw_screen()
+        self.assertEqual(len(self.loop.frame_times), 2)
+        self.assertTrue(all(t >= 0 for t in self.loop.frame_times))
+
+    def test_input_is_drawn_immediately(self):
+        self.loop.process_input(['x'])
+        self.assertEqual(self.keys, ['x'])
+        self.assertEqual(len(self.screen.drawn), 1)
@@ -0,0 +1,52 @@
+import unittest
+
+import urwid
+
+from stig.tui.table import Table
+
+
+class Cell(urwid.Text):
+    header = urwid.Text('')
+    width = 5
+
+    def __init__(self):
+        super().__init__('')
+
+
+class TestTable(unittest.TestCase):
+    def setUp(self):
+        self.table = Table(foo=Cell, bar=Cell)
+        self.table.columns = ('foo', 'bar')
+
+    def test_register(self):
+        self.table.register('a')
+        self.table.register('b')
+        self.assertEqual(self.table.member_ids, ('a', 'b'))
+        self.assertEqual(self.table.get_row('a').names, ['foo', 'bar'])
+        self.assertIsNot(self.table.get_row('a'), self.table.get_row('b'))
+
+    def test_unregistered_rows_are_reused(self):
+        self.table.register('a')
+        row = self.table.get_row('a')
+        self.table.unregister('a')
+        self.assertEqual(self.table.member_ids, ())
+        with self.assertRaises(KeyError):
+            self.table.get_row('a')
+
+        self.table.register('b')
+        self.assertIs(self.table.get_row('b'), row)
+        self.table.register('c')
+        self.assertIsNot(self.table.get_row('c'), row)
+
+    def test_unregister_unknown_row(self):
+        self.table.unregister('a')
+        self.assertEqual(self.table.member_ids, ())
+
+    def test_changing_columns_discards_unregistered_rows(self):
+        self.table.register('a')
+        row = self.table.get_row('a')
+        self.table.unregister('a')
+        self.table.columns = ('bar',)
+        self.table.register('b')
+        self.assertIsNot(self.table.get_row('b'), row)
+        self.assertEqual(self.table.get_row('b').names, ['bar'])
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 
 import urwid
@@ -513,3 +514,62 @@ class TestTabsKeyPress(unittest.TestCase):
         self.check(tab_pos=1, content_pos=None, edit_pos=0)
         self.tabs.keypress(self.size, 'left')
         self.check(tab_pos=0, content_pos=0, edit_pos=0)
+
+
+class HibernatingText(urwid.Text):
+    hibernated = False
+
+    def hibernate(self):
+        self.hibernated = True
+
+
+class TestTabsHibernation(unittest.TestCase):
+    def setUp(self):
+        self.orig_loop = asyncio.get_event_loop()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.contents = [HibernatingText('Tab one'), HibernatingText('Tab two')]
+        self.tabs = Tabs((urwid.Text('Tab1'), self.contents[0]),
+                         (urwid.Text('Tab2'), self.contents[1]),
+                         hibernate_delay=0.01)
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(self.orig_loop)
+
+    def wait(self, seconds=0.02):
+        self.loop.run_until_complete(asyncio.sleep(seconds))
+
+    def test_unfocused_tab_is_hibernated(self):
+        self.assertEqual(self.tabs.focus_position, 1)
+        self.tabs.focus_position = 0
+        self.wait()
+        self.assertEqual([c.hibernated for c in self.contents], [False, True])
+
+    def test_focusing_tab_cancels_hibernation(self):
+        self.tabs.focus_position = 0
+        self.tabs.focus_position = 1
+        self.wait()
+        self.assertEqual([c.hibernated for c in self.contents], [True, False])
+
+    def test_tab_loaded_in_background_is_hibernated(self):
+        content = HibernatingText('Tab three')
+        self.tabs.insert(urwid.Text('Tab3'), content, focus=False)
+        self.wait()
+        self.assertEqual(content.hibernated, True)
+        self.assertEqual(self.contents[1].hibernated, False)
+
+    def test_removed_tab_is_not_hibernated(self):
+        self.tabs.focus_position = 0
+        self.tabs.remove(1)
+        self.wait()
+        self.assertEqual([c.hibernated for c in self.contents], [False, False])
+
+    def test_changing_hibernate_delay(self):
+        self.tabs.hibernate_delay = 0
+        self.tabs.focus_position = 0
+        self.wait()
+        self.assertEqual([c.hibernated for c in self.contents], [False, False])
+        self.tabs.hibernate_delay = 0.01
+        self.wait()
+        self.assertEqual([c.hibernated for c in self.contents], [False, True])
@@ -0,0 +1,42 @@
+import unittest
+
+from stig.utils.ngram import NgramIndex
+
+
+class TestNgramIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = NgramIndex(n=3)
+        self.index.update(1, 'Foo Bar')
+        self.index.update(2, 'foobar')
+        self.index.update(3, 'Bar Baz')
+
+    def test_candidates(self):
+        self.assertEqual(self.index.candidates('foo'), {1, 2})
+        self.assertEqual(self.index.candidates('bar'), {1, 2, 3})
+        self.assertEqual(self.index.candidates('Bar B'), {3})
+        self.assertEqual(self.index.candidates('nope'), set())
+
+    def test_candidates_are_superset_of_matches(self):
+        # "foo bar" contains "o b" and " ba", but not "o ba"
+        self.index.update(4, 'foo b ba')
+        self.assertEqual(self.index.candidates('o ba'), {1, 4})
+
+    def test_substring_too_short(self):
+        self.assertIsNone(self.index.candidates('fo'))
+        self.assertIsNone(self.index.candidates(''))
+
+    def test_update(self):
+        self.index.update(2, 'Baz')
+        self.assertEqual(self.index.candidates('foo'), {1})
+        self.assertEqual(self.index.candidates('baz'), {2, 3})
+        self.assertEqual(len(self.index), 3)
+
+    def test_remove(self):
+        self.index.remove(1)
+        self.index.remove(1)
+        self.assertNotIn(1, self.index)
+        self.assertEqual(self.index.candidates('bar'), {2, 3})
+        self.index.remove(2)
+        self.index.remove(3)
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index._postings, {})
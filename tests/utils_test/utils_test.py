@@ -30,3 +30,62 @@ class Test_cached_property(unittest.TestCase):
             self.assertEqual(x.foo, 'bar')
         foo.assert_called_once_with()
         callback.assert_called_once_with(x)
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = utils.LRUCache(maxsize=10)
+        create = MagicMock(side_effect=lambda: object())
+        obj = cache.get(('foo', 1), create)
+        self.assertIs(cache.get(('foo', 1), create), obj)
+        self.assertIsNot(cache.get(('foo', 2), create), obj)
+        self.assertEqual(create.call_count, 2)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 2))
+
+    def test_least_recently_used_value_is_removed(self):
+        cache = utils.LRUCache(maxsize=2)
+        a = cache.get('a', lambda: 'A')
+        cache.get('b', lambda: 'B')
+        self.assertIs(cache.get('a', lambda: 'new A'), a)
+        cache.get('c', lambda: 'C')
+        self.assertEqual(cache.get('a', lambda: 'new A'), 'A')
+        self.assertEqual(cache.get('b', lambda: 'new B'), 'new B')
+
+    def test_lists_are_converted_to_tuples(self):
+        cache = utils.LRUCache()
+        cache.get(['a', ['b', 'c']], lambda: 'foo')
+        self.assertEqual(cache.get(('a', ('b', 'c')), lambda: 'bar'), 'foo')
+
+    def test_str_subclasses_are_converted_to_str(self):
+        class WeirdStr(str):
+            def __eq__(self, other):
+                return True
+
+            def __hash__(self):
+                return 0
+
+        cache = utils.LRUCache()
+        cache.get(WeirdStr('a'), lambda: 'foo')
+        self.assertEqual(cache.get('b', lambda: 'bar'), 'bar')
+        self.assertEqual(cache.get('a', lambda: 'baz'), 'foo')
+
+    def test_unhashable_key(self):
+        cache = utils.LRUCache()
+        create = MagicMock(return_value='foo')
+        for _ in range(3):
+            self.assertEqual(cache.get(({},), create), 'foo')
+        self.assertEqual(create.call_count, 3)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 0, 0))
+
+    def test_exception_is_not_cached(self):
+        cache = utils.LRUCache()
+        with self.assertRaises(ValueError):
+            cache.get('a', MagicMock(side_effect=ValueError('nope')))
+        self.assertEqual(cache.get('a', lambda: 'foo'), 'foo')
+
+    def test_uncacheable_value(self):
+        cache = utils.LRUCache()
+        self.assertEqual(cache.get('a', lambda: 'foo', cacheable=lambda v: v != 'foo'), 'foo')
+        self.assertEqual(cache.get('a', lambda: 'bar', cacheable=lambda v: v != 'foo'), 'bar')
+        self.assertEqual(cache.get('a', lambda: 'baz'), 'bar')
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 1))